@@ -3,28 +3,56 @@ import json
 import logging
 import time
 from pathlib import Path
+from urllib.parse import urlparse
 from typing import Dict, Any, Optional, List
-from playwright.async_api import async_playwright, Browser, BrowserContext, Page
+from playwright.async_api import Browser, BrowserContext, Page
 import base64
 import io
 from PIL import Image
-import pytesseract
 
+from core.browser_pool import BrowserPool, BrowserLease, get_shared_pool, close_shared_pools
+from core.cdp_session import get_cdp_session
+from core.resource_blocking import get_resource_blocker
+from core.readiness import get_readiness_waiter
+from core.har_replay import HarSession, get_har_session, close_har_session
+from core.storage_state import get_storage_state_store, domain_of
+from core.strategy_store import get_strategy_store, close_strategy_store
+from core.strategy_bandit import StrategyBandit
+from core.negative_cache import NegativeCache
+from core.latency_histogram import StrategyTimer
+from core.ocr_engine import get_ocr_engine
+from utils.log_writer import LogWriter
+from core.link_scanner import DEFAULT_CLICKABLE_SELECTORS, scan_candidates, rank_candidates, click_candidate
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 class KaiLinkClickAgent:
-    def __init__(self, headless: bool = False):
+    def __init__(self, headless: bool = False, cdp_endpoint: Optional[str] = None,
+                 har_session: Optional[HarSession] = None, decision_log_dir: Optional[str] = None):
         self.headless = headless
+        self.cdp_endpoint = cdp_endpoint  # attach to the visible Chrome tab instead of leasing from the pool
         self.browser: Optional[Browser] = None
         self.context: Optional[BrowserContext] = None
         self.page: Optional[Page] = None
-        self.playwright = None
+        self.pool: Optional[BrowserPool] = None
+        self.lease: Optional[BrowserLease] = None
         
         # Load intents configuration
         self.intents = self._load_intents()
         
+        # Per-intent resource blocking (headless pool pages only)
+        self.resource_blocker = get_resource_blocker()
+        
+        # Per-intent readiness predicates (replace networkidle waits)
+        self.readiness = get_readiness_waiter()
+        
+        # HAR record/replay (inactive unless KAI_HAR_MODE is set)
+        self.har = har_session or get_har_session()
+        
+        # Per-domain cookies/localStorage so consent banners are handled once per TTL
+        self.storage_state = get_storage_state_store()
+        
         # Action handlers mapping
         self.action_handlers = {
             'click': self._handle_click_action,
@@ -48,7 +76,14 @@ class KaiLinkClickAgent:
             'xpath': self._click_xpath_strategy,
             'css_selector': self._click_css_selector_strategy
         }
-        self.strategy_stats = {strategy: {'attempts': 0, 'successes': 0} for strategy in self.click_strategies}
+        # Attempts/successes per (domain, intent, strategy) live in the shared strategy store
+        self.strategy_store = get_strategy_store()
+        self.bandit = StrategyBandit(self.strategy_store)
+        self.negative_cache = NegativeCache(self.strategy_store)
+        # Phase timer of the click attempt in progress (query, visibility, click, wait)
+        self._attempt_timer = StrategyTimer()
+        # Opt-in per-click decision trail with each attempt's timings, written to this directory
+        self.decision_log_dir = decision_log_dir
 
     def _load_intents(self) -> Dict[str, Any]:
         """Load intents from JSON configuration file"""
@@ -68,6 +103,7 @@ class KaiLinkClickAgent:
                 "navigate_to_article": {
                     "description": "Navigate to and click on a specific article link",
                     "action_type": "click",
+                    "resource_profile": "dom_only",
                     "parameters": {
                         "target_description": "string - description of the article to find and click",
                         "selector_hints": "optional array - CSS selectors to try",
@@ -83,6 +119,7 @@ class KaiLinkClickAgent:
                         {"method": "css", "value": "body"}
                     ],
                     "action_type": "extract_text",
+                    "resource_profile": "text_only",
                     "timeout": 10000,
                     "min_content_length": 50,
                     "max_content_length": 5000
@@ -105,27 +142,38 @@ class KaiLinkClickAgent:
             return {}
 
     async def start_browser(self):
-        """Initialize browser and context"""
-        self.playwright = await async_playwright().start()
-        self.browser = await self.playwright.chromium.launch(headless=self.headless)
-        self.context = await self.browser.new_context(
+        """Lease a context and page from the shared warm browser pool (or attach over CDP)"""
+        if self.cdp_endpoint:
+            session = await get_cdp_session(self.cdp_endpoint)
+            self.browser = session.browser
+            self.context = session.context
+            self.page = await session.get_page()
+            logger.info(f"Attached to visible tab over CDP: {self.page.url}")
+            return
+
+        self.pool = await get_shared_pool(headless=self.headless)
+        self.lease = await self.pool.acquire(
             viewport={'width': 1920, 'height': 1080},
             user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/122.0.0.0 Safari/537.36'
         )
-        self.page = await self.context.new_page()
+        self.browser = self.lease.browser
+        self.context = self.lease.context
+        self.page = self.lease.page
+        await self.har.attach(self.context)
         
         # Set up request/response logging
         self.page.on('request', lambda request: logger.debug(f"Request: {request.method} {request.url}"))
         self.page.on('response', lambda response: logger.debug(f"Response: {response.status} {response.url}"))
 
     async def stop_browser(self):
-        """Clean up browser resources"""
-        if self.context:
-            await self.context.close()
-        if self.browser:
-            await self.browser.close()
-        if self.playwright:
-            await self.playwright.stop()
+        """Return the leased context to the pool (the browser stays warm)"""
+        # In CDP mode the tab belongs to the user, so it is left open
+        if self.lease:
+            await self.pool.release(self.lease)
+        self.lease = None
+        self.browser = None
+        self.context = None
+        self.page = None
 
     async def execute_intent(self, intent_name: str, parameters: Dict[str, Any] = None) -> Dict[str, Any]:
         """Execute a specific intent with given parameters"""
@@ -153,12 +201,15 @@ class KaiLinkClickAgent:
         merged_params = intent_config.copy()
         if parameters:
             merged_params.update(parameters)
+        merged_params['intent_name'] = intent_name
         
         logger.info(f"Executing intent '{intent_name}' with action type '{action_type}'")
         
         try:
+            await self._apply_resource_profile(intent_config)
             handler = self.action_handlers[action_type]
-            result = await handler(merged_params)
+            async with self.har.step(intent_name):
+                result = await handler(merged_params)
             result.update({
                 'intent': intent_name,
                 'action_type': action_type,
@@ -175,9 +226,19 @@ class KaiLinkClickAgent:
                 'timestamp': time.time()
             }
 
-    async def _handle_extract_text_action(self, intent_config: Dict[str, Any]) -> Dict[str, Any]:
-        """Handle text extraction using primary + fallback strategy"""
-        if not self.page:
+    async def _apply_resource_profile(self, intent_config: Optional[Dict[str, Any]]) -> str:
+        """Enforce the intent's resource blocking profile (never on the user's visible CDP tab)"""
+        if self.cdp_endpoint or not self.page:
+            return 'full'
+        profile = await self.resource_blocker.apply_for_intent(self.page, intent_config)
+        logger.info(f"Resource profile: {profile}")
+        return profile
+
+    async def _handle_extract_text_action(self, intent_config: Dict[str, Any],
+                                          page: Optional[Page] = None) -> Dict[str, Any]:
+        """Handle text extraction using primary + fallback strategy (on `page`, default the agent's page)"""
+        page = page or self.page
+        if not page:
             return {'success': False, 'error': 'Browser not initialized'}
         
         try:
@@ -185,8 +246,11 @@ class KaiLinkClickAgent:
             min_length = intent_config.get('min_content_length', 50)
             max_length = intent_config.get('max_content_length', 5000)
             
-            # Wait for page to be ready
-            await self.page.wait_for_load_state('networkidle', timeout=timeout)
+            # Wait until the intent's readiness predicate holds
+            await self.readiness.wait_for_intent(
+                page, intent_config, "page", label="extract_text",
+                default={"type": "dom_stable", "stable_frames": 3, "timeout": timeout}
+            )
             
             extracted_content = ""
             method_used = None
@@ -200,7 +264,7 @@ class KaiLinkClickAgent:
                 else:
                     # Split comma-separated selectors
                     primary_selectors = [s.strip() for s in primary.split(',')]
-                    extracted_content, method_used = await self._extract_with_selectors(primary_selectors, max_length)
+                    extracted_content, method_used = await self._extract_with_selectors(primary_selectors, max_length, page)
             
             # If primary failed, try fallbacks
             if not extracted_content.strip() and 'fallbacks' in intent_config:
@@ -209,14 +273,14 @@ class KaiLinkClickAgent:
                     value = fallback.get('value')
                     
                     if method == 'css' and value:
-                        content, used = await self._extract_with_selectors([value], max_length)
+                        content, used = await self._extract_with_selectors([value], max_length, page)
                         if content.strip():
                             extracted_content = content
                             method_used = f"css: {value}"
                             break
                     elif method == 'xpath' and value:
                         try:
-                            element = await self.page.query_selector(f"xpath={value}")
+                            element = await page.query_selector(f"xpath={value}")
                             if element:
                                 content = await element.inner_text()
                                 if content.strip():
@@ -237,8 +301,8 @@ class KaiLinkClickAgent:
                 }
             
             # Get page metadata
-            page_title = await self.page.title()
-            page_url = self.page.url
+            page_title = await page.title()
+            page_url = page.url
             
             return {
                 'success': True,
@@ -259,8 +323,10 @@ class KaiLinkClickAgent:
                 'message': 'Failed to extract text content'
             }
 
-    async def _extract_with_selectors(self, selectors: List[str], max_length: int) -> tuple:
+    async def _extract_with_selectors(self, selectors: List[str], max_length: int,
+                                      page: Optional[Page] = None) -> tuple:
         """Extract content using a list of CSS selectors"""
+        page = page or self.page
         exclude_selectors = [
             'nav', 'header', 'footer', '.ad', '.advertisement', 
             '.social-share', '.comments', '.sidebar', 'script', 'style'
@@ -268,7 +334,7 @@ class KaiLinkClickAgent:
         
         for selector in selectors:
             try:
-                elements = await self.page.query_selector_all(selector.strip())
+                elements = await page.query_selector_all(selector.strip())
                 if elements:
                     combined_content = ""
                     for element in elements:
@@ -294,6 +360,15 @@ class KaiLinkClickAgent:
         
         return "", None
 
+    async def read_page(self, page: Page, intent_name: str = "read_content") -> Dict[str, Any]:
+        """Run an extract_text intent against any page, e.g. a fan-out tab"""
+        intent_config = self.intents.get(intent_name)
+        if not intent_config:
+            return {'success': False, 'error': f'Unknown intent: {intent_name}'}
+        result = await self._handle_extract_text_action(intent_config, page)
+        result['intent'] = intent_name
+        return result
+
     async def _handle_navigate_action(self, intent_config: Dict[str, Any]) -> Dict[str, Any]:
         """Handle navigation using primary + fallback strategy"""
         if not self.page:
@@ -403,24 +478,18 @@ class KaiLinkClickAgent:
     async def _try_text_contains_method(self, text: str, timeout: int) -> Dict[str, Any]:
         """Try to find and click element containing specific text"""
         try:
-            # Look for clickable elements containing the text
-            selectors = ['a', 'button', '[role="button"]', '[onclick]']
-            
-            for selector in selectors:
-                elements = await self.page.query_selector_all(selector)
-                for element in elements:
-                    element_text = await element.inner_text()
-                    if text.lower() in element_text.lower().strip():
-                        if await element.is_visible():
-                            await element.scroll_into_view_if_needed()
-                            await element.click()
-                            await asyncio.sleep(1)  # Wait for navigation
-                            return {
-                                'success': True,
-                                'url': self.page.url,
-                                'title': await self.page.title(),
-                                'message': f'Successfully clicked element containing text: {text}'
-                            }
+            # Look for clickable elements containing the text (single page scan)
+            candidates = await scan_candidates(self.page, ['a', 'button', '[role="button"]', '[onclick]'])
+            for candidate in candidates:
+                if candidate['visible'] and text.lower() in candidate['text'].lower():
+                    if await click_candidate(self.page, candidate):
+                        await asyncio.sleep(1)  # Wait for navigation
+                        return {
+                            'success': True,
+                            'url': self.page.url,
+                            'title': await self.page.title(),
+                            'message': f'Successfully clicked element containing text: {text}'
+                        }
             
             return {'success': False, 'error': f'No clickable element found containing text: {text}'}
         except Exception as e:
@@ -478,31 +547,58 @@ class KaiLinkClickAgent:
         
         logger.info(f"Attempting to find and click: {target_description}")
         
-        # Wait for page to be ready
-        await self.page.wait_for_load_state('networkidle', timeout=10000)
+        # Wait until the intent's readiness predicate holds
+        await self.readiness.wait_for_intent(self.page, parameters, "page", label="click")
         
         # Take screenshot for debugging
         screenshot_data = await self._take_screenshot()
         
-        # Handle cookie banners first
-        await self._handle_cookie_banners()
+        # Handle cookie banners first (skipped when the domain's stored state has consent)
+        await self._handle_cookie_banners_once(self.page.url)
         
-        # Try multiple strategies to find and click the target
-        strategies_to_try = ['primary', 'coordinate', 'xpath', 'css_selector']
+        intent_name = parameters.get('intent_name', 'click')
+        domain = urlparse(self.page.url).netloc
+        
+        # Try the strategies in order of expected time-to-click for this domain,
+        # skipping those that keep failing here until their re-probe is due
+        await self.negative_cache.check_structure(self.page, domain)
+        strategies_to_try = self.bandit.order(domain, intent_name, list(self.click_strategies))
+        strategies_to_try = self.negative_cache.filter(domain, intent_name, strategies_to_try)
+        logger.info(f"Strategy order: {strategies_to_try}")
+        decision_log = LogWriter(self.decision_log_dir) if self.decision_log_dir else None
+        if decision_log:
+            decision_log.start_session(domain, intent_name)
         
         for strategy in strategies_to_try:
-            self.strategy_stats[strategy]['attempts'] += 1
             logger.info(f"Trying {strategy} strategy")
+            success = False
+            timer = self._attempt_timer = StrategyTimer()
             
             try:
+                previous_url = self.page.url
                 success = await self.click_strategies[strategy](
                     target_description, selector_hints, text_hints
                 )
                 
                 if success:
-                    self.strategy_stats[strategy]['successes'] += 1
-                    await asyncio.sleep(2)  # Wait for navigation/page changes
-                    
+                    # Wait for navigation/page changes
+                    await self.readiness.wait_for_intent(self.page, parameters, "action",
+                                                         previous_url=previous_url, label="click",
+                                                         default={"type": "url_changed", "timeout": 5000})
+                    timer.lap('wait')
+                
+                self.strategy_store.record(domain, intent_name, strategy, success,
+                                           latency=timer.elapsed(), phases=timer.phases)
+                logger.info(f"{strategy} strategy timings (ms): {timer.as_dict()}")
+                
+                if decision_log:
+                    if success:
+                        decision_log.log_success(strategy, timings=timer.as_dict())
+                        decision_log.save(domain, intent_name)
+                    else:
+                        decision_log.log_attempt(strategy, timings=timer.as_dict())
+                
+                if success:
                     return {
                         'success': True,
                         'strategy_used': strategy,
@@ -513,8 +609,15 @@ class KaiLinkClickAgent:
                     }
             except Exception as e:
                 logger.warning(f"{strategy} strategy failed: {e}")
+                self.strategy_store.record(domain, intent_name, strategy, False,
+                                           latency=timer.elapsed(), phases=timer.phases)
+                if decision_log:
+                    decision_log.log_attempt(strategy, timings=timer.as_dict())
                 continue
         
+        if decision_log:
+            decision_log.log_failure("All click strategies failed")
+            decision_log.save(domain, intent_name)
         return {
             'success': False,
             'target_description': target_description,
@@ -525,39 +628,20 @@ class KaiLinkClickAgent:
         }
 
     async def _click_primary_strategy(self, target_description: str, selector_hints: List[str], text_hints: List[str]) -> bool:
-        """Primary strategy: Look for links and buttons containing target text"""
+        """Primary strategy: Look for links and buttons containing target text (single page scan)"""
         try:
-            # Common selectors for clickable elements
-            clickable_selectors = [
-                'a[href]',
-                'button',
-                '[role="button"]',
-                '[onclick]',
-                '.btn',
-                '.button',
-                '.link'
-            ] + selector_hints
-            
-            for selector in clickable_selectors:
-                elements = await self.page.query_selector_all(selector)
-                
-                for element in elements:
-                    element_text = await element.inner_text()
-                    element_text_lower = element_text.lower().strip()
-                    target_lower = target_description.lower().strip()
-                    
-                    # Check if element text matches target description
-                    if (target_lower in element_text_lower or 
-                        any(hint.lower() in element_text_lower for hint in text_hints) or
-                        any(word in element_text_lower for word in target_lower.split())):
-                        
-                        logger.info(f"Found matching element with text: '{element_text[:100]}'")
-                        
-                        # Ensure element is visible and clickable
-                        if await element.is_visible():
-                            await element.scroll_into_view_if_needed()
-                            await element.click()
-                            return True
+            # One round trip: candidate table for every clickable element on the page
+            candidates = await scan_candidates(self.page, DEFAULT_CLICKABLE_SELECTORS + list(selector_hints))
+            ranked = rank_candidates(candidates, target_description, text_hints)
+            self._attempt_timer.lap('query')  # the scan also measures visibility
+            logger.info(f"Scanned {len(candidates)} candidates, {len(ranked)} match '{target_description}'")
+            
+            for candidate in ranked[:3]:
+                logger.info(f"Found matching element with text: '{candidate['text'][:100]}' (score {candidate['score']:.2f})")
+                clicked = await click_candidate(self.page, candidate)
+                self._attempt_timer.lap('click')
+                if clicked:
+                    return True
             
             return False
         except Exception as e:
@@ -571,7 +655,8 @@ class KaiLinkClickAgent:
             
             # Use OCR to find text locations
             image = Image.open(io.BytesIO(screenshot))
-            ocr_data = pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT)
+            ocr_data = get_ocr_engine().image_to_data(image)
+            self._attempt_timer.lap('query')
             
             target_words = target_description.lower().split()
             
@@ -582,6 +667,7 @@ class KaiLinkClickAgent:
                     
                     logger.info(f"OCR found '{text}' at coordinates ({x}, {y})")
                     await self.page.mouse.click(x, y)
+                    self._attempt_timer.lap('click')
                     return True
             
             return False
@@ -602,9 +688,12 @@ class KaiLinkClickAgent:
             for xpath in xpath_expressions:
                 try:
                     element = await self.page.query_selector(f"xpath={xpath}")
+                    self._attempt_timer.lap('query')
                     if element and await element.is_visible():
+                        self._attempt_timer.lap('visibility')
                         await element.scroll_into_view_if_needed()
                         await element.click()
+                        self._attempt_timer.lap('click')
                         return True
                 except Exception:
                     continue
@@ -628,9 +717,12 @@ class KaiLinkClickAgent:
             for selector in css_selectors:
                 try:
                     element = await self.page.query_selector(selector)
+                    self._attempt_timer.lap('query')
                     if element and await element.is_visible():
+                        self._attempt_timer.lap('visibility')
                         await element.scroll_into_view_if_needed()
                         await element.click()
+                        self._attempt_timer.lap('click')
                         return True
                 except Exception:
                     continue
@@ -640,6 +732,20 @@ class KaiLinkClickAgent:
             logger.error(f"CSS selector strategy error: {e}")
             return False
 
+    async def _handle_cookie_banners_once(self, url: str) -> bool:
+        """Skip the banner handler when the domain's stored state already carries consent"""
+        domain = domain_of(url)
+        if not self.cdp_endpoint and self.storage_state.has_consent(domain):
+            self.storage_state.record_banner_check(skipped=True)
+            logger.info(f"Cookie consent already stored for {domain}, skipping banner check")
+            return True
+        
+        self.storage_state.record_banner_check(skipped=False)
+        accepted = await self._handle_cookie_banners()
+        if not self.cdp_endpoint:
+            await self.storage_state.save(self.context, domain, consent=accepted or None)
+        return accepted
+
     async def _handle_cookie_banners(self):
         """Detect and handle cookie consent banners"""
         try:
@@ -683,13 +789,13 @@ class KaiLinkClickAgent:
             # Fallback to OCR if DOM-based detection fails
             screenshot = await self.page.screenshot()
             image = Image.open(io.BytesIO(screenshot))
-            ocr_text = pytesseract.image_to_string(image).lower()
+            ocr_text = get_ocr_engine().image_to_string(image).lower()
             
             if any(word in ocr_text for word in ['cookie', 'consent', 'privacy']):
                 logger.info("Cookie banner detected via OCR, attempting to find accept button")
                 
                 # Try to find and click accept button using OCR coordinates
-                ocr_data = pytesseract.image_to_data(image, output_type=pytesseract.Output.DICT)
+                ocr_data = get_ocr_engine().image_to_data(image)
                 
                 for i, text in enumerate(ocr_data['text']):
                     if text.strip().lower() in accept_text_patterns:
@@ -716,20 +822,26 @@ class KaiLinkClickAgent:
             logger.error(f"Error taking screenshot: {e}")
             return ""
 
-    async def navigate_to_url(self, url: str) -> Dict[str, Any]:
-        """Navigate to a specific URL"""
+    async def navigate_to_url(self, url: str, intent_name: Optional[str] = None) -> Dict[str, Any]:
+        """Navigate to a specific URL, loading only what `intent_name` needs"""
         if not self.page:
             return {'success': False, 'error': 'Browser not initialized'}
         
         try:
+            intent_config = self.intents.get(intent_name) if intent_name else None
+            await self._apply_resource_profile(intent_config)
+            if not self.cdp_endpoint:
+                await self.storage_state.apply(self.context, domain_of(url))
             logger.info(f"Navigating to: {url}")
-            await self.page.goto(url, wait_until='networkidle', timeout=30000)
+            async with self.har.step(f"navigate {url}"):
+                await self.page.goto(url, wait_until='domcontentloaded', timeout=30000)
+                await self.readiness.wait_for_intent(self.page, intent_config, "page", label="navigate")
             
             page_title = await self.page.title()
             final_url = self.page.url
             
-            # Handle any cookie banners that appear
-            await self._handle_cookie_banners()
+            # Handle any cookie banners that appear, unless consent is already stored
+            await self._handle_cookie_banners_once(final_url)
             
             return {
                 'success': True,
@@ -746,21 +858,42 @@ class KaiLinkClickAgent:
             }
 
     def get_strategy_stats(self) -> Dict[str, Dict[str, Any]]:
-        """Get success statistics for each click strategy"""
+        """Get success statistics and latency percentiles (seconds) for each click strategy, from the strategy store"""
         stats = {}
-        for strategy, data in self.strategy_stats.items():
+        for strategy, data in self.strategy_store.get_strategy_totals(list(self.click_strategies)).items():
             attempts = data['attempts']
             successes = data['successes']
             success_rate = (successes / attempts * 100) if attempts > 0 else 0
             
+            total_latency = data['latency'].get('total', {})
             stats[strategy] = {
                 'attempts': attempts,
                 'successes': successes,
-                'success_rate': f"{success_rate:.1f}%"
+                'success_rate': f"{success_rate:.1f}%",
+                'p50': total_latency.get('p50'),
+                'p95': total_latency.get('p95'),
+                'p99': total_latency.get('p99'),
+                'phases': {phase: summary for phase, summary in data['latency'].items() if phase != 'total'}
             }
         
         return stats
 
+    def get_readiness_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get how long each readiness predicate took to hold"""
+        return self.readiness.get_stats()
+
+    def get_resource_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get blocked request counts and estimated bytes saved per resource profile"""
+        return self.resource_blocker.get_stats()
+
+    def get_storage_state_stats(self) -> Dict[str, Any]:
+        """Get stored-state loads/expiries and how often the cookie banner handler was skipped"""
+        return self.storage_state.get_stats()
+
+    def get_negative_cache_stats(self) -> Dict[str, Any]:
+        """Get how many dead strategies were skipped and the estimated time saved"""
+        return self.negative_cache.get_stats()
+
 # Example usage and testing functions
 async def test_autonomous_cycle():
     """Test the complete autonomous navigation cycle with new intent structure"""
@@ -770,7 +903,7 @@ async def test_autonomous_cycle():
         await agent.start_browser()
         
         # Step 1: Navigate to BBC News
-        nav_result = await agent.navigate_to_url("https://www.bbc.com/news")
+        nav_result = await agent.navigate_to_url("https://www.bbc.com/news", intent_name="navigate_to_article")
         print(f"Navigation result: {nav_result}")
         
         if nav_result['success']:
@@ -797,10 +930,22 @@ async def test_autonomous_cycle():
                 print("\nStrategy Statistics:")
                 stats = agent.get_strategy_stats()
                 for strategy, data in stats.items():
-                    print(f"  {strategy}: {data['success_rate']} ({data['successes']}/{data['attempts']})")
+                    print(f"  {strategy}: {data['success_rate']} ({data['successes']}/{data['attempts']}), "
+                          f"p50/p95/p99 {data['p50']}/{data['p95']}/{data['p99']}s")
+                if agent.pool:
+                    print(f"\nBrowser pool: {agent.pool.get_stats()}")
+                print(f"Resource blocking: {agent.get_resource_stats()}")
+                print(f"Readiness timings: {agent.get_readiness_stats()}")
+                print(f"Storage state: {agent.get_storage_state_stats()}")
+                print(f"Strategy store: {agent.strategy_store.get_stats()}")
+                print(f"Dead strategies skipped: {agent.get_negative_cache_stats()}")
+                print(f"OCR engine: {get_ocr_engine().get_stats()}")
     
     finally:
         await agent.stop_browser()
+        await close_shared_pools()
+        close_har_session()
+        close_strategy_store()
 
 if __name__ == "__main__":
     asyncio.run(test_autonomous_cycle())
\ No newline at end of file
@@ -1,14 +1,21 @@
 from core.kai_agent_base import KaiAgent
+from core.frame_stability import StabilityGate
+from core.ocr_engine import get_ocr_engine
+from core.incremental_ocr import IncrementalOCR
 import pyautogui
-import pytesseract
 import cv2
 import numpy as np
 from PIL import Image
 import time
 import os
 
+# OCR configuration optimized for boundary markers
+OCR_CONFIG = r'--psm 6 --oem 3 -c tessedit_char_whitelist="<>abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 .,?!:;/-()\n\r"'
+# Same, for one line band at a time (incremental mode)
+LINE_OCR_CONFIG = OCR_CONFIG.replace('--psm 6', '--psm 7')
+
 class KaiOCRAgent(KaiAgent):
-    def __init__(self, region=None, save_debug=True, **kwargs):
+    def __init__(self, region=None, save_debug=True, incremental=False, **kwargs):
         super().__init__(name="KaiOCRAgent", **kwargs)
         self.region = region  # (x, y, width, height) or None for full screen
         self.save_debug = save_debug
@@ -16,86 +23,129 @@ class KaiOCRAgent(KaiAgent):
         if save_debug:
             os.makedirs(self.debug_dir, exist_ok=True)
         self.extracted_text = ""
+        # Frame-diff gate: OCR runs once the region stops changing, not on every check
+        self.stability_gate = StabilityGate()
+        # Incremental mode: keep a per-line text model, updated on every frame of the
+        # stability wait and across responses, and only OCR lines that changed
+        self.incremental_ocr = IncrementalOCR(self.recognise_line) if incremental else None
 
-    def wait_for_content_stability(self, timeout=60, stability_checks=3):
-        """Wait for content to stabilize before OCR"""
+    def wait_for_content_stability(self, timeout=60, stability_checks=3, check_interval=2):
+        """
+        Wait for the region to stop changing (cheap frame diff), then OCR it once.
+        In incremental mode every captured frame also updates the line model,
+        so only lines that changed since the previous frame are OCR'd and the
+        text is ready when the region settles.
+        """
         self.log("Waiting for content to stabilize...")
         
-        last_text = ""
-        stable_count = 0
-        check_interval = 2
+        gate = self.stability_gate
+        gate.required = stability_checks
+        gate.reset()
+        img = None
+        stable = False
         
-        while stable_count < stability_checks and timeout > 0:
-            # Capture current content
-            current_text = self.capture_and_extract()
+        while timeout > 0:
+            img = self.capture()
+            if img is None:
+                break
             
-            if current_text == last_text:
-                stable_count += 1
-                self.log(f"Content stable (count: {stable_count}/{stability_checks})")
-            else:
-                stable_count = 0
-                self.log("Content still changing...")
+            settled = gate.update(img)
+            if self.incremental_ocr:
+                self.extract_text_from_image(img)
+            if settled:
+                stable = True
+                break
+            if gate.stable_count:
+                self.log(f"Content stable (count: {gate.stable_count}/{stability_checks})")
+            elif gate.last_difference is not None:
+                self.log(f"Content still changing ({gate.last_changed_cells} cells, max diff {gate.last_difference:.0f})...")
             
-            last_text = current_text
             time.sleep(check_interval)
             timeout -= check_interval
         
-        if stable_count >= stability_checks:
-            self.log("Content has stabilized")
-            self.extracted_text = last_text
-            return last_text
+        if stable:
+            self.log(f"Content has stabilized after {gate.frames} frames")
         else:
             self.log("Timeout waiting for stability")
-            self.extracted_text = last_text
-            return last_text
+        
+        # Incremental mode: the last frame is already in the model, so this OCRs nothing new
+        text = self.extract(img) if img is not None else ""
+        if self.incremental_ocr:
+            stats = self.incremental_ocr.get_stats()
+            self.log(f"Incremental OCR over {gate.frames} frames: {stats['lines_reused']} of lines reused")
+        else:
+            gate.record_ocr()
+            self.log(f"OCR ran once instead of {gate.frames} times")
+        self.extracted_text = text
+        return text
 
-    def capture_and_extract(self):
-        """Capture screenshot and extract text"""
+    def capture(self):
+        """Capture the region (or full screen); None on failure"""
         try:
-            # Take screenshot
             if self.region:
-                img = pyautogui.screenshot(region=self.region)
-                self.log(f"Captured region screenshot: {self.region}")
-            else:
-                img = pyautogui.screenshot()
-                self.log("Captured full screenshot")
-            
-            # Save debug image if requested
-            if self.save_debug:
-                timestamp = time.strftime("%Y%m%d_%H%M%S")
-                debug_path = os.path.join(self.debug_dir, f"ocr_capture_{timestamp}.png")
-                img.save(debug_path)
-                self.log(f"Debug screenshot saved: {debug_path}")
-            
-            # Extract text
-            text = self.extract_text_from_image(img)
-            return text
-            
+                return pyautogui.screenshot(region=self.region)
+            return pyautogui.screenshot()
         except Exception as e:
             self.log(f"Screenshot capture failed: {e}")
+            return None
+
+    def extract(self, img):
+        """Save the debug image if requested and extract text"""
+        if self.save_debug:
+            timestamp = time.strftime("%Y%m%d_%H%M%S")
+            debug_path = os.path.join(self.debug_dir, f"ocr_capture_{timestamp}.png")
+            img.save(debug_path)
+            self.log(f"Debug screenshot saved: {debug_path}")
+        return self.extract_text_from_image(img)
+
+    def capture_and_extract(self):
+        """Capture screenshot and extract text"""
+        img = self.capture()
+        if img is None:
             return ""
+        self.log(f"Captured {'region ' + str(self.region) if self.region else 'full'} screenshot")
+        return self.extract(img)
+
+    def get_stability_stats(self):
+        """Frames checked and OCR passes saved by the stability gate"""
+        return self.stability_gate.get_stats()
+
+    def get_incremental_stats(self):
+        """Lines OCR'd vs reused by incremental mode (None when it is off)"""
+        return self.incremental_ocr.get_stats() if self.incremental_ocr else None
+
+    def preprocess(self, img):
+        """Grayscale, contrast boost and Otsu threshold"""
+        # Convert PIL to numpy array
+        img_array = np.array(img)
+        
+        # Convert to grayscale if needed
+        if len(img_array.shape) == 3:
+            img_array = cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)
+        
+        # Enhance contrast
+        enhanced = cv2.convertScaleAbs(img_array, alpha=1.2, beta=10)
+        
+        # Apply threshold for better OCR
+        _, thresh = cv2.threshold(enhanced, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        return thresh
+
+    def recognise_line(self, band):
+        """OCR one preprocessed line band"""
+        return get_ocr_engine().image_to_string(band, config=LINE_OCR_CONFIG, profile="contrast_otsu")
 
     def extract_text_from_image(self, img):
         """Extract text using OCR with preprocessing"""
         try:
-            # Convert PIL to numpy array
-            img_array = np.array(img)
-            
-            # Convert to grayscale if needed
-            if len(img_array.shape) == 3:
-                img_array = cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)
-            
-            # Enhance contrast
-            enhanced = cv2.convertScaleAbs(img_array, alpha=1.2, beta=10)
+            thresh = self.preprocess(img)
             
-            # Apply threshold for better OCR
-            _, thresh = cv2.threshold(enhanced, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-            
-            # OCR configuration optimized for boundary markers
-            custom_config = r'--psm 6 --oem 3 -c tessedit_char_whitelist="<>abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 .,?!:;/-()\n\r"'
-            
-            # Extract text
-            text = pytesseract.image_to_string(thresh, config=custom_config)
+            # Extract text: whole region, or only the lines that changed since the last capture
+            if self.incremental_ocr:
+                text = self.incremental_ocr.update(thresh)
+                stats = self.incremental_ocr.stats
+                self.log(f"Incremental OCR: {stats['lines_ocr']} lines OCR'd of {stats['lines']} seen so far")
+            else:
+                text = get_ocr_engine().image_to_string(thresh, config=OCR_CONFIG, profile="contrast_otsu")
             
             self.log(f"OCR extracted {len(text)} characters")
             return text.strip()
@@ -3,10 +3,11 @@ import subprocess
 import time
 
 class KaiWebAgent(KaiAgent):
-    def __init__(self, url=None, browser="chrome", **kwargs):
+    def __init__(self, url=None, browser="chrome", cdp_endpoint=None, **kwargs):
         super().__init__(name="KaiWebAgent", **kwargs)
         self.url = url
         self.browser = browser.lower()
+        self.cdp_endpoint = cdp_endpoint  # e.g. "http://localhost:9222" to drive the visible Chrome tab
 
     def validate_url(self, url):
         """Validate and clean URL"""
@@ -170,6 +171,25 @@ class KaiWebAgent(KaiAgent):
         self.log("Fast web navigation completed")
         return True
 
+    async def run_cdp(self, url=None):
+        """Navigate the visible Chrome tab over CDP (page is loaded once and shared with later clicks)"""
+        from core.cdp_session import get_cdp_session
+
+        target_url = url or self.url
+        validated_url = self.validate_url(target_url)
+        if not validated_url:
+            raise ValueError(f"Invalid URL: {target_url}")
+        if not self.cdp_endpoint:
+            raise ValueError("No CDP endpoint configured")
+
+        self.log(f"CDP navigating to: {validated_url}")
+        session = await get_cdp_session(self.cdp_endpoint)
+        page = await session.goto(validated_url)
+
+        self.focus_browser()
+        self.log(f"CDP navigation completed: {page.url}")
+        return page
+
     def verify(self):
         """Verify browser opened successfully"""
         # Could add more sophisticated verification later
@@ -32,6 +32,10 @@ import cv2
 import numpy as np
 from PIL import Image
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+from core.frame_stability import StabilityGate
+from core.incremental_ocr import IncrementalOCR
+
 # Basic logger setup
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s: %(message)s')
 logger = logging.getLogger("KaiCoordinator")
@@ -136,11 +140,19 @@ class KaiDirectTypingAgent:
 class WorkingBoundaryDetector:
     """OCR and boundary detection based exactly on working implementation"""
     
-    def __init__(self):
+    # OCR configuration - enhanced for full URL detection
+    OCR_CONFIG = r'--psm 6 --oem 3 -c tessedit_char_whitelist="<>abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 .,?!:;/-()=&%+~_\n\r"'
+    
+    def __init__(self, incremental=False):
         self.logger = logger
         self.boundary_pattern = r'<<(.*?)>>'
         self.debug_dir = "debug_screenshots"
         os.makedirs(self.debug_dir, exist_ok=True)
+        # Frame-diff gate: OCR once the region stops changing, not every check
+        self.stability_gate = StabilityGate(required=3)
+        # Incremental mode: the wait loop feeds every frame to a line model, so only
+        # lines that changed since the previous frame (or response) are OCR'd
+        self.incremental_ocr = IncrementalOCR(self.recognise_line) if incremental else None
         
     def log(self, message):
         self.logger.info(f"[BoundaryDetector] {message}")
@@ -170,30 +182,39 @@ class WorkingBoundaryDetector:
             self.log(f"Region screenshot failed: {e}")
             return None
     
+    def preprocess(self, image):
+        """Grayscale, contrast and threshold with proven settings"""
+        # Convert to numpy array
+        img_array = np.array(image)
+        
+        # Convert to grayscale if needed
+        if len(img_array.shape) == 3:
+            img_array = cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)
+        
+        # Improve contrast for better OCR - CRITICAL
+        img_array = cv2.convertScaleAbs(img_array, alpha=1.2, beta=10)
+        
+        # Apply threshold - CRITICAL
+        _, img_array = cv2.threshold(img_array, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+        return img_array
+    
+    def recognise_line(self, band):
+        """OCR a single preprocessed line band"""
+        return pytesseract.image_to_string(band, config=self.OCR_CONFIG.replace('--psm 6', '--psm 7'))
+    
     def extract_text_from_image(self, image_path):
         """Extract text using OCR with proven configuration"""
         try:
             # Open image
             image = Image.open(image_path)
+            img_array = self.preprocess(image)
             
-            # Convert to numpy array
-            img_array = np.array(image)
-            
-            # Convert to grayscale if needed
-            if len(img_array.shape) == 3:
-                img_array = cv2.cvtColor(img_array, cv2.COLOR_RGB2GRAY)
-            
-            # Improve contrast for better OCR - CRITICAL
-            img_array = cv2.convertScaleAbs(img_array, alpha=1.2, beta=10)
-            
-            # Apply threshold - CRITICAL
-            _, img_array = cv2.threshold(img_array, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-            
-            # OCR configuration - enhanced for full URL detection
-            custom_config = r'--psm 6 --oem 3 -c tessedit_char_whitelist="<>abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789 .,?!:;/-()=&%+~_\n\r"'
+            # Incremental mode re-reads only the lines that changed since the last capture
+            if self.incremental_ocr:
+                return self.incremental_ocr.update(img_array)
             
             # Extract text
-            text = pytesseract.image_to_string(img_array, config=custom_config)
+            text = pytesseract.image_to_string(img_array, config=self.OCR_CONFIG)
             return text.strip()
             
         except Exception as e:
@@ -201,39 +222,52 @@ class WorkingBoundaryDetector:
             return ""
     
     def wait_for_response_completion(self, timeout=60):
-        """Wait for Claude to finish typing with stability detection"""
+        """Wait for Claude to finish typing (cheap frame diff), then OCR the settled region once"""
         self.log("Waiting for response completion before OCR...")
         start_time = time.time()
         
-        last_text = ""
-        stable_count = 0
-        required_stability = 3
+        gate = self.stability_gate
+        gate.reset()
         check_interval = 2
+        text_region = self.find_claude_text_region()
+        stable = False
         
         while time.time() - start_time < timeout:
-            text_region = self.find_claude_text_region()
-            screenshot_path = self.take_screenshot_region(text_region)
-            
-            if screenshot_path:
-                current_text = self.extract_text_from_image(screenshot_path)
-                
-                if current_text == last_text:
-                    stable_count += 1
-                    self.log(f"Content stable (count: {stable_count}/{required_stability})")
-                    
-                    if stable_count >= required_stability:
-                        self.log("Response appears complete - content has stabilized")
-                        return current_text
+            try:
+                frame = pyautogui.screenshot(region=text_region)
+            except Exception as e:
+                self.log(f"Region capture failed: {e}")
+                frame = None
+            
+            if frame is not None:
+                settled = gate.update(frame)
+                if self.incremental_ocr:
+                    # Keep the line model current while Claude types: only changed lines are OCR'd
+                    self.incremental_ocr.update(self.preprocess(frame))
+                if settled:
+                    stable = True
+                    break
+                if gate.stable_count:
+                    self.log(f"Content stable (count: {gate.stable_count}/{gate.required})")
                 else:
-                    stable_count = 0
                     self.log("Content still changing - waiting for completion...")
-                
-                last_text = current_text
             
             time.sleep(check_interval)
         
-        self.log("Timeout waiting for content stability - proceeding with current text")
-        return last_text
+        if stable:
+            self.log("Response appears complete - content has stabilized")
+        else:
+            self.log("Timeout waiting for content stability - proceeding with current text")
+        
+        screenshot_path = self.take_screenshot_region(text_region)
+        text = self.extract_text_from_image(screenshot_path) if screenshot_path else ""
+        if self.incremental_ocr:
+            stats = self.incremental_ocr.get_stats()
+            self.log(f"Incremental OCR: {stats['lines_reused']} of lines reused, {stats['rows_ocr_share']} of rows OCR'd")
+        else:
+            gate.record_ocr()
+            self.log(f"OCR ran once instead of {gate.frames} times ({gate.get_stats()['ocr_calls_saved']} saved so far)")
+        return text
 
 class KaiWebAgent:
     """Enhanced web agent with multiple browser methods and sophisticated clipboard handling"""
@@ -492,13 +526,17 @@ class KaiWebAgent:
 class KaiCoordinator:
     """Main coordination class managing the complete automation workflow"""
     
-    def __init__(self):
+    def __init__(self, incremental_ocr=False):
         self.logger = logger
         self.state = {
             'current_desktop': 0,
             'last_url': None,
             'cycle_count': 0
         }
+        # Kept across cycles so an incremental OCR model carries over between responses.
+        # Off by default: one full OCR per settled response beats per-frame line OCR
+        # when every call starts a tesseract process (pytesseract fallback)
+        self.boundary_detector = WorkingBoundaryDetector(incremental=incremental_ocr)
 
     def run_send_to_claude_flow(self, message, target_desktop=1):
         """Send a message to Claude with desktop switching"""
@@ -548,7 +586,7 @@ class KaiCoordinator:
             # Step 2: Wait for Claude response and extract URL using proven drag method
             self.logger.info("Waiting for Claude response and extracting URL...")
             
-            boundary_detector = WorkingBoundaryDetector()
+            boundary_detector = self.boundary_detector
             stable_text = boundary_detector.wait_for_response_completion(timeout=30)
             
             if not (stable_text and '<<' in stable_text and '>>' in stable_text):
@@ -689,16 +727,17 @@ if __name__ == "__main__":
     print("KaiCoordinator - Hybrid Final Version 1.3")
     print("Combining proven OCR methods with enhanced navigation strategies")
     
-    coordinator = KaiCoordinator()
-    
     import argparse
     parser = argparse.ArgumentParser(description='Kai Automation System v1.3 (Hybrid)')
     parser.add_argument('--test', action='store_true', help='Run single test message')
     parser.add_argument('--single', action='store_true', help='Run single automation cycle')
     parser.add_argument('--continuous', action='store_true', help='Run continuous automation')
     parser.add_argument('--cycles', type=int, help='Maximum number of cycles for continuous mode')
+    parser.add_argument('--incremental-ocr', action='store_true',
+                        help='OCR changed lines on every frame of the response wait')
     
     args = parser.parse_args()
+    coordinator = KaiCoordinator(incremental_ocr=args.incremental_ocr)
     
     if args.test:
         success = coordinator.run_send_to_claude_flow("<< https://www.bbc.com/news >>", target_desktop=1)
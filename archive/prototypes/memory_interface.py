@@ -4,38 +4,31 @@ memory_interface.py
 Handles persistent memory storage and retrieval for Kai_WebNavigator.
 Stores successful selector strategies by domain and intent.
 
-Initial implementation uses JSON for simplicity.
+Backed by the shared SQLite strategy store (core/strategy_store.py), so this
+prototype sees the same results as every navigator and agent.
 """
 
-import json
-from pathlib import Path
 from datetime import datetime
 
-class MemoryInterface:
-    def __init__(self, memory_file):
-        self.memory_file = Path(memory_file)
-        self.memory = self._load_memory()
-
-    def _load_memory(self):
-        if self.memory_file.exists():
-            with open(self.memory_file, 'r') as f:
-                return json.load(f)
-        return {}
+from core.strategy_store import get_strategy_store
 
-    def _save_memory(self):
-        with open(self.memory_file, 'w') as f:
-            json.dump(self.memory, f, indent=2)
+class MemoryInterface:
+    def __init__(self, memory_file=None):
+        # memory_file is only read by the store's one-off migration
+        self.memory_file = memory_file
+        self.strategy_store = get_strategy_store()
 
     def get(self, domain, intent):
         """Retrieve stored strategy for a domain and intent."""
-        return self.memory.get(domain, {}).get(intent)
+        rows = [row for row in self.strategy_store.get_intent_strategies(domain, intent) if row["last_success"]]
+        if not rows:
+            return None
+        latest = max(rows, key=lambda row: row["last_success"])
+        return {
+            "successful_selector": latest["strategy"],
+            "last_used": datetime.utcfromtimestamp(latest["last_success"]).isoformat() + "Z"
+        }
 
     def store(self, domain, intent, strategy):
         """Store a successful strategy for a domain and intent."""
-        if domain not in self.memory:
-            self.memory[domain] = {}
-        self.memory[domain][intent] = {
-            "successful_selector": strategy,
-            "last_used": datetime.utcnow().isoformat() + "Z"
-        }
-        self._save_memory()
+        self.strategy_store.record(domain, intent, strategy, True)
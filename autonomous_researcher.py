@@ -4,13 +4,13 @@ Hybrid: Robust infrastructure + autonomous browsing commands
 Combines integrated_navigator reliability with daylong_researcher flexibility
 """
 
+import os
 import time
 import subprocess
 import pyautogui
 import json
 import re
 from pathlib import Path
-from playwright.async_api import async_playwright
 import asyncio
 from datetime import datetime
 
@@ -19,6 +19,19 @@ from agents.kai_boundary_agent import KaiBoundaryAgent
 from agents.kai_web_agent import KaiWebAgent
 from agents.kai_clipboard_agent import KaiClipboardAgent
 from agents.kai_desktop_agent import KaiDesktopAgent
+from agents.kai_link_click_agent import KaiLinkClickAgent
+from core.browser_pool import close_shared_pools, get_shared_pool
+from core.cdp_session import open_operator_page, get_cdp_session, copy_page_screenshot_to_clipboard, close_cdp_sessions
+from core.readiness import get_readiness_waiter
+from core.har_replay import get_har_session, close_har_session
+from core.strategy_resolver import resolve_strategies, click_resolved, build_cascade
+from core.link_scanner import scan_candidates
+from core.fan_out import ARTICLE_LINK_SELECTORS, pick_article_links, fan_out
+from core.prefetch import Prefetcher
+from core.strategy_store import get_strategy_store, close_strategy_store
+from core.strategy_bandit import StrategyBandit
+from core.negative_cache import NegativeCache
+from core.latency_histogram import StrategyTimer
 
 class ResearchLogger:
     """Enhanced logging system for research sessions"""
@@ -60,55 +73,15 @@ class ResearchLogger:
         
         print(f"📋 Session saved: {session_file}")
 
-class MemoryInterface:
-    """Memory system from integrated_navigator"""
-    def __init__(self, memory_file="memory.json"):
-        self.memory_file = Path(memory_file)
-        self.memory = self.load_memory()
-    
-    def load_memory(self):
-        if self.memory_file.exists():
-            try:
-                with open(self.memory_file, 'r') as f:
-                    return json.load(f)
-            except:
-                return {}
-        return {}
-    
-    def save_memory(self):
-        try:
-            with open(self.memory_file, 'w') as f:
-                json.dump(self.memory, f, indent=2)
-        except Exception as e:
-            print(f"Memory save failed: {e}")
-    
-    def get_strategy(self, domain, intent):
-        key = f"{domain}_{intent}"
-        return self.memory.get(key)
-    
-    def store_strategy(self, domain, intent, strategy, success=True):
-        key = f"{domain}_{intent}"
-        if key not in self.memory:
-            self.memory[key] = {"strategies": [], "success_count": 0, "total_count": 0}
-        
-        self.memory[key]["strategies"].append({
-            "strategy": strategy,
-            "success": success,
-            "timestamp": time.time()
-        })
-        
-        if success:
-            self.memory[key]["success_count"] += 1
-        self.memory[key]["total_count"] += 1
-        
-        self.save_memory()
-
 class CommandParser:
     """Flexible command parsing for Claude's natural language"""
     
     def __init__(self):
         # Command patterns
         self.patterns = {
+            "fan_out": [
+                r"(?:read|open)\s+(?:the\s+)?top\s+(\d+)(?:\s+(?:articles|stories|links))?(?:\s+(?:about|on)\s+(.+))?"
+            ],
             "article_click": [
                 r"(?:article|click|find).*?[:\-\s]+(.+)",
                 r"(?:read|open)\s+[\"']([^\"']+)[\"']",
@@ -130,6 +103,17 @@ class CommandParser:
         """Parse Claude's text into actionable commands"""
         text = text.strip()
         
+        # Try fan-out patterns (before article click, which would swallow "read ...")
+        for pattern in self.patterns["fan_out"]:
+            match = re.search(pattern, text, re.IGNORECASE)
+            if match:
+                return {
+                    "type": "fan_out",
+                    "count": int(match.group(1)),
+                    "query": match.group(2).strip() if match.group(2) else None,
+                    "confidence": 0.8
+                }
+        
         # Try article click patterns
         for pattern in self.patterns["article_click"]:
             match = re.search(pattern, text, re.IGNORECASE)
@@ -196,7 +180,10 @@ class ArticleClicker:
     
     def __init__(self, memory):
         self.memory = memory
+        self.bandit = StrategyBandit(memory)
+        self.negative_cache = NegativeCache(memory)
         self.intents = self.load_intents()
+        self.readiness = get_readiness_waiter()
     
     def load_intents(self):
         """Load or create intent definitions"""
@@ -210,6 +197,11 @@ class ArticleClicker:
         default_intents = {
             "click_first_article": {
                 "primary_selector": "article h2 a, h2 a, .story-link a, .storylink",
+                "resource_profile": "dom_only",
+                "readiness": {
+                    "page": {"type": "selector_visible", "selector": "article h2 a, h2 a, .story-link a, .storylink", "timeout": 5000},
+                    "action": {"type": "url_changed", "timeout": 5000}
+                },
                 "fallbacks": [
                     {"method": "css", "value": "[data-testid='card-headline'] a"},
                     {"method": "css", "value": ".media__link"},
@@ -221,6 +213,11 @@ class ArticleClicker:
             },
             "search_article": {
                 "primary_selector": "a[href*='article'], a[href*='story'], a[href*='post']",
+                "resource_profile": "text_only",
+                "readiness": {
+                    "page": {"type": "dom_stable", "stable_frames": 3, "timeout": 5000},
+                    "action": {"type": "url_changed", "timeout": 5000}
+                },
                 "fallbacks": [
                     {"method": "text_search", "value": "partial_match"},
                     {"method": "css", "value": "article a"},
@@ -284,8 +281,10 @@ class ArticleClicker:
                 best_matches.sort(key=lambda x: x["score"], reverse=True)
                 best_match = best_matches[0]
                 
+                previous_url = page.url
                 await best_match["element"].click()
-                await page.wait_for_load_state('networkidle', timeout=8000)
+                await self.readiness.wait_for_intent(page, self.intents.get("search_article"), "action",
+                                                     previous_url=previous_url, label="search_article")
                 
                 # Store successful strategy
                 self.memory.store_strategy(domain, "search_article", f"text:{query}", True)
@@ -309,67 +308,75 @@ class ArticleClicker:
         
         intent_config = self.intents[intent]
         
-        # Try remembered strategies first
-        remembered = self.memory.get_strategy(domain, intent)
-        strategies = []
-        
-        if remembered:
-            for strategy in remembered["strategies"]:
-                if strategy["success"]:
-                    strategies.append({
-                        "type": "memory",
-                        "selector": strategy["strategy"]
-                    })
-        
-        # Add primary and fallback strategies
-        strategies.append({
-            "type": "primary",
-            "selector": intent_config["primary_selector"]
-        })
-        
-        for fallback in intent_config.get("fallbacks", []):
-            strategies.append({
-                "type": "fallback",
-                "selector": fallback["value"]
-            })
-        
-        # Try each strategy
-        for strategy in strategies:
+        # A redesigned page gets its dead selectors back
+        await self.negative_cache.check_structure(page, domain)
+        
+        # Remembered, primary and fallback selectors (one each), ordered by expected time-to-click,
+        # minus those that keep failing here until their re-probe is due
+        strategies = self.bandit.order_cascade(
+            domain, intent, build_cascade(self.memory.rank_strategies(domain, intent), intent_config)
+        )
+        strategies = self.negative_cache.filter(domain, intent, strategies, key=lambda strategy: strategy["selector"])
+        timer = StrategyTimer()
+        
+        # Resolve the whole cascade in one in-page pass (query and visibility for every strategy)
+        try:
+            resolution = await resolve_strategies(page, strategies)
+        except Exception as e:
+            return {"success": False, "error": f"Strategy resolution failed: {e}"}
+        timer.lap("query")
+        
+        winner = resolution["winner"]
+        failed = strategies if winner is None else strategies[:winner]
+        for strategy in failed:
+            # No visible match: a failed attempt (buffered, written in one batch at cycle end)
+            self.memory.store_strategy(domain, intent, strategy["selector"], False)
+        
+        if winner is not None:
+            strategy = strategies[winner]
             try:
-                element = await page.query_selector(strategy["selector"])
-                
-                if element and await element.is_visible():
-                    text = await element.inner_text()
-                    href = await element.get_attribute("href")
-                    
-                    await element.click()
-                    await page.wait_for_load_state('networkidle', timeout=8000)
+                previous_url = page.url
+                clicked = await click_resolved(page)
+                timer.lap("click")
+                if clicked:
+                    await self.readiness.wait_for_intent(page, intent_config, "action",
+                                                         previous_url=previous_url, label=intent)
+                    timer.lap("wait")
                     
                     # Store successful strategy
-                    self.memory.store_strategy(domain, intent, strategy["selector"], True)
+                    self.memory.store_strategy(domain, intent, strategy["selector"], True,
+                                               latency=timer.elapsed(), phases=timer.phases)
                     
                     return {
                         "success": True,
                         "method": f"{strategy['type']}_selector",
-                        "article_title": text[:100],
-                        "selector": strategy["selector"]
+                        "article_title": (resolution["text"] or "")[:100],
+                        "selector": strategy["selector"],
+                        "matched_strategies": [strategies[m["index"]]["selector"]
+                                               for m in resolution["matches"] if m["visible"]]
                     }
-                    
             except Exception as e:
-                # Store failed strategy
-                self.memory.store_strategy(domain, intent, strategy["selector"], False)
-                continue
+                print(f"❌ Click failed for {strategy['selector']}: {e}")
+            
+            self.memory.store_strategy(domain, intent, strategy["selector"], False)
         
         return {"success": False, "error": "All selector strategies failed"}
 
 class AutonomousResearcher:
     """Main researcher class combining all components"""
     
-    def __init__(self):
-        self.memory = MemoryInterface()
+    def __init__(self, cdp_endpoint=None):
+        self.memory = get_strategy_store()
         self.article_clicker = ArticleClicker(self.memory)
         self.command_parser = CommandParser()
         self.logger = ResearchLogger()
+        self.cdp_endpoint = cdp_endpoint  # drive the visible Chrome tab instead of a headless copy
+        
+        self.fan_out_concurrency = 3
+        self.last_fan_out = []
+        
+        # Warm the likely next links while Claude is thinking
+        self.prefetcher = Prefetcher(max_pages=3, budget=20.0)
         
         self.cycle_count = 0
         self.current_url = None
@@ -402,13 +409,25 @@ class AutonomousResearcher:
         if not command:
             return False
         
+        # Claim a prefetched page if Claude picked one, then cancel the rest
+        warm = None
+        if command["type"] == "article_click":
+            warm = self.prefetcher.claim(query=command["query"])
+        elif command["type"] == "new_site":
+            warm = self.prefetcher.claim(url=command["url"])
+        await self.prefetcher.stop()
+        
         try:
-            if command["type"] == "new_site":
+            if warm:
+                return await self.open_warm_page(warm, command)
+            elif command["type"] == "new_site":
                 return await self.navigate_to_site(command["url"])
             elif command["type"] == "article_click":
                 return await self.click_article(command["query"])
             elif command["type"] == "navigation":
                 return await self.handle_navigation(command["action"])
+            elif command["type"] == "fan_out":
+                return await self.read_top_articles(command["count"], command.get("query"))
             else:
                 print(f"Unknown command type: {command['type']}")
                 return False
@@ -416,6 +435,36 @@ class AutonomousResearcher:
         except Exception as e:
             print(f"Command execution failed: {e}")
             return False
+        finally:
+            if warm:
+                await self.prefetcher.discard()
+    
+    async def open_warm_page(self, warm, command):
+        """
+        Use a prefetched page instead of navigating. Only used without a CDP
+        endpoint, where the operator page is a headless pool page too: the
+        warm page is what the operator would have opened.
+        """
+        print(f"⚡ Using prefetched page: {warm['title'][:80]}")
+        
+        KaiDesktopAgent(direction="right", presses=1).run_fast()
+        time.sleep(0.7)
+        
+        if not await copy_page_screenshot_to_clipboard(warm["page"]):
+            return False
+        
+        # The operator is now on the prefetched page, as after a normal navigation or click
+        previous_url = self.current_url
+        self.current_url = warm["url"]
+        self.session_urls.append(warm["url"])
+        if command["type"] == "new_site":
+            if not self.home_url:
+                self.home_url = warm["url"]
+            self.logger.log_action("navigate", warm["url"], f"Opened prefetched page: {warm['url']}")
+        else:
+            self.logger.log_action("article_click", previous_url,
+                                   f"Clicked (prefetched): {warm['title'][:100]}", True)
+        return True
     
     async def navigate_to_site(self, url):
         """Navigate to a new website"""
@@ -430,12 +479,17 @@ class AutonomousResearcher:
         time.sleep(0.7)
         
         # Open URL
-        web_agent = KaiWebAgent(url=url)
-        web_agent.run_fast()
-        time.sleep(2.0)
-        
-        # Capture homepage
-        subprocess.run(["screencapture", "-c"], check=True, timeout=8)
+        web_agent = KaiWebAgent(url=url, cdp_endpoint=self.cdp_endpoint)
+        if self.cdp_endpoint:
+            await web_agent.run_cdp()
+            session = await get_cdp_session(self.cdp_endpoint)
+            await session.copy_screenshot_to_clipboard()
+        else:
+            web_agent.run_fast()
+            time.sleep(2.0)
+            
+            # Capture homepage
+            subprocess.run(["screencapture", "-c"], check=True, timeout=8)
         
         self.logger.log_action("navigate", url, f"Opened homepage: {url}")
         return True
@@ -454,38 +508,108 @@ class AutonomousResearcher:
         article_info = None
         
         try:
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                page = await browser.new_page()
-                await page.goto(self.current_url if self.current_url.startswith('http') else f"https://{self.current_url}")
+            start_url = self.current_url if self.current_url.startswith('http') else f"https://{self.current_url}"
+            intent = "search_article" if query else "click_first_article"
+            intent_config = self.article_clicker.intents.get(intent, {})
+            async with open_operator_page(start_url, self.cdp_endpoint, wait_until='domcontentloaded',
+                                          resource_profile=intent_config.get("resource_profile")) as page:
+                await self.article_clicker.readiness.wait_for_intent(page, intent_config, "page", label=intent)
                 
                 domain = self.current_url.split('/')[2] if '/' in self.current_url else self.current_url
                 
                 # Try to find and click article
-                result = await self.article_clicker.find_and_click_article(page, domain, query)
+                async with get_har_session().step(intent):
+                    result = await self.article_clicker.find_and_click_article(page, domain, query)
                 
                 if result["success"]:
                     success = True
                     article_info = result
+                    clicked_from = self.current_url
+                    self.current_url = page.url
+                    self.session_urls.append(page.url)
                     
                     # Take screenshot of article
-                    time.sleep(2)
-                    subprocess.run(["screencapture", "-c"], check=True, timeout=8)
+                    if self.cdp_endpoint:
+                        await copy_page_screenshot_to_clipboard(page)
+                    else:
+                        time.sleep(2)
+                        subprocess.run(["screencapture", "-c"], check=True, timeout=8)
                     
-                    self.logger.log_action("article_click", self.current_url, 
+                    self.logger.log_action("article_click", clicked_from,
                                          f"Clicked: {result.get('article_title', query)}", True)
                 else:
                     self.logger.log_action("article_click", self.current_url,
                                          f"Failed to find: {query}", False)
                 
-                await browser.close()
-                
         except Exception as e:
             print(f"Article clicking error: {e}")
             self.logger.log_action("article_click", self.current_url, f"Error: {e}", False)
         
         return success
     
+    async def fan_out_articles(self, k=3, query=None, concurrency=None):
+        """
+        Open the top-K candidate links from the current page in parallel tabs of one
+        context and run read_content on each; yields results as they complete.
+        """
+        if not self.current_url:
+            print("No current URL - cannot fan out")
+            return
+        
+        start_url = self.current_url if self.current_url.startswith('http') else f"https://{self.current_url}"
+        link_intent = self.article_clicker.intents.get("click_first_article", {})
+        async with open_operator_page(start_url, self.cdp_endpoint, wait_until='domcontentloaded',
+                                      resource_profile=link_intent.get("resource_profile")) as page:
+            await self.article_clicker.readiness.wait_for_intent(page, link_intent, "page", label="fan_out")
+            candidates = await scan_candidates(page, ARTICLE_LINK_SELECTORS)
+            links = pick_article_links(candidates, page.url, k, query)
+        
+        if not links:
+            print("No candidate links found for fan-out")
+            return
+        
+        print(f"📑 Fanning out over {len(links)} links")
+        reader = KaiLinkClickAgent(headless=True)
+        read_intent = reader.intents.get("read_content", {})
+        titles = {link["url"]: link["title"] for link in links}
+        
+        # Tabs always live in a headless pool context, never in the user's visible window
+        pool = await get_shared_pool(headless=True)
+        async with pool.lease() as lease:
+            await get_har_session().attach(lease.context)
+            async for result in fan_out(lease.context, list(titles), reader.read_page,
+                                        concurrency=concurrency or self.fan_out_concurrency,
+                                        resource_profile=read_intent.get("resource_profile")):
+                result["link_title"] = titles[result["url"]]
+                yield result
+    
+    async def read_top_articles(self, k=3, query=None):
+        """Read several articles in one cycle, logging each as soon as it completes"""
+        self.last_fan_out = []
+        
+        try:
+            async for result in self.fan_out_articles(k, query):
+                self.last_fan_out.append(result)
+                title = result.get("title") or result["link_title"]
+                if result["success"]:
+                    print(f"✅ Read ({result['tab_time']:.1f}s): {title[:80]}")
+                    self.logger.log_action("fan_out_read", result["url"],
+                                           f"Read {result['content_length']} chars: {title[:100]}", True)
+                else:
+                    print(f"❌ Failed ({result['tab_time']:.1f}s): {result['url']} - {result.get('error')}")
+                    self.logger.log_action("fan_out_read", result["url"], f"Error: {result.get('error')}", False)
+        except Exception as e:
+            print(f"Fan-out error: {e}")
+            self.logger.log_action("fan_out_read", self.current_url, f"Error: {e}", False)
+        
+        return any(result["success"] for result in self.last_fan_out)
+    
+    def fan_out_summary(self, max_titles=5):
+        """One-line summary of the last fan-out for Claude"""
+        read = [r for r in self.last_fan_out if r["success"]]
+        titles = "; ".join((r.get("title") or r["link_title"])[:80] for r in read[:max_titles])
+        return f"Read {len(read)}/{len(self.last_fan_out)} articles: {titles}."
+    
     async def handle_navigation(self, action):
         """Handle navigation commands like home/back"""
         if action == "home" and self.home_url:
@@ -538,8 +662,8 @@ class AutonomousResearcher:
         self.cycle_count += 1
         print(f"\n=== Research Cycle {self.cycle_count} ===")
         
-        # Capture command from Claude
-        command = self.capture_claude_command()
+        # Capture command from Claude (in a thread, so prefetching keeps running)
+        command = await asyncio.to_thread(self.capture_claude_command)
         if not command:
             print("No valid command received")
             return False
@@ -547,14 +671,26 @@ class AutonomousResearcher:
         # Execute command
         success = await self.execute_command(command)
         
+        # Persist this cycle's strategy results in one write
+        self.memory.end_cycle()
+        
         # Send results back to Claude
-        if success:
+        if success and command["type"] == "fan_out":
+            context = self.fan_out_summary()
+        elif success:
             context = f"Completed: {command['type']}"
         else:
             context = f"Failed: {command['type']}"
         
         self.send_screenshot_to_claude(context)
         
+        # Preload the likely next links while Claude reads the screenshot. Not with a CDP
+        # endpoint: warm pages live in the headless pool, whose cache the visible Chrome
+        # does not share, so a hand-off would show Claude a page the visible tab is not on
+        if self.current_url and not self.cdp_endpoint:
+            start_url = self.current_url if self.current_url.startswith('http') else f"https://{self.current_url}"
+            await self.prefetcher.start(start_url)
+        
         return success
 
 async def main():
@@ -565,9 +701,10 @@ async def main():
     print("- Robust article clicking with memory")
     print("- Session logging and progress tracking")
     print("- Fallback strategies for reliability")
+    print("- Parallel fan-out: 'read top 3 articles [about ...]'")
     print()
     
-    researcher = AutonomousResearcher()
+    researcher = AutonomousResearcher(cdp_endpoint=os.environ.get("KAI_CDP_ENDPOINT"))
     
     # Initial setup
     KaiDesktopAgent(direction="right", presses=1).run_fast()
@@ -586,13 +723,22 @@ async def main():
             if not success:
                 print("Cycle failed, continuing...")
             
-            time.sleep(1.5)
+            await asyncio.sleep(1.5)
             
     except KeyboardInterrupt:
         print("\nResearch session ending...")
         researcher.logger.save_session()
         print(f"Total cycles completed: {researcher.cycle_count}")
         print(f"Sites visited: {len(set(researcher.session_urls))}")
+        print(f"Prefetch: {researcher.prefetcher.get_stats()}")
+        print(f"Dead selectors skipped: {researcher.article_clicker.negative_cache.get_stats()}")
+    finally:
+        await researcher.prefetcher.stop()
+        await researcher.prefetcher.discard()
+        await close_shared_pools()
+        close_har_session()
+        close_strategy_store()
+        await close_cdp_sessions()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
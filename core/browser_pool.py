@@ -0,0 +1,257 @@
+"""
+browser_pool.py
+
+Long-lived pool of warm Chromium browsers shared by every navigator and agent.
+Instead of launching a fresh browser per click, callers lease an isolated
+context + page from an already running browser and hand it back when done.
+
+- browsers are launched once and reused across cycles
+- each lease gets its own BrowserContext (cookies/storage are not shared)
+- a browser is recycled after `max_uses` leases or when it crashes/disconnects
+- pool-level stats: leases, lease wait, launches, recycles, crashes
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, Any, Optional, List
+
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page
+
+from core.kai_agent_base import logger
+
+
+class BrowserLease:
+    """A context + page handed out by the pool. Release it via BrowserPool.release()."""
+
+    def __init__(self, slot, context: BrowserContext, page: Page, wait_time: float):
+        self.slot = slot
+        self.context = context
+        self.page = page
+        self.wait_time = wait_time
+        self.leased_at = time.monotonic()
+
+    @property
+    def browser(self) -> Browser:
+        return self.slot.browser
+
+
+class _BrowserSlot:
+    """One warm browser process and its usage counters."""
+
+    def __init__(self, index: int):
+        self.index = index
+        self.browser: Optional[Browser] = None
+        self.uses = 0
+        self.active = 0
+        self.crashed = False
+
+    @property
+    def alive(self) -> bool:
+        return self.browser is not None and not self.crashed and self.browser.is_connected()
+
+
+class BrowserPool:
+    def __init__(self, size: int = 1, headless: bool = True, max_uses: int = 50,
+                 max_leases_per_browser: int = 4, launch_options: Dict[str, Any] = None):
+        self.size = size
+        self.headless = headless
+        self.max_uses = max_uses
+        self.max_leases_per_browser = max_leases_per_browser
+        self.launch_options = launch_options or {}
+
+        self.playwright = None
+        self.slots: List[_BrowserSlot] = [_BrowserSlot(i) for i in range(size)]
+        self._condition = asyncio.Condition()
+        self._start_lock = asyncio.Lock()
+        self._started = False
+
+        self.stats = {
+            'leases': 0,
+            'launches': 0,
+            'recycles': 0,
+            'crashes': 0,
+            'lease_wait_total': 0.0,
+            'lease_wait_max': 0.0
+        }
+
+    async def start(self):
+        """Start Playwright and warm up every browser in the pool"""
+        async with self._start_lock:
+            if self._started:
+                return
+            self.playwright = await async_playwright().start()
+            async with self._condition:
+                for slot in self.slots:
+                    await self._launch(slot)
+            self._started = True
+        logger.info(f"[BrowserPool] Started {self.size} warm browser(s) (headless={self.headless})")
+
+    async def close(self):
+        """Close every browser and stop Playwright"""
+        if not self._started:
+            return
+        for slot in self.slots:
+            await self._close_browser(slot)
+        if self.playwright:
+            await self.playwright.stop()
+            self.playwright = None
+        self._started = False
+        logger.info(f"[BrowserPool] Closed. Stats: {self.get_stats()}")
+
+    async def _launch(self, slot: _BrowserSlot):
+        """Launch (or relaunch) the browser for a slot. Caller holds the condition lock."""
+        await self._close_browser(slot)
+        browser = await self.playwright.chromium.launch(headless=self.headless, **self.launch_options)
+        browser.on('disconnected', lambda _: self._mark_crashed(slot, browser))
+        slot.browser = browser
+        slot.uses = 0
+        slot.crashed = False
+        self.stats['launches'] += 1
+
+    async def _close_browser(self, slot: _BrowserSlot):
+        browser, slot.browser = slot.browser, None
+        if browser is not None:
+            try:
+                if browser.is_connected():
+                    await browser.close()
+            except Exception as e:
+                logger.warning(f"[BrowserPool] Error closing browser {slot.index}: {e}")
+
+    def _mark_crashed(self, slot: _BrowserSlot, browser: Browser):
+        # Ignore disconnects of browsers we closed or replaced ourselves
+        if slot.browser is browser and not slot.crashed:
+            slot.crashed = True
+            self.stats['crashes'] += 1
+            logger.warning(f"[BrowserPool] Browser {slot.index} disconnected")
+
+    def _needs_recycle(self, slot: _BrowserSlot) -> bool:
+        return not slot.alive or slot.uses >= self.max_uses
+
+    async def _pick_slot(self) -> Optional[_BrowserSlot]:
+        """Pick the least busy healthy slot, recycling an idle worn-out one if needed"""
+        healthy = [s for s in self.slots
+                   if not self._needs_recycle(s) and s.active < self.max_leases_per_browser]
+        if healthy:
+            return min(healthy, key=lambda s: s.active)
+
+        for slot in self.slots:
+            if self._needs_recycle(slot) and slot.active == 0:
+                await self._recycle(slot)
+                return slot
+
+        return None
+
+    async def _recycle(self, slot: _BrowserSlot):
+        reason = "crash" if not slot.alive else f"{slot.uses} uses"
+        logger.info(f"[BrowserPool] Recycling browser {slot.index} ({reason})")
+        self.stats['recycles'] += 1
+        await self._launch(slot)
+
+    async def acquire(self, **context_options) -> BrowserLease:
+        """Lease a fresh context + page from a warm browser"""
+        await self.start()
+        wait_start = time.monotonic()
+
+        async with self._condition:
+            while True:
+                slot = await self._pick_slot()
+                if slot is not None:
+                    break
+                await self._condition.wait()
+            slot.active += 1
+            slot.uses += 1
+
+        context = None
+        try:
+            context = await slot.browser.new_context(**context_options)
+            page = await context.new_page()
+        except BaseException as e:
+            # Give the slot back before awaiting anything, so a cancelled lease
+            # (e.g. a prefetch task) cannot leak it
+            slot.active -= 1
+            if isinstance(e, Exception) and not slot.crashed:
+                slot.crashed = True
+                self.stats['crashes'] += 1
+            if context is not None:
+                try:
+                    await context.close()
+                except Exception as close_error:
+                    logger.debug(f"[BrowserPool] Context close failed: {close_error}")
+            async with self._condition:
+                self._condition.notify_all()
+            raise
+
+        wait_time = time.monotonic() - wait_start
+        self.stats['leases'] += 1
+        self.stats['lease_wait_total'] += wait_time
+        self.stats['lease_wait_max'] = max(self.stats['lease_wait_max'], wait_time)
+        return BrowserLease(slot, context, page, wait_time)
+
+    async def release(self, lease: BrowserLease, crashed: bool = False):
+        """Return a lease to the pool, closing its context"""
+        slot = lease.slot
+        try:
+            await lease.context.close()
+        except Exception as e:
+            logger.debug(f"[BrowserPool] Context close failed: {e}")
+            crashed = crashed or not slot.alive
+
+        async with self._condition:
+            slot.active -= 1
+            if crashed and not slot.crashed:
+                slot.crashed = True
+                self.stats['crashes'] += 1
+            # Recycle eagerly so the next lease finds a warm browser
+            if slot.active == 0 and self._needs_recycle(slot) and self._started:
+                try:
+                    await self._recycle(slot)
+                except Exception as e:
+                    logger.error(f"[BrowserPool] Relaunch of browser {slot.index} failed: {e}")
+            self._condition.notify_all()
+
+    @asynccontextmanager
+    async def lease(self, **context_options):
+        """Async context manager around acquire()/release()"""
+        lease = await self.acquire(**context_options)
+        try:
+            yield lease
+        finally:
+            await self.release(lease, crashed=not lease.slot.alive)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Get pool-level statistics"""
+        leases = self.stats['leases']
+        return {
+            'browsers': self.size,
+            'alive': sum(1 for s in self.slots if s.alive),
+            'active_leases': sum(s.active for s in self.slots),
+            'leases': leases,
+            'launches': self.stats['launches'],
+            'recycles': self.stats['recycles'],
+            'crashes': self.stats['crashes'],
+            'avg_lease_wait': f"{(self.stats['lease_wait_total'] / leases) if leases else 0:.3f}s",
+            'max_lease_wait': f"{self.stats['lease_wait_max']:.3f}s",
+            'launches_saved': max(0, leases - self.stats['launches'])
+        }
+
+
+# Shared pools, one per headless mode, so every navigator reuses the same browsers
+_shared_pools: Dict[bool, BrowserPool] = {}
+
+
+async def get_shared_pool(headless: bool = True, **kwargs) -> BrowserPool:
+    """Get (and lazily start) the process-wide pool for the given headless mode"""
+    pool = _shared_pools.get(headless)
+    if pool is None:
+        pool = BrowserPool(headless=headless, **kwargs)
+        _shared_pools[headless] = pool
+    await pool.start()
+    return pool
+
+
+async def close_shared_pools():
+    """Close every shared pool. Call once at shutdown."""
+    for pool in list(_shared_pools.values()):
+        await pool.close()
+    _shared_pools.clear()
@@ -0,0 +1,182 @@
+"""
+cdp_session.py
+
+Attach to the user's visible Chrome over the Chrome DevTools Protocol and drive
+the same tab that ends up in the screenshot, instead of loading every page a
+second time in a separate headless Chromium.
+
+Chrome must be started with a remote debugging port, e.g.:
+    open -a "Google Chrome" --args --remote-debugging-port=9222
+
+- navigation, clicking, readiness and screenshots all run on the visible tab
+- navigation is skipped when the tab is already on the requested URL
+- open_operator_page() hides the CDP / headless-pool choice from navigators
+"""
+
+import subprocess
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse
+
+from playwright.async_api import async_playwright, Browser, BrowserContext, Page
+
+from core.kai_agent_base import logger
+from core.browser_pool import get_shared_pool
+from core.resource_blocking import get_resource_blocker
+from core.har_replay import get_har_session
+from core.storage_state import get_storage_state_store, domain_of
+
+DEFAULT_CDP_ENDPOINT = "http://localhost:9222"
+
+
+def _same_url(a: str, b: str) -> bool:
+    return (a or "").rstrip('/') == (b or "").rstrip('/')
+
+
+class CDPSession:
+    def __init__(self, endpoint: str = DEFAULT_CDP_ENDPOINT):
+        self.endpoint = endpoint
+        self.playwright = None
+        self.browser: Optional[Browser] = None
+        self.context: Optional[BrowserContext] = None
+        self.page: Optional[Page] = None
+        self.last_navigation = (None, None)  # (requested url, url the tab ended up on)
+        self.stats = {'navigations': 0, 'navigations_skipped': 0, 'screenshots': 0}
+
+    @property
+    def connected(self) -> bool:
+        return self.browser is not None and self.browser.is_connected()
+
+    async def connect(self):
+        """Connect to the running browser (no-op if already connected)"""
+        if self.connected:
+            return
+        if self.playwright is None:
+            self.playwright = await async_playwright().start()
+        self.browser = await self.playwright.chromium.connect_over_cdp(self.endpoint)
+        # The user's own windows live in the default context
+        if self.browser.contexts:
+            self.context = self.browser.contexts[0]
+        else:
+            self.context = await self.browser.new_context()
+        self.page = None
+        logger.info(f"[CDPSession] Attached to {self.endpoint} ({len(self.context.pages)} tab(s))")
+
+    async def get_page(self) -> Page:
+        """Get the tab we drive: the last one we used, else the most recent regular tab"""
+        await self.connect()
+        if self.page is not None and not self.page.is_closed():
+            return self.page
+
+        tabs = [p for p in self.context.pages
+                if not p.is_closed() and not p.url.startswith(('devtools://', 'chrome-extension://'))]
+        self.page = tabs[-1] if tabs else await self.context.new_page()
+        return self.page
+
+    async def goto(self, url: str, wait_until: str = 'domcontentloaded', timeout: int = 30000) -> Page:
+        """Navigate the visible tab, skipping the load if it is already there"""
+        page = await self.get_page()
+        requested, landed = self.last_navigation
+        # Redirects (bbc.co.uk -> www.bbc.co.uk) still count as "already there"
+        if _same_url(page.url, url) or (_same_url(requested, url) and _same_url(landed, page.url)):
+            self.stats['navigations_skipped'] += 1
+            logger.info(f"[CDPSession] Tab already on {url}, skipping navigation")
+        else:
+            await page.goto(url, wait_until=wait_until, timeout=timeout)
+            self.last_navigation = (url, page.url)
+            self.stats['navigations'] += 1
+        await page.bring_to_front()
+        return page
+
+    async def screenshot(self, path: str = None, full_page: bool = False) -> bytes:
+        """Screenshot the visible tab"""
+        page = await self.get_page()
+        self.stats['screenshots'] += 1
+        return await page.screenshot(path=path, full_page=full_page)
+
+    async def copy_screenshot_to_clipboard(self, path: str = "debug_screenshots/cdp_tab.png") -> bool:
+        """Screenshot the tab and put the PNG on the macOS clipboard (replaces `screencapture -c`)"""
+        page = await self.get_page()
+        return await copy_page_screenshot_to_clipboard(page, path)
+
+    async def close(self):
+        """Disconnect without closing the user's browser"""
+        if self.playwright:
+            await self.playwright.stop()
+        self.playwright = None
+        self.browser = None
+        self.context = None
+        self.page = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {'endpoint': self.endpoint, 'connected': self.connected, **self.stats}
+
+
+async def copy_page_screenshot_to_clipboard(page: Page, path: str = "debug_screenshots/cdp_tab.png") -> bool:
+    """Save a page screenshot and load it into the clipboard as PNG"""
+    try:
+        screenshot_path = Path(path).resolve()
+        screenshot_path.parent.mkdir(parents=True, exist_ok=True)
+        await page.screenshot(path=str(screenshot_path))
+        subprocess.run([
+            "osascript", "-e",
+            f'set the clipboard to (read (POSIX file "{screenshot_path}") as «class PNGf»)'
+        ], check=True, timeout=8)
+        return True
+    except Exception as e:
+        logger.warning(f"[CDPSession] Screenshot to clipboard failed: {e}")
+        return False
+
+
+# Shared sessions, one per endpoint
+_sessions: Dict[str, CDPSession] = {}
+
+
+async def get_cdp_session(endpoint: str = DEFAULT_CDP_ENDPOINT) -> CDPSession:
+    """Get (and connect) the process-wide session for an endpoint"""
+    session = _sessions.get(endpoint)
+    if session is None:
+        session = CDPSession(endpoint)
+        _sessions[endpoint] = session
+    await session.connect()
+    return session
+
+
+async def close_cdp_sessions():
+    """Disconnect every shared session. Call once at shutdown."""
+    for session in list(_sessions.values()):
+        await session.close()
+    _sessions.clear()
+
+
+@asynccontextmanager
+async def open_operator_page(url: str, cdp_endpoint: str = None, headless: bool = True,
+                             wait_until: str = 'load', timeout: int = 30000,
+                             resource_profile: str = None):
+    """
+    Yield a page showing `url`.
+    With cdp_endpoint: the user's visible tab (loaded once, shared with the screenshot).
+    Without: a fresh page leased from the shared headless pool, with the intent's
+    resource blocking profile applied (never applied to the visible tab),
+    the domain's stored cookies/localStorage loaded (and saved back afterwards),
+    and recorded or replayed if a HAR session is active.
+    """
+    if cdp_endpoint:
+        session = await get_cdp_session(cdp_endpoint)
+        yield await session.goto(url, wait_until=wait_until, timeout=timeout)
+    else:
+        pool = await get_shared_pool(headless=headless)
+        har = get_har_session()
+        store = get_storage_state_store()
+        domain = domain_of(url)
+        state = store.load(domain)
+        context_options = {'storage_state': state} if state else {}
+        async with pool.lease(**context_options) as lease:
+            await har.attach(lease.context)
+            if resource_profile:
+                await get_resource_blocker().apply(lease.page, resource_profile)
+            async with har.step(f"open {urlparse(url).netloc}"):
+                await lease.page.goto(url, wait_until=wait_until, timeout=timeout)
+            yield lease.page
+            await store.save(lease.context, domain)
@@ -0,0 +1,106 @@
+"""
+fan_out.py
+
+Concurrent multi-tab fan-out for research cycles.
+Rather than open -> read -> back for one article at a time, the top-K candidate
+links from the current page are opened in parallel tabs of one browser context
+(bounded by a concurrency limit), a worker such as read_content runs on each tab,
+and results are yielded as they complete, not in link order.
+
+- pick_article_links: headline-like links from a link_scanner candidate table
+- fan_out: async generator running a worker over URLs in parallel tabs
+"""
+
+import asyncio
+import time
+from typing import Dict, Any, List, Optional, Callable, Awaitable, AsyncIterator
+from urllib.parse import urljoin, urlparse
+
+from playwright.async_api import BrowserContext, Page
+
+from core.kai_agent_base import logger
+from core.link_scanner import rank_candidates
+from core.resource_blocking import get_resource_blocker
+
+ARTICLE_LINK_SELECTORS = [
+    'article a[href]',
+    'h2 a[href]',
+    'h3 a[href]',
+    '[data-testid="card-headline"] a[href]',
+    '.headline a[href]',
+    'a[href]'
+]
+
+MIN_HEADLINE_LENGTH = 20
+
+
+def pick_article_links(candidates: List[Dict[str, Any]], base_url: str, k: int,
+                       query: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Top-K distinct same-site links that look like headlines.
+    With a query the candidates are ranked by relevance, otherwise selector-group
+    then DOM order is kept (article/headline links before generic anchors).
+    """
+    if query:
+        candidates = rank_candidates(candidates, query)
+    site = urlparse(base_url).netloc.replace('www.', '')
+
+    picked = []
+    seen = {base_url.split('#')[0]}
+    for candidate in sorted(candidates, key=lambda c: (-c.get('score', 0), c['group'], c['index'])):
+        href = candidate['href']
+        if not candidate['visible'] or not href or href.startswith(('#', 'javascript:', 'mailto:')):
+            continue
+        if len(candidate['text']) < MIN_HEADLINE_LENGTH:
+            continue
+        url = urljoin(base_url, href).split('#')[0]
+        if site not in urlparse(url).netloc or url in seen:
+            continue
+        seen.add(url)
+        picked.append({'url': url, 'title': candidate['text'][:120]})
+        if len(picked) >= k:
+            break
+    return picked
+
+
+async def fan_out(context: BrowserContext, urls: List[str], worker: Callable[[Page], Awaitable[Dict[str, Any]]],
+                  concurrency: int = 3, resource_profile: Optional[str] = None,
+                  timeout: int = 30000) -> AsyncIterator[Dict[str, Any]]:
+    """
+    Open each URL in its own tab of `context` (at most `concurrency` at once),
+    run `worker(page)` on it and yield the results as they complete.
+    Every result carries url, tab_time and, on failure, success=False + error.
+    Remaining tabs are cancelled if the consumer stops early.
+    """
+    semaphore = asyncio.Semaphore(concurrency)
+    blocker = get_resource_blocker()
+
+    async def run(url: str) -> Dict[str, Any]:
+        async with semaphore:
+            start = time.monotonic()
+            page = await context.new_page()
+            try:
+                if resource_profile:
+                    await blocker.apply(page, resource_profile)
+                await page.goto(url, wait_until='domcontentloaded', timeout=timeout)
+                result = await worker(page)
+            except Exception as e:
+                result = {'success': False, 'error': str(e).splitlines()[0]}
+            finally:
+                await page.close()
+            result.update({'url': url, 'tab_time': time.monotonic() - start})
+            return result
+
+    start = time.monotonic()
+    tasks = [asyncio.create_task(run(url)) for url in urls]
+    try:
+        for completed in asyncio.as_completed(tasks):
+            result = await completed
+            logger.info(f"[FanOut] {result['url']} done in {result['tab_time']:.1f}s "
+                        f"({'ok' if result.get('success') else result.get('error')})")
+            yield result
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        logger.info(f"[FanOut] {len(urls)} tabs (concurrency {concurrency}) in {time.monotonic() - start:.1f}s")
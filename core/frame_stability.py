@@ -0,0 +1,104 @@
+"""
+frame_stability.py
+
+Cheap "has the screen stopped changing?" gate, so OCR runs once on a
+settled frame instead of being used as the change detector. Waiting for
+Claude to finish typing used to mean a full Tesseract pass every 2 s just
+to compare strings.
+
+- each frame is reduced to a small grayscale thumbnail (area averaging,
+  64x64 by default); a thumbnail cell changed when it differs by more than
+  `threshold` gray levels, and two frames are identical when fewer than
+  `min_changed_cells` cells changed. Changes are counted per cell, not
+  averaged over the frame: in an 868x856 region a cell covers ~180 px, so
+  a new word moves its cells by tens of gray levels (while anti-aliasing
+  noise averages out), but only moves the whole-frame mean by ~0.1. A
+  typing indicator or caret counts as a change, as it should while the
+  response is still streaming
+- a perceptual hash (dhash) of the thumbnail is kept too, for logging and
+  for callers that want to key caches on the frame
+- StabilityGate.update(frame) -> True once `required` consecutive frame
+  pairs were identical; ocr_calls_saved counts the OCR passes the old
+  per-frame comparison would have made
+"""
+
+from typing import Dict, Any, Optional
+
+import cv2
+import numpy as np
+
+DEFAULT_SIZE = (64, 64)
+DEFAULT_THRESHOLD = 8  # gray levels a thumbnail cell must move to count as changed
+DEFAULT_MIN_CHANGED_CELLS = 1
+
+
+def thumbnail(frame, size=DEFAULT_SIZE) -> np.ndarray:
+    """Downscaled grayscale copy of a PIL image or numpy array"""
+    array = np.asarray(frame)
+    if array.ndim == 3:
+        array = cv2.cvtColor(array, cv2.COLOR_RGBA2GRAY if array.shape[2] == 4 else cv2.COLOR_RGB2GRAY)
+    return cv2.resize(array, size, interpolation=cv2.INTER_AREA)
+
+
+def frame_difference(left: np.ndarray, right: np.ndarray, threshold: float = DEFAULT_THRESHOLD):
+    """(cells changed by more than `threshold` gray levels, largest cell change) of two thumbnails"""
+    diff = cv2.absdiff(left, right)
+    return int(np.count_nonzero(diff > threshold)), float(diff.max())
+
+
+def dhash(thumb: np.ndarray, hash_size: int = 8) -> int:
+    """Difference hash: one bit per horizontally adjacent pixel pair"""
+    small = cv2.resize(thumb, (hash_size + 1, hash_size), interpolation=cv2.INTER_AREA)
+    bits = (small[:, 1:] > small[:, :-1]).flatten()
+    return int(''.join('1' if bit else '0' for bit in bits), 2)
+
+
+class StabilityGate:
+    def __init__(self, required: int = 3, threshold: float = DEFAULT_THRESHOLD,
+                 min_changed_cells: int = DEFAULT_MIN_CHANGED_CELLS, size=DEFAULT_SIZE):
+        self.required = required
+        self.threshold = threshold
+        self.min_changed_cells = min_changed_cells
+        self.size = size
+        self.reset()
+        self.stats = {
+            'responses': 0,
+            'frames': 0,
+            'ocr_calls': 0,
+            'ocr_calls_saved': 0
+        }
+
+    def reset(self):
+        """Start waiting for a new response"""
+        self._last: Optional[np.ndarray] = None
+        self.stable_count = 0
+        self.frames = 0
+        self.last_difference: Optional[float] = None  # largest cell change, gray levels
+        self.last_changed_cells = 0
+        self.last_hash: Optional[int] = None
+
+    def update(self, frame) -> bool:
+        """Feed the next frame; True once the last `required` comparisons found no change"""
+        thumb = thumbnail(frame, self.size)
+        self.frames += 1
+        self.stats['frames'] += 1
+        self.last_hash = dhash(thumb)
+        if self._last is not None:
+            self.last_changed_cells, self.last_difference = frame_difference(self._last, thumb, self.threshold)
+            unchanged = self.last_changed_cells < self.min_changed_cells
+            self.stable_count = self.stable_count + 1 if unchanged else 0
+        self._last = thumb
+        return self.stable_count >= self.required
+
+    def record_ocr(self):
+        """The settled frame was OCR'd once; the per-frame approach would have OCR'd every frame"""
+        self.stats['responses'] += 1
+        self.stats['ocr_calls'] += 1
+        self.stats['ocr_calls_saved'] += max(0, self.frames - 1)
+
+    def get_stats(self) -> Dict[str, Any]:
+        responses = self.stats['responses']
+        return {
+            **self.stats,
+            'ocr_calls_saved_per_response': round(self.stats['ocr_calls_saved'] / responses, 1) if responses else 0
+        }
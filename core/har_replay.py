@@ -0,0 +1,149 @@
+"""
+har_replay.py
+
+HAR record/replay for deterministic, offline navigation runs.
+
+- record: every pooled context a session opens routes through
+  context.route_from_har(update=True), so its traffic is archived to
+  har/<session>/<nnn>.har when the context closes, and per-step timings
+  are saved to har/<session>/timings.json
+- replay: the same contexts are served from those archives (unmatched
+  requests are aborted, so nothing hits the network) and each step's
+  timing is reported against the recorded one
+
+Contexts are numbered in the order they are opened, so a replay has to
+follow the same command sequence as its recording.
+
+Enable with KAI_HAR_MODE=record|replay and KAI_HAR_SESSION=<name>
+(or pass mode/session to HarSession directly). The visible CDP tab is
+never recorded or replayed.
+"""
+
+import json
+import os
+import time
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+
+from playwright.async_api import BrowserContext
+
+from core.kai_agent_base import logger
+
+HAR_ROOT = "har"
+HAR_MODES = ('record', 'replay')
+
+
+class HarSession:
+    def __init__(self, mode: Optional[str] = None, session: str = "default", root: str = HAR_ROOT):
+        if mode and mode not in HAR_MODES:
+            raise ValueError(f"Unknown HAR mode '{mode}', expected one of {HAR_MODES}")
+        self.mode = mode
+        self.session = session
+        self.directory = Path(root) / session
+        self.contexts_attached = 0
+        self.steps: List[Dict[str, Any]] = []
+        self.recorded_steps: List[Dict[str, Any]] = []
+
+        if self.mode == 'record':
+            self.directory.mkdir(parents=True, exist_ok=True)
+        elif self.mode == 'replay':
+            timings_file = self.directory / "timings.json"
+            if timings_file.exists():
+                with open(timings_file, 'r') as f:
+                    self.recorded_steps = json.load(f)
+            else:
+                logger.warning(f"[HAR] No recorded timings in {self.directory}")
+
+    @property
+    def active(self) -> bool:
+        return self.mode is not None
+
+    async def attach(self, context: BrowserContext) -> Optional[Path]:
+        """Route a freshly opened context through the session's next archive"""
+        if not self.active:
+            return None
+
+        har_path = self.directory / f"{self.contexts_attached:03d}.har"
+        self.contexts_attached += 1
+
+        if self.mode == 'record':
+            await context.route_from_har(str(har_path), update=True, update_content='embed')
+            logger.info(f"[HAR] Recording context to {har_path}")
+        elif har_path.exists():
+            await context.route_from_har(str(har_path), not_found='abort')
+            logger.info(f"[HAR] Replaying context from {har_path}")
+        else:
+            logger.warning(f"[HAR] Missing archive {har_path}, context goes to the network")
+        return har_path
+
+    @asynccontextmanager
+    async def step(self, name: str):
+        """Time one step of the session (a navigation, an intent, a click)"""
+        start = time.monotonic()
+        try:
+            yield
+        finally:
+            if self.active:
+                self.steps.append({'step': name, 'elapsed': round(time.monotonic() - start, 4)})
+
+    def compare(self) -> List[Dict[str, Any]]:
+        """Replayed step timings against the recording, matched by position and name"""
+        report = []
+        for i, step in enumerate(self.steps):
+            recorded = self.recorded_steps[i] if i < len(self.recorded_steps) else None
+            entry = {'step': step['step'], 'replayed': step['elapsed']}
+            if recorded and recorded['step'] == step['step']:
+                entry['recorded'] = recorded['elapsed']
+                entry['delta'] = round(step['elapsed'] - recorded['elapsed'], 4)
+                entry['speedup'] = round(recorded['elapsed'] / step['elapsed'], 1) if step['elapsed'] else None
+            else:
+                entry['recorded'] = None
+                entry['diverged'] = True
+            report.append(entry)
+        return report
+
+    def finish(self) -> Optional[List[Dict[str, Any]]]:
+        """Save recorded timings, or print and return the replay comparison"""
+        if self.mode == 'record':
+            with open(self.directory / "timings.json", 'w') as f:
+                json.dump(self.steps, f, indent=2)
+            logger.info(f"[HAR] Recorded {len(self.steps)} steps across "
+                        f"{self.contexts_attached} contexts in {self.directory}")
+            return None
+
+        if self.mode == 'replay':
+            report = self.compare()
+            print(f"\n⏱️  HAR replay of '{self.session}' ({len(report)} steps):")
+            for entry in report:
+                if entry['recorded'] is None:
+                    print(f"  {entry['step']:30s} replayed {entry['replayed'] * 1000:8.1f} ms  (not in recording)")
+                else:
+                    print(f"  {entry['step']:30s} recorded {entry['recorded'] * 1000:8.1f} ms  "
+                          f"replayed {entry['replayed'] * 1000:8.1f} ms  x{entry['speedup']}")
+            return report
+        return None
+
+
+_shared_session: Optional[HarSession] = None
+
+
+def get_har_session() -> HarSession:
+    """Process-wide session configured from KAI_HAR_MODE / KAI_HAR_SESSION (inactive by default)"""
+    global _shared_session
+    if _shared_session is None:
+        _shared_session = HarSession(
+            mode=os.environ.get("KAI_HAR_MODE") or None,
+            session=os.environ.get("KAI_HAR_SESSION", "default")
+        )
+    return _shared_session
+
+
+def close_har_session() -> Optional[List[Dict[str, Any]]]:
+    """Finish the shared session (call after the pools have closed their contexts)"""
+    global _shared_session
+    if _shared_session is None:
+        return None
+    report = _shared_session.finish()
+    _shared_session = None
+    return report
@@ -0,0 +1,149 @@
+"""
+incremental_ocr.py
+
+Dirty-rectangle OCR for a region that is captured again and again (Claude's
+response area). Between captures most of the region is unchanged, yet the
+whole region used to be OCR'd every time. IncrementalOCR keeps a text model
+of the region line by line and only OCRs the line bands that changed.
+KaiOCRAgent(incremental=True) and the archived boundary detector
+(--incremental-ocr) feed it every frame of their stability wait, so the
+lines are read as Claude types them and the text is ready once the region
+settles; the model also carries over between responses. Both are opt-in:
+the stability gate alone OCRs once per settled response, while this makes
+one small OCR call per changed line per frame, which only pays off with a
+persistent OCR backend (tesserocr), not a tesseract process per call.
+
+- frames are the caller's preprocessed grayscale/binary images (so diffs
+  are taken after thresholding, which removes anti-aliasing noise)
+- a frame is cut into line bands from its row profile: rows containing
+  ink (max - min >= `ink_threshold`), joined across gaps of up to
+  `line_gap` px and padded by `pad` px
+- rows that differ from the previous frame by more than `diff_threshold`
+  gray levels are dirty; a band with no dirty rows that existed at the
+  same place in the previous frame keeps its text without any work
+- a dirty band whose pixels match a line of the previous frame (BLAKE2
+  digest; the text scrolled) reuses that line's text; everything else is
+  OCR'd with the caller's `recognise(band) -> str`
+- text is the model's lines joined with newlines; get_stats() reports
+  lines OCR'd vs reused and the share of rows that needed OCR
+"""
+
+import hashlib
+from typing import Callable, Dict, Any, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+DEFAULT_INK_THRESHOLD = 40
+DEFAULT_DIFF_THRESHOLD = 32
+DEFAULT_LINE_GAP = 3
+DEFAULT_PAD = 3
+
+
+def to_gray(frame) -> np.ndarray:
+    array = np.asarray(frame)
+    if array.ndim == 3:
+        array = cv2.cvtColor(array, cv2.COLOR_RGBA2GRAY if array.shape[2] == 4 else cv2.COLOR_RGB2GRAY)
+    return array
+
+
+def line_bands(gray: np.ndarray, ink_threshold: int = DEFAULT_INK_THRESHOLD,
+               line_gap: int = DEFAULT_LINE_GAP, pad: int = DEFAULT_PAD) -> List[Tuple[int, int]]:
+    """(top, bottom) row spans of the text lines in a grayscale frame"""
+    ink = (gray.max(axis=1).astype(np.int16) - gray.min(axis=1)) >= ink_threshold
+    rows = np.flatnonzero(ink)
+    if rows.size == 0:
+        return []
+    breaks = np.flatnonzero(np.diff(rows) > line_gap + 1)
+    starts = np.concatenate(([rows[0]], rows[breaks + 1]))
+    ends = np.concatenate((rows[breaks], [rows[-1]])) + 1
+    height = gray.shape[0]
+    bands = []
+    for top, bottom in zip(starts, ends):
+        top, bottom = max(0, int(top) - pad), min(height, int(bottom) + pad)
+        if bands and top <= bands[-1][1]:
+            bands[-1] = (bands[-1][0], bottom)
+        else:
+            bands.append((top, bottom))
+    return bands
+
+
+def band_digest(band: np.ndarray) -> str:
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(f"{band.shape}".encode())
+    digest.update(np.ascontiguousarray(band).tobytes())
+    return digest.hexdigest()
+
+
+class IncrementalOCR:
+    def __init__(self, recognise: Callable[[np.ndarray], str],
+                 ink_threshold: int = DEFAULT_INK_THRESHOLD,
+                 diff_threshold: int = DEFAULT_DIFF_THRESHOLD,
+                 line_gap: int = DEFAULT_LINE_GAP, pad: int = DEFAULT_PAD):
+        self.recognise = recognise
+        self.ink_threshold = ink_threshold
+        self.diff_threshold = diff_threshold
+        self.line_gap = line_gap
+        self.pad = pad
+        self.reset()
+        self.stats = {
+            'frames': 0,
+            'lines': 0,
+            'lines_ocr': 0,
+            'lines_unchanged': 0,
+            'lines_moved': 0,
+            'rows': 0,
+            'rows_ocr': 0
+        }
+
+    def reset(self):
+        """Forget the text model; the next frame is OCR'd line by line from scratch"""
+        self._frame: Optional[np.ndarray] = None
+        self.lines: List[Dict[str, Any]] = []  # {'top', 'bottom', 'digest', 'text'}
+        self.text = ""
+
+    def _dirty_rows(self, gray: np.ndarray) -> Optional[np.ndarray]:
+        if self._frame is None or self._frame.shape != gray.shape:
+            return None
+        return np.any(cv2.absdiff(gray, self._frame) > self.diff_threshold, axis=1)
+
+    def update(self, frame) -> str:
+        """Feed the next capture; returns the region's full text"""
+        gray = to_gray(frame)
+        dirty = self._dirty_rows(gray)
+        previous = {(line['top'], line['bottom']): line for line in self.lines} if dirty is not None else {}
+        by_digest = {line['digest']: line['text'] for line in self.lines}
+
+        lines = []
+        for top, bottom in line_bands(gray, self.ink_threshold, self.line_gap, self.pad):
+            old = previous.get((top, bottom))
+            if old is not None and not dirty[top:bottom].any():
+                lines.append(old)
+                self.stats['lines_unchanged'] += 1
+                continue
+            band = gray[top:bottom]
+            digest = band_digest(band)
+            if digest in by_digest:
+                text = by_digest[digest]
+                self.stats['lines_moved'] += 1
+            else:
+                text = self.recognise(band).strip()
+                self.stats['lines_ocr'] += 1
+                self.stats['rows_ocr'] += bottom - top
+            lines.append({'top': top, 'bottom': bottom, 'digest': digest, 'text': text})
+
+        self.stats['frames'] += 1
+        self.stats['lines'] += len(lines)
+        self.stats['rows'] += gray.shape[0]
+        self._frame = gray
+        self.lines = lines
+        self.text = "\n".join(line['text'] for line in lines if line['text'])
+        return self.text
+
+    def get_stats(self) -> Dict[str, Any]:
+        lines, rows = self.stats['lines'], self.stats['rows']
+        return {
+            **self.stats,
+            'lines_reused': f"{((lines - self.stats['lines_ocr']) / lines * 100) if lines else 0:.1f}%",
+            'rows_ocr_share': f"{(self.stats['rows_ocr'] / rows * 100) if rows else 0:.1f}%"
+        }
@@ -0,0 +1,112 @@
+"""
+latency_histogram.py
+
+Compact latency histograms for strategy attempts. Buckets grow
+geometrically (20% per bucket from 1 ms), so a histogram is a sparse
+{bucket: count} dict of a few dozen entries at most, merges by adding
+counts, and any percentile is within ~10% of the true value.
+
+A strategy's histogram holds one such dict per phase:
+- query: finding candidates (selector query, in-page resolve, OCR pass)
+- visibility: visibility checks on what the query returned
+- click: scrolling into view and clicking
+- wait: post-click readiness wait
+- total: the whole attempt
+
+StrategyTimer measures those phases with the monotonic clock.
+"""
+
+import json
+import math
+import time
+from typing import Dict, Any, Optional
+
+MIN_LATENCY = 0.001
+GROWTH = 1.2
+PHASES = ('query', 'visibility', 'click', 'wait')
+PERCENTILES = (50, 95, 99)
+
+
+def bucket_of(seconds: float) -> int:
+    if seconds <= MIN_LATENCY:
+        return 0
+    return math.ceil(math.log(seconds / MIN_LATENCY) / math.log(GROWTH))
+
+
+def bucket_value(bucket: int) -> float:
+    """Representative latency of a bucket (geometric middle)"""
+    return MIN_LATENCY * GROWTH ** max(0.0, bucket - 0.5)
+
+
+def encode(seconds: Optional[float], phases: Optional[Dict[str, float]] = None) -> Optional[str]:
+    """Histogram JSON for a single attempt"""
+    if seconds is None:
+        return None
+    histogram = {'total': {str(bucket_of(seconds)): 1}}
+    for phase, value in (phases or {}).items():
+        histogram[phase] = {str(bucket_of(value)): 1}
+    return json.dumps(histogram, separators=(',', ':'))
+
+
+def merge(left: Optional[str], right: Optional[str]) -> Optional[str]:
+    """Add two histogram JSON strings (registered as an SQLite function for the upsert)"""
+    if not left:
+        return right
+    if not right:
+        return left
+    merged = json.loads(left)
+    for phase, buckets in json.loads(right).items():
+        target = merged.setdefault(phase, {})
+        for bucket, count in buckets.items():
+            target[bucket] = target.get(bucket, 0) + count
+    return json.dumps(merged, separators=(',', ':'))
+
+
+def percentile(buckets: Dict[str, int], q: float) -> Optional[float]:
+    total = sum(buckets.values())
+    if not total:
+        return None
+    rank = q / 100 * total
+    seen = 0
+    for bucket in sorted(buckets, key=int):
+        seen += buckets[bucket]
+        if seen >= rank:
+            return bucket_value(int(bucket))
+    return bucket_value(max(map(int, buckets)))
+
+
+def summarize(histogram: Optional[str]) -> Dict[str, Dict[str, Any]]:
+    """{phase: {'count', 'p50', 'p95', 'p99'}} in seconds"""
+    if not histogram:
+        return {}
+    summary = {}
+    for phase, buckets in json.loads(histogram).items():
+        summary[phase] = {'count': sum(buckets.values())}
+        for q in PERCENTILES:
+            value = percentile(buckets, q)
+            summary[phase][f'p{q}'] = round(value, 3) if value is not None else None
+    return summary
+
+
+class StrategyTimer:
+    """Per-attempt phase timer; lap(phase) charges the time since the previous lap to that phase"""
+
+    def __init__(self):
+        self.started = self._last = time.monotonic()
+        self.phases: Dict[str, float] = {}
+
+    def lap(self, phase: str) -> float:
+        now = time.monotonic()
+        elapsed = now - self._last
+        self.phases[phase] = self.phases.get(phase, 0.0) + elapsed
+        self._last = now
+        return elapsed
+
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started
+
+    def as_dict(self) -> Dict[str, float]:
+        """Phase timings plus total, in milliseconds (for logs)"""
+        timings = {phase: round(value * 1000, 1) for phase, value in self.phases.items()}
+        timings['total'] = round(self.elapsed() * 1000, 1)
+        return timings
@@ -0,0 +1,140 @@
+"""
+link_scanner.py
+
+Single round-trip scan of clickable candidates on a page.
+Instead of query_selector_all + inner_text() + is_visible() per element (thousands
+of IPC round trips on an 800-anchor homepage), one page.evaluate returns a compact
+table for the whole page:
+
+    index, group, text, href, box (x, y, w, h), visible, role, selector path
+
+Matching and ranking happen in Python over that table, and the chosen element is
+re-resolved in the page by its index (falling back to its selector path).
+"""
+
+import time
+from typing import Dict, Any, List, Sequence
+
+from playwright.async_api import Page
+
+from core.kai_agent_base import logger
+
+CANDIDATE_FIELDS = ('index', 'group', 'text', 'href', 'box', 'visible', 'role', 'path')
+
+DEFAULT_CLICKABLE_SELECTORS = [
+    'a[href]',
+    'button',
+    '[role="button"]',
+    '[onclick]',
+    '.btn',
+    '.button',
+    '.link'
+]
+
+SCAN_JS = """
+({selectors, maxText}) => {
+    const pathOf = (el) => {
+        const parts = [];
+        while (el && el.nodeType === 1 && parts.length < 6) {
+            if (el.id) { parts.unshift('#' + CSS.escape(el.id)); break; }
+            let part = el.tagName.toLowerCase();
+            const parent = el.parentElement;
+            if (parent) {
+                const same = Array.from(parent.children).filter(c => c.tagName === el.tagName);
+                if (same.length > 1) part += ':nth-of-type(' + (same.indexOf(el) + 1) + ')';
+            }
+            parts.unshift(part);
+            el = parent;
+        }
+        return parts.join(' > ');
+    };
+    const seen = new Set();
+    const rows = [];
+    const elements = [];
+    selectors.forEach((selector, group) => {
+        let nodes;
+        try { nodes = document.querySelectorAll(selector); } catch (e) { return; }
+        for (const el of nodes) {
+            if (seen.has(el)) continue;
+            seen.add(el);
+            const r = el.getBoundingClientRect();
+            const style = getComputedStyle(el);
+            const visible = r.width > 0 && r.height > 0 && style.visibility !== 'hidden';
+            const text = (el.innerText || el.getAttribute('aria-label') || el.getAttribute('title') || '')
+                .replace(/\\s+/g, ' ').trim().slice(0, maxText);
+            rows.push([elements.length, group, text, el.getAttribute('href') || '',
+                       [Math.round(r.x), Math.round(r.y), Math.round(r.width), Math.round(r.height)],
+                       visible, el.getAttribute('role') || el.tagName.toLowerCase(), pathOf(el)]);
+            elements.push(el);
+        }
+    });
+    window.__kaiCandidates = elements;
+    return rows;
+}
+"""
+
+
+async def scan_candidates(page: Page, selectors: Sequence[str] = None, max_text: int = 200) -> List[Dict[str, Any]]:
+    """Collect every clickable candidate on the page in one page.evaluate"""
+    start = time.monotonic()
+    rows = await page.evaluate(SCAN_JS, {
+        'selectors': list(selectors or DEFAULT_CLICKABLE_SELECTORS),
+        'maxText': max_text
+    })
+    candidates = [dict(zip(CANDIDATE_FIELDS, row)) for row in rows]
+    logger.debug(f"[LinkScanner] {len(candidates)} candidates in {(time.monotonic() - start) * 1000:.0f} ms")
+    return candidates
+
+
+def score_candidate(text: str, target: str, text_hints: Sequence[str] = ()) -> float:
+    """Relevance of a candidate's text to the target description (0 = no match)"""
+    text_lower = text.lower().strip()
+    target_lower = target.lower().strip()
+    if not text_lower:
+        return 0.0
+
+    score = 0.0
+    if target_lower and target_lower in text_lower:
+        # Whole phrase match, preferring tighter texts
+        score += 3.0 + len(target_lower) / len(text_lower)
+    if any(hint.lower() in text_lower for hint in text_hints):
+        score += 2.0
+    words = target_lower.split()
+    if words:
+        score += sum(1 for word in words if word in text_lower) / len(words)
+    return score
+
+
+def rank_candidates(candidates: List[Dict[str, Any]], target: str, text_hints: Sequence[str] = (),
+                    visible_only: bool = True) -> List[Dict[str, Any]]:
+    """Matching candidates, best first (ties keep selector-group then DOM order)"""
+    ranked = []
+    for candidate in candidates:
+        if visible_only and not candidate['visible']:
+            continue
+        score = score_candidate(candidate['text'], target, text_hints)
+        if score > 0:
+            ranked.append({**candidate, 'score': score})
+    ranked.sort(key=lambda c: (-c['score'], c['group'], c['index']))
+    return ranked
+
+
+async def resolve_candidate(page: Page, candidate: Dict[str, Any]):
+    """Re-resolve a scanned candidate to an ElementHandle by index, else by selector path"""
+    handle = await page.evaluate_handle(
+        '(i) => (window.__kaiCandidates || [])[i] || null', candidate['index']
+    )
+    element = handle.as_element()
+    if element is None and candidate.get('path'):
+        element = await page.query_selector(candidate['path'])
+    return element
+
+
+async def click_candidate(page: Page, candidate: Dict[str, Any]) -> bool:
+    """Click a scanned candidate"""
+    element = await resolve_candidate(page, candidate)
+    if element is None:
+        return False
+    await element.scroll_into_view_if_needed()
+    await element.click()
+    return True
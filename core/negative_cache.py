@@ -0,0 +1,153 @@
+"""
+negative_cache.py
+
+Negative cache of dead selectors per domain. Strategies that keep failing
+on a domain (theguardian.com had selectors with dozens of failures and no
+success in memory.json) still cost a query - and in the agent's strategy
+loop a timeout - every cycle. After `threshold` consecutive failures a
+strategy is skipped; it is re-probed once a backoff has passed since its
+last attempt, and every failed re-probe doubles the backoff. The
+navigators record a strategy the resolver finds no match for as a failure,
+so misses both reach the threshold and move a re-probe's backoff forward.
+
+- consecutive failures come from the strategy store (a success resets them)
+- check_structure() fingerprints the page's layout (tag.class signatures of
+  landmarks and headline containers); when it no longer resembles the stored
+  fingerprint the domain's failures are cleared, since a redesign can bring
+  dead selectors back to life. It only runs while the domain has strategies
+  past the threshold, and only writes the fingerprint when it changed
+- filter() never skips every candidate: if all are dead, all are tried
+- time saved is estimated from each skipped strategy's mean attempt latency
+"""
+
+import time
+from typing import Dict, Any, List, Optional, Callable
+
+from playwright.async_api import Page
+
+from core.kai_agent_base import logger
+from core.strategy_store import StrategyStore
+
+STRUCTURE_JS = """
+() => {
+    const signatures = new Set();
+    const landmarks = 'header, nav, main, article, section, aside, footer, h1, h2, h3, [role="main"]';
+    for (const el of document.querySelectorAll(landmarks)) {
+        const cls = (typeof el.className === 'string' ? el.className : '').trim().split(/\\s+/)[0] || '';
+        signatures.add(el.tagName.toLowerCase() + (cls ? '.' + cls : ''));
+        const parent = el.parentElement;
+        if (parent && /^H[1-3]$/.test(el.tagName)) {
+            const parentCls = (typeof parent.className === 'string' ? parent.className : '').trim().split(/\\s+/)[0] || '';
+            signatures.add(parent.tagName.toLowerCase() + (parentCls ? '.' + parentCls : '') + '>' + el.tagName.toLowerCase());
+        }
+        if (signatures.size >= 400) break;
+    }
+    return Array.from(signatures).sort();
+}
+"""
+
+
+class NegativeCache:
+    def __init__(self, store: StrategyStore, threshold: int = 3, base_backoff: float = 3600.0,
+                 max_backoff: float = 7 * 24 * 3600.0, similarity: float = 0.5, default_cost: float = 1.0):
+        self.store = store
+        self.threshold = threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.similarity = similarity  # Jaccard similarity below which the structure counts as changed
+        self.default_cost = default_cost
+        self._structures: Dict[str, List[str]] = {}  # domain -> last fingerprint read or written
+        self.stats = {
+            'checked': 0,
+            'skipped': 0,
+            'reprobes': 0,
+            'structure_checks': 0,
+            'structure_writes': 0,
+            'structure_changes': 0,
+            'time_saved': 0.0
+        }
+
+    def backoff(self, consecutive_failures: int) -> float:
+        """Seconds to wait before re-probing a strategy with this many failures in a row"""
+        doublings = max(0, consecutive_failures - self.threshold)
+        return min(self.max_backoff, self.base_backoff * 2 ** min(doublings, 32))
+
+    def is_dead(self, row: Optional[Dict[str, Any]], now: Optional[float] = None) -> bool:
+        """Past the failure threshold and still inside its backoff window"""
+        if not row or row.get('consecutive_failures', 0) < self.threshold:
+            return False
+        elapsed = (now or time.time()) - (row.get('last_attempt') or 0)
+        return elapsed < self.backoff(row['consecutive_failures'])
+
+    def filter(self, domain: str, intent: str, strategies: List[Any],
+               key: Optional[Callable[[Any], str]] = None, now: Optional[float] = None) -> List[Any]:
+        """Strategies worth trying now, in the given order (key maps an entry to its strategy name)"""
+        key = key or (lambda strategy: strategy)
+        rows = {row['strategy']: row for row in self.store.get_intent_strategies(domain, intent)}
+        now = now or time.time()
+
+        kept, skipped = [], []
+        for strategy in strategies:
+            row = rows.get(key(strategy))
+            if self.is_dead(row, now):
+                skipped.append(row)
+            else:
+                if row and row.get('consecutive_failures', 0) >= self.threshold:
+                    self.stats['reprobes'] += 1
+                kept.append(strategy)
+
+        self.stats['checked'] += len(strategies)
+        if not kept:
+            return list(strategies)
+        if skipped:
+            saved = sum(row['mean_latency'] or self.default_cost for row in skipped)
+            self.stats['skipped'] += len(skipped)
+            self.stats['time_saved'] += saved
+            logger.info(f"[NegativeCache] Skipping {len(skipped)} dead strategies on {domain}/{intent} "
+                        f"(~{saved:.1f}s saved): {[row['strategy'] for row in skipped]}")
+        return kept
+
+    async def check_structure(self, page: Page, domain: str) -> bool:
+        """Compare the page layout with the stored fingerprint; clears the domain's failures on change"""
+        # Nothing to revive: skip the fingerprint (and its store traffic) on the click path
+        if not self.store.count_failing(domain, self.threshold):
+            return False
+        try:
+            signature = await page.evaluate(STRUCTURE_JS)
+        except Exception as e:
+            logger.debug(f"[NegativeCache] Could not fingerprint {domain}: {e}")
+            return False
+        if not signature:
+            return False
+        self.stats['structure_checks'] += 1
+
+        if domain not in self._structures:
+            self._structures[domain] = self.store.get_page_structure(domain)
+        previous = self._structures[domain]
+        if previous == signature:
+            return False
+        self.store.set_page_structure(domain, signature)
+        self._structures[domain] = signature
+        self.stats['structure_writes'] += 1
+        if previous is None:
+            return False
+
+        before, after = set(previous), set(signature)
+        overlap = len(before & after) / len(before | after)
+        if overlap >= self.similarity:
+            return False
+
+        cleared = self.store.reset_failures(domain)
+        self.stats['structure_changes'] += 1
+        logger.info(f"[NegativeCache] Page structure of {domain} changed ({overlap:.0%} similar), "
+                    f"cleared {cleared} dead strategies")
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Skipped attempts and the estimated time they would have cost"""
+        checked = self.stats['checked']
+        return {
+            **self.stats,
+            'time_saved': round(self.stats['time_saved'], 2),
+            'skip_rate': f"{(self.stats['skipped'] / checked * 100) if checked else 0:.1f}%"
+        }
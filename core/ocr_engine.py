@@ -0,0 +1,297 @@
+"""
+ocr_engine.py
+
+One OCR entry point with a persistent backend. pytesseract forks a new
+tesseract process and reloads the language model on every call; with
+tesserocr the model stays loaded in-process and a call is just recognition.
+
+- backends: "tesserocr" (persistent TessBaseAPI per thread and config) and
+  "pytesseract" (subprocess per call, the fallback when tesserocr is not
+  installed or its API cannot load a model); KAI_OCR_BACKEND forces one
+- image_to_string(image, config) and image_to_data(image, config) return
+  what pytesseract returns (text; dict of TSV columns with word boxes), so
+  callers swap `pytesseract.` for `get_ocr_engine().` and keep their code
+- config strings use tesseract CLI syntax (--psm, --oem, -l, -c var=value)
+- images may be PIL images or numpy arrays (as returned by cv2)
+- per-backend call counts and latency are reported by get_stats()
+- results are cached in a content-addressed LRU (OCRCache): key = BLAKE2
+  hash of the pixels + call + config + preprocessing profile, bounded by
+  an estimate of the results' memory; the same screenshot OCR'd by the
+  stability check, the cookie handler and the coordinate click costs one
+  tesseract pass; KAI_OCR_CACHE_MB sizes it (0 disables)
+
+tests/ocr_engine_benchmark.py compares per-call latency of the backends.
+"""
+
+import hashlib
+import os
+import shlex
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional, Tuple
+
+from PIL import Image
+
+from core.kai_agent_base import logger
+
+try:
+    import tesserocr
+except ImportError:
+    tesserocr = None
+
+try:
+    import pytesseract
+except ImportError:
+    pytesseract = None
+
+BACKENDS = ('tesserocr', 'pytesseract')
+TSV_COLUMNS = ('level', 'page_num', 'block_num', 'par_num', 'line_num', 'word_num',
+               'left', 'top', 'width', 'height', 'conf', 'text')
+
+
+def parse_config(config: str) -> Tuple[str, Optional[int], Optional[int], Tuple[Tuple[str, str], ...]]:
+    """tesseract CLI options -> (lang, oem, psm, variables)"""
+    lang, oem, psm, variables = 'eng', None, None, []
+    args = shlex.split(config or '')
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        value = args[i + 1] if i + 1 < len(args) else None
+        if arg == '--psm' and value is not None:
+            psm, i = int(value), i + 1
+        elif arg == '--oem' and value is not None:
+            oem, i = int(value), i + 1
+        elif arg == '-l' and value is not None:
+            lang, i = value, i + 1
+        elif arg == '-c' and value is not None and '=' in value:
+            name, _, setting = value.partition('=')
+            variables.append((name, setting))
+            i += 1
+        i += 1
+    return lang, oem, psm, tuple(variables)
+
+
+def tsv_to_dict(tsv: str, header: bool = False) -> Dict[str, List[Any]]:
+    """Tesseract TSV -> pytesseract's Output.DICT layout"""
+    data = {column: [] for column in TSV_COLUMNS}
+    lines = tsv.splitlines()[1 if header else 0:]
+    for line in lines:
+        fields = line.split('\t')
+        if len(fields) < len(TSV_COLUMNS) - 1:
+            continue
+        fields += [''] * (len(TSV_COLUMNS) - len(fields))
+        for column, value in zip(TSV_COLUMNS, fields):
+            if column == 'text':
+                data[column].append(value)
+            elif column == 'conf':
+                data[column].append(float(value) if value else -1.0)
+            else:
+                data[column].append(int(value) if value else 0)
+    return data
+
+
+def to_pil(image) -> Image.Image:
+    return image if isinstance(image, Image.Image) else Image.fromarray(image)
+
+
+class TesserocrBackend:
+    """Long-lived TessBaseAPI instances, one per (thread, lang, oem, psm, variables)"""
+    name = 'tesserocr'
+
+    def __init__(self):
+        if tesserocr is None:
+            raise ImportError("tesserocr is not installed")
+        self._local = threading.local()
+        self._api('')  # fails here, not per call, when tessdata or the language is missing
+
+    def _api(self, config: str):
+        apis = getattr(self._local, 'apis', None)
+        if apis is None:
+            apis = self._local.apis = {}
+        key = parse_config(config)
+        if key not in apis:
+            lang, oem, psm, variables = key
+            kwargs = {'lang': lang}
+            if oem is not None:
+                kwargs['oem'] = oem  # tesserocr.OEM/PSM are int constants, not enums
+            if psm is not None:
+                kwargs['psm'] = psm
+            api = tesserocr.PyTessBaseAPI(**kwargs)
+            for name, value in variables:
+                api.SetVariable(name, value)
+            apis[key] = api
+            logger.debug(f"[OCREngine] Loaded tesseract model for {key[:3]}")
+        return apis[key]
+
+    def image_to_string(self, image, config: str = '') -> str:
+        api = self._api(config)
+        api.SetImage(to_pil(image))
+        return api.GetUTF8Text()
+
+    def image_to_data(self, image, config: str = '') -> Dict[str, List[Any]]:
+        api = self._api(config)
+        api.SetImage(to_pil(image))
+        api.Recognize()
+        return tsv_to_dict(api.GetTSVText(0))
+
+
+class PytesseractBackend:
+    """A tesseract subprocess per call"""
+    name = 'pytesseract'
+
+    def __init__(self):
+        if pytesseract is None:
+            raise ImportError("pytesseract is not installed")
+
+    def image_to_string(self, image, config: str = '') -> str:
+        return pytesseract.image_to_string(image, config=config)
+
+    def image_to_data(self, image, config: str = '') -> Dict[str, List[Any]]:
+        return pytesseract.image_to_data(image, config=config, output_type=pytesseract.Output.DICT)
+
+
+BACKEND_CLASSES = {'tesserocr': TesserocrBackend, 'pytesseract': PytesseractBackend}
+
+DEFAULT_CACHE_BYTES = 32 * 1024 * 1024
+WORD_ENTRY_BYTES = 120  # rough per-row cost of an image_to_data result (12 columns)
+
+
+def image_digest(image) -> str:
+    """Fast content hash of a PIL image or numpy array (pixels, size and mode/dtype)"""
+    digest = hashlib.blake2b(digest_size=16)
+    if isinstance(image, Image.Image):
+        digest.update(f"{image.mode}{image.size}".encode())
+        digest.update(image.tobytes())
+    else:
+        digest.update(f"{image.dtype}{image.shape}".encode())
+        digest.update(image.tobytes())
+    return digest.hexdigest()
+
+
+def result_size(result) -> int:
+    if isinstance(result, str):
+        return len(result) + 64
+    return sum(len(text) for text in result.get('text', [])) + WORD_ENTRY_BYTES * len(result.get('text', []))
+
+
+class OCRCache:
+    """LRU of OCR results keyed by image content and OCR settings, bounded in bytes"""
+
+    def __init__(self, max_bytes: int = DEFAULT_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[Tuple, Tuple[Any, int]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.bytes = 0
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def get(self, key: Tuple):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats['hits'] += 1
+            return entry[0]
+
+    def put(self, key: Tuple, result):
+        size = result_size(result)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self.bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (result, size)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.bytes -= evicted_size
+                self.stats['evictions'] += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.stats['hits'] + self.stats['misses']
+        return {
+            **self.stats,
+            'entries': len(self._entries),
+            'bytes': self.bytes,
+            'hit_ratio': f"{(self.stats['hits'] / lookups * 100) if lookups else 0:.1f}%"
+        }
+
+
+class OCREngine:
+    def __init__(self, backend: Optional[str] = None, cache_bytes: int = DEFAULT_CACHE_BYTES):
+        self.backend = self._select(backend or os.environ.get("KAI_OCR_BACKEND"))
+        self.cache = OCRCache(cache_bytes) if cache_bytes else None
+        self.stats = {'calls': 0, 'total_ms': 0.0, 'max_ms': 0.0}
+        logger.info(f"[OCREngine] Using {self.backend.name} backend")
+
+    def _select(self, preferred: Optional[str]):
+        if preferred and preferred not in BACKENDS:
+            raise ValueError(f"Unknown OCR backend '{preferred}', expected one of {BACKENDS}")
+        for name in ([preferred] if preferred else BACKENDS):
+            try:
+                return BACKEND_CLASSES[name]()
+            except Exception as e:
+                logger.debug(f"[OCREngine] {name} backend unavailable: {e}")
+        raise RuntimeError(f"No OCR backend available (tried {preferred or ', '.join(BACKENDS)})")
+
+    def _cached(self, method: str, image, config: str, profile: str):
+        if self.cache is None:
+            return self._timed(method, image, config)
+        key = (method, image_digest(image), config, profile)
+        result = self.cache.get(key)
+        if result is None:
+            result = self._timed(method, image, config)
+            self.cache.put(key, result)
+        if isinstance(result, dict):
+            return {column: list(values) for column, values in result.items()}
+        return result
+
+    def _timed(self, method: str, image, config: str):
+        start = time.monotonic()
+        try:
+            return getattr(self.backend, method)(image, config)
+        finally:
+            elapsed_ms = (time.monotonic() - start) * 1000
+            self.stats['calls'] += 1
+            self.stats['total_ms'] += elapsed_ms
+            self.stats['max_ms'] = max(self.stats['max_ms'], elapsed_ms)
+
+    def image_to_string(self, image, config: str = '', profile: str = '') -> str:
+        """
+        Recognised text, like pytesseract.image_to_string. `profile` names the
+        preprocessing applied to the image (part of the cache key).
+        """
+        return self._cached('image_to_string', image, config, profile)
+
+    def image_to_data(self, image, config: str = '', profile: str = '') -> Dict[str, List[Any]]:
+        """Word boxes, like pytesseract.image_to_data(..., output_type=Output.DICT)"""
+        return self._cached('image_to_data', image, config, profile)
+
+    def get_stats(self) -> Dict[str, Any]:
+        calls = self.stats['calls']
+        return {
+            'backend': self.backend.name,
+            'calls': calls,
+            'avg_ms': round(self.stats['total_ms'] / calls, 1) if calls else 0,
+            'max_ms': round(self.stats['max_ms'], 1),
+            'cache': self.cache.get_stats() if self.cache else None
+        }
+
+
+_shared_engine: Optional[OCREngine] = None
+
+
+def get_ocr_engine() -> OCREngine:
+    """Process-wide engine so loaded models are reused by every caller"""
+    global _shared_engine
+    if _shared_engine is None:
+        cache_mb = float(os.environ.get("KAI_OCR_CACHE_MB", DEFAULT_CACHE_BYTES / (1024 * 1024)))
+        _shared_engine = OCREngine(cache_bytes=int(cache_mb * 1024 * 1024))
+    return _shared_engine
@@ -0,0 +1,161 @@
+"""
+prefetch.py
+
+Speculative prefetch of the most likely next links while Claude is thinking.
+After a screenshot is sent, the browser would otherwise sit idle for the whole
+of wait_for_response_completion_fast. The prefetcher scans the current page,
+opens the top-N headline links in hidden pages of one pooled context, and
+keeps them warm until the next command arrives:
+
+- bounded by max_pages and a wall-clock budget (pending loads are cancelled)
+- claim(query=..., url=...) hands over a warm page when Claude picks one of them
+- stop() on the next command cancels whatever is still loading and frees the rest
+
+Warm pages live in the headless pool, never in the user's visible window, and
+load everything by default since a claimed page goes straight into a screenshot.
+"""
+
+import asyncio
+import time
+from typing import Dict, Any, List, Optional
+
+from core.kai_agent_base import logger
+from core.browser_pool import BrowserLease, get_shared_pool
+from core.fan_out import ARTICLE_LINK_SELECTORS, pick_article_links
+from core.har_replay import get_har_session
+from core.link_scanner import scan_candidates, score_candidate
+from core.resource_blocking import get_resource_blocker
+from core.storage_state import get_storage_state_store, domain_of
+
+MIN_MATCH_SCORE = 1.0
+
+
+class Prefetcher:
+    def __init__(self, max_pages: int = 3, budget: float = 20.0, resource_profile: Optional[str] = None):
+        self.max_pages = max_pages
+        self.budget = budget
+        self.resource_profile = resource_profile
+        self.lease: Optional[BrowserLease] = None
+        self.task: Optional[asyncio.Task] = None
+        self.warm: List[Dict[str, Any]] = []  # {'url', 'title', 'page', 'load_time'}
+        self.claimed: Optional[Dict[str, Any]] = None
+        self.stats = {
+            'rounds': 0,
+            'prefetched': 0,
+            'hits': 0,
+            'misses': 0,
+            'wasted': 0,
+            'budget_exhausted': 0,
+            'time_saved': 0.0
+        }
+
+    async def start(self, url: str):
+        """Begin prefetching the likely next links from `url` in the background"""
+        await self.stop()
+        await self.discard()
+        self.stats['rounds'] += 1
+        self.task = asyncio.create_task(self._run(url))
+
+    async def _run(self, url: str):
+        try:
+            await asyncio.wait_for(self._prefetch(url), timeout=self.budget)
+        except asyncio.TimeoutError:
+            self.stats['budget_exhausted'] += 1
+            logger.info(f"[Prefetch] Budget of {self.budget:.0f}s used, {len(self.warm)} pages warm")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.warning(f"[Prefetch] Failed for {url}: {e}")
+
+    async def _prefetch(self, url: str):
+        pool = await get_shared_pool(headless=True)
+        state = get_storage_state_store().load(domain_of(url))
+        self.lease = await pool.acquire(**({'storage_state': state} if state else {}))
+        await get_har_session().attach(self.lease.context)
+        blocker = get_resource_blocker()
+        if self.resource_profile:
+            await blocker.apply(self.lease.page, self.resource_profile)
+
+        await self.lease.page.goto(url, wait_until='domcontentloaded', timeout=30000)
+        candidates = await scan_candidates(self.lease.page, ARTICLE_LINK_SELECTORS)
+        links = pick_article_links(candidates, self.lease.page.url, self.max_pages)
+        logger.info(f"[Prefetch] Warming {len(links)} links from {url}")
+
+        async def warm(link: Dict[str, Any]):
+            page = await self.lease.context.new_page()
+            if self.resource_profile:
+                await blocker.apply(page, self.resource_profile)
+            start = time.monotonic()
+            try:
+                await page.goto(link['url'], wait_until='domcontentloaded', timeout=30000)
+            except Exception as e:
+                logger.debug(f"[Prefetch] {link['url']} failed: {e}")
+                await page.close()
+                return
+            self.warm.append({**link, 'page': page, 'load_time': time.monotonic() - start})
+            self.stats['prefetched'] += 1
+
+        await asyncio.gather(*(warm(link) for link in links))
+
+    def claim(self, query: Optional[str] = None, url: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Warm page matching the chosen URL or article query, if one finished loading"""
+        match = None
+        if url:
+            target = url.rstrip('/')
+            match = next((w for w in self.warm if w['url'].rstrip('/') == target), None)
+        elif query:
+            scored = [(score_candidate(w['title'], query), w) for w in self.warm]
+            scored = [(score, w) for score, w in scored if score >= MIN_MATCH_SCORE]
+            if scored:
+                match = max(scored, key=lambda item: item[0])[1]
+
+        if match:
+            self.claimed = match
+            self.stats['hits'] += 1
+            self.stats['time_saved'] += match['load_time']
+            logger.info(f"[Prefetch] Hit: {match['url']} (saved {match['load_time']:.1f}s)")
+        elif self.warm or (self.task and not self.task.done()):
+            self.stats['misses'] += 1
+        return match
+
+    async def stop(self):
+        """Cancel pending loads and drop every warm page except a claimed one"""
+        if self.task and not self.task.done():
+            self.task.cancel()
+            try:
+                await self.task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self.task = None
+
+        for entry in self.warm:
+            if entry is not self.claimed:
+                self.stats['wasted'] += 1
+                try:
+                    await entry['page'].close()
+                except Exception:
+                    pass
+        self.warm = [self.claimed] if self.claimed else []
+        if not self.claimed:
+            await self._release()
+
+    async def discard(self):
+        """Free the claimed page and the context once the operator is done with it"""
+        self.claimed = None
+        self.warm = []
+        await self._release()
+
+    async def _release(self):
+        if self.lease:
+            pool = await get_shared_pool(headless=True)
+            await pool.release(self.lease)
+            self.lease = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Hit rate, wasted prefetches and load time saved"""
+        decided = self.stats['hits'] + self.stats['misses']
+        return {
+            **self.stats,
+            'hit_rate': f"{(self.stats['hits'] / decided * 100) if decided else 0:.1f}%",
+            'time_saved': round(self.stats['time_saved'], 2)
+        }
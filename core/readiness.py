@@ -0,0 +1,145 @@
+"""
+readiness.py
+
+Intent-aware readiness predicates that replace wait_for_load_state('networkidle').
+On ad-heavy sites networkidle arrives seconds late (or never); instead each intent
+declares what "ready" means and we return as soon as that holds.
+
+Intents declare predicates per phase under "readiness":
+    "readiness": {
+        "page":   {"type": "selector_visible", "selector": "article h2 a", "timeout": 5000},
+        "action": {"type": "url_changed", "timeout": 5000}
+    }
+- page:   the freshly loaded page is usable (before we look for/click a target)
+- action: our click or navigation has taken effect
+
+Predicate types:
+- selector_visible: a selector is visible
+- dom_stable:       DOMContentLoaded, then the DOM node count is unchanged for N animation frames
+- url_changed:      page URL differs from the URL before the action
+- load_state:       plain Playwright load state (domcontentloaded / load / networkidle)
+
+A predicate timing out is not an error: we log it and carry on, as the old
+networkidle timeouts usually hid a perfectly usable page. Every wait is timed
+per predicate so the specs can be tuned.
+"""
+
+import time
+from typing import Dict, Any, Optional
+
+from playwright.async_api import Page
+
+from core.kai_agent_base import logger
+
+DEFAULT_READINESS = {
+    "page": {"type": "dom_stable", "stable_frames": 3, "timeout": 5000},
+    "action": {"type": "dom_stable", "stable_frames": 3, "timeout": 5000}
+}
+
+DOM_STABLE_JS = """
+({frames, timeout}) => new Promise(resolve => {
+    let last = -1, stable = 0;
+    const start = performance.now();
+    const tick = () => {
+        const size = document.getElementsByTagName('*').length;
+        stable = size === last ? stable + 1 : 0;
+        last = size;
+        if (stable >= frames) return resolve(true);
+        if (performance.now() - start > timeout) return resolve(false);
+        requestAnimationFrame(tick);
+    };
+    requestAnimationFrame(tick);
+})
+"""
+
+
+class ReadinessWaiter:
+    def __init__(self):
+        self.stats = {}
+
+    def spec_for(self, intent_config: Optional[Dict[str, Any]], phase: str,
+                 default: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """Predicate spec an intent declares for a phase ('page' or 'action')"""
+        readiness = (intent_config or {}).get('readiness', {})
+        return readiness.get(phase) or default or DEFAULT_READINESS[phase]
+
+    async def wait(self, page: Page, spec: Dict[str, Any], previous_url: Optional[str] = None,
+                   label: str = "") -> Dict[str, Any]:
+        """Block until the predicate holds or its timeout expires. Never raises on timeout."""
+        predicate = spec.get('type', 'dom_stable')
+        timeout = spec.get('timeout', 5000)
+        start = time.monotonic()
+        ready = False
+        error = None
+
+        try:
+            if predicate == 'selector_visible':
+                await page.wait_for_selector(spec['selector'], state='visible', timeout=timeout)
+                ready = True
+            elif predicate == 'dom_stable':
+                await page.wait_for_load_state('domcontentloaded', timeout=timeout)
+                remaining = max(0, timeout - (time.monotonic() - start) * 1000)
+                ready = await page.evaluate(DOM_STABLE_JS, {
+                    'frames': spec.get('stable_frames', 3),
+                    'timeout': remaining
+                })
+            elif predicate == 'url_changed':
+                before = previous_url if previous_url is not None else page.url
+                await page.wait_for_url(lambda url: url != before, wait_until='commit', timeout=timeout)
+                await page.wait_for_load_state('domcontentloaded', timeout=timeout)
+                ready = True
+            elif predicate == 'load_state':
+                await page.wait_for_load_state(spec.get('state', 'domcontentloaded'), timeout=timeout)
+                ready = True
+            else:
+                error = f"Unknown readiness predicate: {predicate}"
+        except Exception as e:
+            error = str(e).splitlines()[0]
+
+        elapsed = time.monotonic() - start
+        self._record(predicate, label, elapsed, ready)
+
+        status = "ready" if ready else f"not ready ({error or 'timeout'})"
+        logger.info(f"[Readiness] {label or predicate}: {predicate} {status} after {elapsed * 1000:.0f} ms")
+        return {'ready': ready, 'predicate': predicate, 'elapsed': elapsed, 'error': error}
+
+    async def wait_for_intent(self, page: Page, intent_config: Optional[Dict[str, Any]], phase: str,
+                              previous_url: Optional[str] = None, label: str = "",
+                              default: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        spec = self.spec_for(intent_config, phase, default)
+        return await self.wait(page, spec, previous_url=previous_url, label=label or phase)
+
+    def _record(self, predicate: str, label: str, elapsed: float, ready: bool):
+        key = f"{label}:{predicate}" if label else predicate
+        if key not in self.stats:
+            self.stats[key] = {'waits': 0, 'ready': 0, 'total_time': 0.0, 'max_time': 0.0}
+        data = self.stats[key]
+        data['waits'] += 1
+        data['ready'] += 1 if ready else 0
+        data['total_time'] += elapsed
+        data['max_time'] = max(data['max_time'], elapsed)
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Wait counts, hit rate and timings per (label, predicate)"""
+        stats = {}
+        for key, data in self.stats.items():
+            waits = data['waits']
+            stats[key] = {
+                'waits': waits,
+                'ready': data['ready'],
+                'timeouts': waits - data['ready'],
+                'avg_ms': round(data['total_time'] / waits * 1000, 1) if waits else 0,
+                'max_ms': round(data['max_time'] * 1000, 1)
+            }
+        return stats
+
+
+_shared_waiter: Optional[ReadinessWaiter] = None
+
+
+def get_readiness_waiter() -> ReadinessWaiter:
+    """Process-wide waiter so timings aggregate across navigators"""
+    global _shared_waiter
+    if _shared_waiter is None:
+        _shared_waiter = ReadinessWaiter()
+    return _shared_waiter
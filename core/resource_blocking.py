@@ -0,0 +1,157 @@
+"""
+resource_blocking.py
+
+Per-intent resource blocking for headless scans. Each intent in the intents
+config can name a profile via "resource_profile"; the profile is enforced with
+page.route so images, fonts, media and trackers never hit the network when all
+we need is the DOM.
+
+Built-in profiles (override or extend in config/resource_profiles.json):
+- full:      load everything (default, and always used for the visible CDP tab)
+- text_only: block images, media, fonts and trackers
+- dom_only:  text_only + stylesheets
+
+Bytes saved are estimated per blocked resource type, since aborted requests
+never report a size.
+"""
+
+import json
+import weakref
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from playwright.async_api import Page, Route, Request
+
+from core.kai_agent_base import logger
+
+TRACKER_PATTERNS = [
+    'doubleclick.net', 'googletagmanager.com', 'google-analytics.com', 'googlesyndication.com',
+    'adservice.google', 'scorecardresearch.com', 'facebook.net', 'chartbeat', 'hotjar.com',
+    'taboola.com', 'outbrain.com', 'amazon-adsystem.com', 'criteo', 'optimizely.com'
+]
+
+DEFAULT_PROFILES = {
+    "full": {
+        "block_types": [],
+        "block_patterns": []
+    },
+    "text_only": {
+        "block_types": ["image", "media", "font"],
+        "block_patterns": TRACKER_PATTERNS
+    },
+    "dom_only": {
+        "block_types": ["image", "media", "font", "stylesheet"],
+        "block_patterns": TRACKER_PATTERNS
+    }
+}
+
+# Rough average transfer sizes used to estimate bytes saved
+ESTIMATED_BYTES = {
+    "image": 60_000,
+    "media": 500_000,
+    "font": 40_000,
+    "stylesheet": 30_000,
+    "script": 25_000,
+    "other": 5_000
+}
+
+
+def load_profiles(config_file: str = "config/resource_profiles.json") -> Dict[str, Dict[str, Any]]:
+    """Built-in profiles merged with any overrides from the config file"""
+    profiles = {name: dict(profile) for name, profile in DEFAULT_PROFILES.items()}
+    path = Path(config_file)
+    if path.exists():
+        try:
+            with open(path, 'r') as f:
+                profiles.update(json.load(f))
+        except Exception as e:
+            logger.warning(f"[ResourceBlocker] Could not load {config_file}: {e}")
+    return profiles
+
+
+class ResourceBlocker:
+    def __init__(self, profiles: Dict[str, Dict[str, Any]] = None):
+        self.profiles = profiles or load_profiles()
+        self._handlers = weakref.WeakKeyDictionary()  # page -> installed route handler
+        self.stats = {}
+
+    def profile_for_intent(self, intent_config: Optional[Dict[str, Any]]) -> str:
+        """Profile name declared by an intent, falling back to 'full'"""
+        name = (intent_config or {}).get('resource_profile', 'full')
+        if name not in self.profiles:
+            logger.warning(f"[ResourceBlocker] Unknown profile '{name}', using 'full'")
+            return 'full'
+        return name
+
+    def _profile_stats(self, profile_name: str) -> Dict[str, Any]:
+        if profile_name not in self.stats:
+            self.stats[profile_name] = {
+                'allowed': 0,
+                'blocked': 0,
+                'blocked_by_type': {},
+                'est_bytes_saved': 0
+            }
+        return self.stats[profile_name]
+
+    def should_block(self, profile_name: str, resource_type: str, url: str) -> bool:
+        profile = self.profiles[profile_name]
+        if resource_type in profile.get('block_types', []):
+            return True
+        return any(pattern in url for pattern in profile.get('block_patterns', []))
+
+    async def apply(self, page: Page, profile_name: str):
+        """Install (or swap) the route handler enforcing a profile on a page"""
+        previous = self._handlers.pop(page, None)
+        if previous is not None:
+            await page.unroute("**/*", previous)
+
+        if profile_name == 'full' or profile_name not in self.profiles:
+            return
+
+        stats = self._profile_stats(profile_name)
+
+        async def handler(route: Route, request: Request):
+            resource_type = request.resource_type
+            if self.should_block(profile_name, resource_type, request.url):
+                stats['blocked'] += 1
+                stats['blocked_by_type'][resource_type] = stats['blocked_by_type'].get(resource_type, 0) + 1
+                stats['est_bytes_saved'] += ESTIMATED_BYTES.get(resource_type, ESTIMATED_BYTES['other'])
+                await route.abort()
+            else:
+                stats['allowed'] += 1
+                # fallback (not continue_) so a HAR replay route can still serve it
+                await route.fallback()
+
+        await page.route("**/*", handler)
+        self._handlers[page] = handler
+        logger.debug(f"[ResourceBlocker] Applied profile '{profile_name}'")
+
+    async def apply_for_intent(self, page: Page, intent_config: Optional[Dict[str, Any]]) -> str:
+        profile_name = self.profile_for_intent(intent_config)
+        await self.apply(page, profile_name)
+        return profile_name
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Blocked/allowed counters and estimated bytes saved per profile"""
+        stats = {}
+        for profile_name, data in self.stats.items():
+            total = data['allowed'] + data['blocked']
+            stats[profile_name] = {
+                'allowed': data['allowed'],
+                'blocked': data['blocked'],
+                'blocked_rate': f"{(data['blocked'] / total * 100) if total else 0:.1f}%",
+                'blocked_by_type': dict(data['blocked_by_type']),
+                'est_kb_saved': round(data['est_bytes_saved'] / 1024, 1)
+            }
+        return stats
+
+
+_shared_blocker: Optional[ResourceBlocker] = None
+
+
+def get_resource_blocker() -> ResourceBlocker:
+    """Process-wide blocker so stats aggregate across navigators"""
+    global _shared_blocker
+    if _shared_blocker is None:
+        _shared_blocker = ResourceBlocker()
+    return _shared_blocker
@@ -0,0 +1,165 @@
+"""
+storage_state.py
+
+Per-domain persisted Playwright storage state (cookies + localStorage).
+Every pooled context starts from an empty profile, so consent banners and
+logins had to be dealt with again on every visit. The store keeps one
+state file per domain under storage_state/, loads it into new contexts
+(at creation when the URL is known, or into a running context via
+add_cookies + an init script) and expires it after a TTL.
+
+- a domain's "consent" flag is set once the cookie banner has been accepted,
+  so the banner handler can be skipped while the state is fresh
+- the TTL runs from when consent was first stored; later saves refresh the
+  cookies but not the expiry
+- banner checks vs skips are counted for reporting
+"""
+
+import json
+import os
+import time
+import weakref
+from pathlib import Path
+from typing import Dict, Any, Optional
+from urllib.parse import urlparse
+
+from playwright.async_api import BrowserContext
+
+from core.kai_agent_base import logger
+
+DEFAULT_TTL = 7 * 24 * 3600  # one week
+
+LOCAL_STORAGE_JS = """
+((origins) => {
+    const entry = origins.find(o => o.origin === location.origin);
+    if (!entry) return;
+    for (const item of entry.localStorage) {
+        try { localStorage.setItem(item.name, item.value); } catch (e) {}
+    }
+})(%s)
+"""
+
+
+def domain_of(url: str) -> str:
+    """Storage key for a URL: host without a leading www."""
+    netloc = urlparse(url if '//' in url else f"https://{url}").netloc.lower()
+    return netloc[4:] if netloc.startswith('www.') else netloc
+
+
+class StorageStateStore:
+    def __init__(self, directory: str = "storage_state", ttl: float = DEFAULT_TTL):
+        self.directory = Path(directory)
+        self.ttl = ttl
+        self._applied = weakref.WeakKeyDictionary()  # context -> domains already loaded into it
+        self.stats = {
+            'loads': 0,
+            'misses': 0,
+            'expired': 0,
+            'saves': 0,
+            'banner_checks': 0,
+            'banner_skips': 0
+        }
+
+    def _path(self, domain: str) -> Path:
+        return self.directory / f"{domain.replace(':', '_')}.json"
+
+    def _read(self, domain: str) -> Optional[Dict[str, Any]]:
+        path = self._path(domain)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+        except Exception as e:
+            logger.warning(f"[StorageState] Could not read {path}: {e}")
+            return None
+
+        if time.time() - entry.get('created_at', 0) > self.ttl:
+            self.stats['expired'] += 1
+            logger.info(f"[StorageState] State for {domain} expired")
+            path.unlink(missing_ok=True)
+            return None
+        return entry
+
+    def load(self, domain: str) -> Optional[Dict[str, Any]]:
+        """Fresh storage_state dict for a domain, or None"""
+        entry = self._read(domain)
+        if entry is None:
+            self.stats['misses'] += 1
+            return None
+        self.stats['loads'] += 1
+        return entry['state']
+
+    def has_consent(self, domain: str) -> bool:
+        entry = self._read(domain)
+        return bool(entry and entry.get('consent'))
+
+    async def apply(self, context: BrowserContext, domain: str) -> bool:
+        """Load a domain's stored state into an already running context (once per context)"""
+        applied = self._applied.setdefault(context, set())
+        if domain in applied:
+            return True
+        state = self.load(domain)
+        if state is None:
+            return False
+        if state.get('cookies'):
+            await context.add_cookies(state['cookies'])
+        if state.get('origins'):
+            await context.add_init_script(script=LOCAL_STORAGE_JS % json.dumps(state['origins']))
+        applied.add(domain)
+        logger.debug(f"[StorageState] Loaded {len(state.get('cookies', []))} cookies for {domain}")
+        return True
+
+    async def save(self, context: BrowserContext, domain: str, consent: Optional[bool] = None):
+        """Persist a context's storage state for a domain (consent=None keeps the stored flag)"""
+        try:
+            state = await context.storage_state()
+        except Exception as e:
+            logger.warning(f"[StorageState] Could not read state for {domain}: {e}")
+            return
+
+        previous = self._read(domain) or {}
+        entry = {
+            'domain': domain,
+            'created_at': previous.get('created_at', time.time()),
+            'saved_at': time.time(),
+            'consent': previous.get('consent', False) if consent is None else consent,
+            'state': state
+        }
+        if consent and not previous.get('consent'):
+            # Consent just given: the TTL starts now
+            entry['created_at'] = time.time()
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        path = self._path(domain)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, path)
+        self._applied.setdefault(context, set()).add(domain)
+        self.stats['saves'] += 1
+
+    def record_banner_check(self, skipped: bool):
+        self.stats['banner_checks'] += 1
+        if skipped:
+            self.stats['banner_skips'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        """State loads/expiries and how often the cookie banner handler was skipped"""
+        checks = self.stats['banner_checks']
+        return {
+            **self.stats,
+            'domains': len(list(self.directory.glob('*.json'))) if self.directory.exists() else 0,
+            'banner_skip_rate': f"{(self.stats['banner_skips'] / checks * 100) if checks else 0:.1f}%"
+        }
+
+
+_shared_store: Optional[StorageStateStore] = None
+
+
+def get_storage_state_store() -> StorageStateStore:
+    """Process-wide store so skip counts aggregate across navigators"""
+    global _shared_store
+    if _shared_store is None:
+        _shared_store = StorageStateStore()
+    return _shared_store
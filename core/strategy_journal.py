@@ -0,0 +1,74 @@
+"""
+strategy_journal.py
+
+Read-only loader for the legacy memory.json strategy memory: a memory.json
+snapshot plus the append-only journal written next to it (memory.jsonl and
+any rotated memory.jsonl.<seq> left behind by a compaction).
+
+Strategy results are now kept in the SQLite strategy store
+(core/strategy_store.py); its migration uses load_memory() to rebuild the
+full memory.json aggregate, journal included, before importing it.
+
+Journal records carry a sequence number and the snapshot stores the last
+sequence it includes under "_journal", so records already folded into the
+snapshot are skipped and a torn last line from a crash is ignored.
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, Any, List
+
+from core.kai_agent_base import logger
+
+META_KEY = "_journal"
+
+
+def _journal_files(snapshot_file: Path) -> List[Path]:
+    """Rotated journals in sequence order, then the live one"""
+    journal_file = snapshot_file.with_suffix('.jsonl')
+    rotated = sorted(snapshot_file.parent.glob(f"{journal_file.name}.*"),
+                     key=lambda path: int(path.suffix[1:]) if path.suffix[1:].isdigit() else 0)
+    return rotated + [journal_file]
+
+
+def _apply(memory: Dict[str, Any], record: Dict[str, Any]):
+    entry = memory.setdefault(record['key'], {"strategies": [], "success_count": 0, "total_count": 0})
+    entry["strategies"].append({
+        "strategy": record['strategy'],
+        "success": record['success'],
+        "timestamp": record['timestamp']
+    })
+    if record['success']:
+        entry["success_count"] += 1
+    entry["total_count"] += 1
+
+
+def load_memory(snapshot_file: str = "memory.json") -> Dict[str, Any]:
+    """Rebuild the aggregate: snapshot, then every journal record newer than it"""
+    snapshot_file = Path(snapshot_file)
+    memory = {}
+    if snapshot_file.exists():
+        try:
+            with open(snapshot_file, 'r') as f:
+                memory = json.load(f)
+        except Exception as e:
+            logger.warning(f"[StrategyJournal] Could not read {snapshot_file}: {e}")
+    snapshot_seq = memory.pop(META_KEY, {}).get('seq', 0)
+
+    replayed = 0
+    for path in _journal_files(snapshot_file):
+        if not path.exists():
+            continue
+        with open(path, 'r') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # torn last line from a crash
+                if record['seq'] <= snapshot_seq:
+                    continue
+                _apply(memory, record)
+                replayed += 1
+    if replayed:
+        logger.info(f"[StrategyJournal] Replayed {replayed} journal records onto {snapshot_file}")
+    return memory
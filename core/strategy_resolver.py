@@ -0,0 +1,153 @@
+"""
+strategy_resolver.py
+
+Evaluate an intent's whole ordered strategy list in one in-page pass.
+Instead of memory -> primary -> fallbacks one query + visibility check at a time,
+the list is sent to the page once and we get back the first strategy with a
+visible match plus which strategies matched at all.
+
+Supported methods: css, xpath, text-contains, aria-label.
+Unsupported methods are reported as such and skipped.
+
+The winning element is kept in the page (window.__kaiResolved) so it can be
+clicked without another lookup. build_cascade() assembles the ordered list
+from the strategy store's ranking and the intent config, one entry per selector.
+"""
+
+import time
+from typing import Dict, Any, List
+
+from playwright.async_api import Page
+
+from core.kai_agent_base import logger
+
+SUPPORTED_METHODS = ('css', 'xpath', 'text-contains', 'aria-label')
+
+RESOLVE_JS = """
+(strategies) => {
+    const clickable = 'a, button, [role="button"], [onclick]';
+    const isVisible = (el) => {
+        const r = el.getBoundingClientRect();
+        return r.width > 0 && r.height > 0 && getComputedStyle(el).visibility !== 'hidden';
+    };
+    const find = (s) => {
+        const value = s.value || '';
+        try {
+            switch (s.method) {
+                case 'css':
+                    return Array.from(document.querySelectorAll(value));
+                case 'xpath': {
+                    const snap = document.evaluate(value, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+                    const out = [];
+                    for (let i = 0; i < snap.snapshotLength; i++) {
+                        const node = snap.snapshotItem(i);
+                        if (node.nodeType === 1) out.push(node);
+                    }
+                    return out;
+                }
+                case 'text-contains': {
+                    const needle = value.toLowerCase();
+                    return Array.from(document.querySelectorAll(clickable))
+                        .filter(el => (el.innerText || '').toLowerCase().includes(needle));
+                }
+                case 'aria-label': {
+                    const needle = value.toLowerCase();
+                    return Array.from(document.querySelectorAll('[aria-label]'))
+                        .filter(el => el.getAttribute('aria-label').toLowerCase().includes(needle));
+                }
+                default:
+                    return null;
+            }
+        } catch (e) {
+            return [];
+        }
+    };
+
+    const matches = [];
+    let winner = null;
+    window.__kaiResolved = null;
+    strategies.forEach((s, i) => {
+        const elements = find(s);
+        if (elements === null) {
+            matches.push({index: i, supported: false, found: 0, visible: false});
+            return;
+        }
+        const visible = elements.find(isVisible);
+        matches.push({index: i, supported: true, found: elements.length, visible: !!visible});
+        if (visible && winner === null) {
+            winner = i;
+            window.__kaiResolved = visible;
+        }
+    });
+
+    const el = window.__kaiResolved;
+    return {
+        winner: winner,
+        matches: matches,
+        text: el ? (el.innerText || '').trim().slice(0, 200) : null,
+        href: el ? el.getAttribute('href') : null
+    };
+}
+"""
+
+
+def guess_method(selector: str, intent_config: Dict[str, Any] = None) -> str:
+    """Method for a remembered selector: as declared by the intent, else xpath/css by shape"""
+    for fallback in (intent_config or {}).get('fallbacks', []):
+        if fallback.get('value') == selector:
+            return fallback.get('method', 'css')
+    return 'xpath' if selector.startswith(('/', '(')) else 'css'
+
+
+def build_cascade(ranked: List[Dict[str, Any]], intent_config: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """
+    Ordered, de-duplicated strategy list: ranked memory strategies (one entry
+    per selector), then the intent's primary selector, then its fallbacks.
+    """
+    cascade = []
+    seen = set()
+
+    def add(kind, selector, method):
+        if selector and selector not in seen:
+            seen.add(selector)
+            cascade.append({"type": kind, "selector": selector, "method": method})
+
+    for row in ranked:
+        add("memory", row['strategy'], guess_method(row['strategy'], intent_config))
+    add("primary", intent_config.get("primary_selector"), "css")
+    for fallback in intent_config.get("fallbacks", []):
+        add("fallback", fallback.get("value"), fallback.get("method", "css"))
+    return cascade
+
+
+def normalize_strategy(strategy: Dict[str, Any]) -> Dict[str, str]:
+    """Accept both {'method', 'value'} fallbacks and {'method', 'selector'} clicker strategies"""
+    value = strategy.get('selector', strategy.get('value', ''))
+    return {'method': strategy.get('method', 'css'), 'value': value}
+
+
+async def resolve_strategies(page: Page, strategies: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Resolve an ordered strategy list in one round trip.
+    Returns winner (index into strategies or None), per-strategy matches,
+    and text/href of the winning element.
+    """
+    start = time.monotonic()
+    result = await page.evaluate(RESOLVE_JS, [normalize_strategy(s) for s in strategies])
+    result['elapsed'] = time.monotonic() - start
+
+    matched = [m['index'] for m in result['matches'] if m['visible']]
+    logger.debug(f"[StrategyResolver] {len(strategies)} strategies in {result['elapsed'] * 1000:.0f} ms, "
+                 f"winner={result['winner']}, visible matches={matched}")
+    return result
+
+
+async def click_resolved(page: Page) -> bool:
+    """Click the element picked by the last resolve_strategies() call"""
+    handle = await page.evaluate_handle('() => window.__kaiResolved || null')
+    element = handle.as_element()
+    if element is None:
+        return False
+    await element.scroll_into_view_if_needed()
+    await element.click()
+    return True
@@ -0,0 +1,878 @@
+"""
+strategy_store.py
+
+One shared strategy store on SQLite (WAL) for every navigator and agent.
+Replaces the three MemoryInterface copies (memory.json), StrategyScorer
+(config/strategy_stats.json), the archived prototype MemoryInterface and
+KaiLinkClickAgent's in-memory strategy_stats, which all tracked the same
+attempts/successes per (domain, intent, strategy) in different places.
+
+- one aggregate row per (domain, intent, strategy), primary-key indexed,
+  plus an index on (domain, intent) for lookups
+- constant SQL text, so sqlite3's statement cache reuses prepared statements
+- write-behind: record() only appends to an in-memory buffer, so the click
+  path never touches the disk; the buffer is applied in one transaction at
+  cycle end (end_cycle), every flush_interval seconds from a background
+  thread, when it reaches batch_size, and at shutdown. Commits run with
+  synchronous=FULL, so a crash loses at most the unflushed cycle
+- hot-path reads (get_intent_strategies, get_global_strategies) merge the
+  buffer in memory instead of flushing it; reporting reads flush first
+- flush latency and buffer depth are reported by get_stats()
+- every attempt's latency also lands in a compact per-phase histogram
+  (core/latency_histogram.py), reported as p50/p95/p99
+- safe for several processes on one host (e.g. two navigators at once):
+  every write transaction takes SQLite's write lock up front (BEGIN
+  IMMEDIATE) and waits up to busy_timeout for it; all updates are additive
+  upserts, so concurrent writers never overwrite each other, and reads
+  query the database, so a process sees the others' flushed results
+  without reloading anything
+- fleet sync (core/strategy_sync.py): each database has a node id and keeps
+  grow-only counters per (node, domain, intent, strategy) next to the
+  aggregates; merge_counters() takes the element-wise max per node and adds
+  only the growth to strategy_stats, so merging other hosts' exports in any
+  order, any number of times, gives the same totals. Evicting an aggregate
+  row moves its node counters to counter_tombstones, so live counters stay
+  within the same bounds (at most one per known node for each kept row);
+  a counter is never reset: when the strategy is used or merged again it
+  resumes from its tombstone, so only growth since the eviction counts
+- consecutive_failures (reset by a success) and a per-domain page structure
+  signature back the negative cache (core/negative_cache.py)
+- migrate() imports memory.json (+ its journal) and config/strategy_stats.json
+  once; applied migrations are recorded so re-runs are no-ops
+- evidence decays with a half-life (weighted_* columns), so layouts that
+  changed long ago stop driving the order selectors are tried in
+- each domain tracks at most max_selectors_per_domain selectors (lowest
+  decayed score, then least recently used, are evicted) and the whole store
+  at most max_rows (least recently used first); every eviction is logged
+  to the evictions table
+
+Run `python -m core.strategy_store` to migrate and print a summary,
+`--evictions` for the eviction report, `--export FILE` / `--merge FILE...`
+to move counters between hosts and `--sync DIR` to sync with a shared
+directory once.
+"""
+
+import argparse
+import atexit
+import json
+import os
+import socket
+import sqlite3
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Sequence, Tuple
+
+from core.kai_agent_base import logger
+from core import latency_histogram
+
+DEFAULT_DB = "strategy_store.db"
+DEFAULT_FLUSH_INTERVAL = 30.0
+DEFAULT_BUSY_TIMEOUT = 10.0  # seconds to wait for another process's write transaction
+DEFAULT_HALF_LIFE = 14 * 24 * 3600  # evidence loses half its weight every two weeks
+MAX_SELECTORS_PER_DOMAIN = 40
+MAX_ROWS = 5000
+MAX_EVICTION_LOG = 1000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS strategy_stats (
+    domain TEXT NOT NULL,
+    intent TEXT NOT NULL,
+    strategy TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    successes INTEGER NOT NULL DEFAULT 0,
+    last_success REAL,
+    last_attempt REAL,
+    latency_total REAL NOT NULL DEFAULT 0,
+    latency_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (domain, intent, strategy)
+);
+CREATE INDEX IF NOT EXISTS idx_strategy_stats_domain_intent ON strategy_stats (domain, intent);
+CREATE TABLE IF NOT EXISTS evictions (
+    domain TEXT NOT NULL,
+    intent TEXT NOT NULL,
+    strategy TEXT NOT NULL,
+    attempts INTEGER NOT NULL,
+    successes INTEGER NOT NULL,
+    weighted_score REAL,
+    last_attempt REAL,
+    reason TEXT NOT NULL,
+    evicted_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS page_structure (
+    domain TEXT PRIMARY KEY,
+    signature TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS node_counters (
+    node TEXT NOT NULL,
+    domain TEXT NOT NULL,
+    intent TEXT NOT NULL,
+    strategy TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    successes INTEGER NOT NULL DEFAULT 0,
+    last_success REAL,
+    last_attempt REAL,
+    latency_total REAL NOT NULL DEFAULT 0,
+    latency_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (node, domain, intent, strategy)
+);
+CREATE TABLE IF NOT EXISTS counter_tombstones (
+    node TEXT NOT NULL,
+    domain TEXT NOT NULL,
+    intent TEXT NOT NULL,
+    strategy TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    successes INTEGER NOT NULL DEFAULT 0,
+    last_success REAL,
+    last_attempt REAL,
+    latency_total REAL NOT NULL DEFAULT 0,
+    latency_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (node, domain, intent, strategy)
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS migrations (
+    name TEXT PRIMARY KEY,
+    applied_at REAL NOT NULL
+);
+"""
+
+UPSERT_SQL = """
+INSERT INTO strategy_stats (domain, intent, strategy, attempts, successes, last_success, last_attempt,
+                            latency_total, latency_count, weighted_attempts, weighted_successes, weighted_at,
+                            consecutive_failures, latency_histogram)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (domain, intent, strategy) DO UPDATE SET
+    latency_histogram = kai_merge_histogram(latency_histogram, excluded.latency_histogram),
+    consecutive_failures = CASE WHEN excluded.last_success IS NOT NULL THEN excluded.consecutive_failures
+                                ELSE consecutive_failures + excluded.consecutive_failures END,
+    weighted_attempts = weighted_attempts * kai_decay(excluded.weighted_at - weighted_at) + excluded.weighted_attempts,
+    weighted_successes = weighted_successes * kai_decay(excluded.weighted_at - weighted_at) + excluded.weighted_successes,
+    weighted_at = COALESCE(MAX(weighted_at, excluded.weighted_at), weighted_at, excluded.weighted_at),
+    attempts = attempts + excluded.attempts,
+    successes = successes + excluded.successes,
+    latency_total = latency_total + excluded.latency_total,
+    latency_count = latency_count + excluded.latency_count,
+    last_success = COALESCE(MAX(last_success, excluded.last_success), last_success, excluded.last_success),
+    last_attempt = COALESCE(MAX(last_attempt, excluded.last_attempt), last_attempt, excluded.last_attempt)
+"""
+
+NODE_COUNTER_COLUMNS = ('node', 'domain', 'intent', 'strategy', 'attempts', 'successes',
+                        'last_success', 'last_attempt', 'latency_total', 'latency_count')
+
+# This node's own attempts: counters grow by what was recorded
+NODE_RECORD_SQL = """
+INSERT INTO node_counters (node, domain, intent, strategy, attempts, successes, last_success, last_attempt,
+                           latency_total, latency_count)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (node, domain, intent, strategy) DO UPDATE SET
+    attempts = attempts + excluded.attempts,
+    successes = successes + excluded.successes,
+    latency_total = latency_total + excluded.latency_total,
+    latency_count = latency_count + excluded.latency_count,
+    last_success = COALESCE(MAX(last_success, excluded.last_success), last_success, excluded.last_success),
+    last_attempt = COALESCE(MAX(last_attempt, excluded.last_attempt), last_attempt, excluded.last_attempt)
+"""
+
+# Another copy of a node's counters: element-wise max (grow-only counter merge)
+NODE_MERGE_SQL = """
+INSERT INTO node_counters (node, domain, intent, strategy, attempts, successes, last_success, last_attempt,
+                           latency_total, latency_count)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (node, domain, intent, strategy) DO UPDATE SET
+    attempts = MAX(attempts, excluded.attempts),
+    successes = MAX(successes, excluded.successes),
+    latency_total = MAX(latency_total, excluded.latency_total),
+    latency_count = MAX(latency_count, excluded.latency_count),
+    last_success = COALESCE(MAX(last_success, excluded.last_success), last_success, excluded.last_success),
+    last_attempt = COALESCE(MAX(last_attempt, excluded.last_attempt), last_attempt, excluded.last_attempt)
+"""
+
+SELECT_NODE_COUNTER_SQL = """
+SELECT attempts, successes, latency_total, latency_count FROM node_counters
+WHERE node = ? AND domain = ? AND intent = ? AND strategy = ?
+"""
+
+ADDED_COLUMNS = {
+    'latency_total': "REAL NOT NULL DEFAULT 0",
+    'latency_count': "INTEGER NOT NULL DEFAULT 0",
+    'weighted_attempts': "REAL NOT NULL DEFAULT 0",
+    'weighted_successes': "REAL NOT NULL DEFAULT 0",
+    'weighted_at': "REAL",
+    'consecutive_failures': "INTEGER NOT NULL DEFAULT 0",
+    'latency_histogram': "TEXT"
+}
+
+SELECT_INTENT_SQL = """
+SELECT strategy, attempts, successes, last_success, last_attempt, latency_total, latency_count,
+       weighted_attempts, weighted_successes, weighted_at, consecutive_failures, latency_histogram
+FROM strategy_stats WHERE domain = ? AND intent = ?
+ORDER BY successes DESC, attempts ASC
+"""
+
+SELECT_BY_STRATEGY_SQL = """
+SELECT strategy, SUM(attempts), SUM(successes) FROM strategy_stats
+GROUP BY strategy
+"""
+
+SELECT_HISTOGRAMS_SQL = """
+SELECT strategy, latency_histogram FROM strategy_stats WHERE latency_histogram IS NOT NULL
+"""
+
+SELECT_INTENT_GLOBAL_SQL = """
+SELECT strategy, SUM(attempts), SUM(successes), SUM(latency_total), SUM(latency_count)
+FROM strategy_stats WHERE intent = ? GROUP BY strategy
+"""
+
+SELECT_DOMAIN_ROWS_SQL = """
+SELECT intent, strategy, attempts, successes, last_attempt, weighted_attempts, weighted_successes, weighted_at
+FROM strategy_stats WHERE domain = ?
+"""
+
+SELECT_LRU_SQL = """
+SELECT domain, intent, strategy, attempts, successes, last_attempt, weighted_attempts, weighted_successes, weighted_at
+FROM strategy_stats ORDER BY COALESCE(last_attempt, 0) ASC LIMIT ?
+"""
+
+DELETE_ROW_SQL = "DELETE FROM strategy_stats WHERE domain = ? AND intent = ? AND strategy = ?"
+
+# Eviction: every node's counters for the key become tombstones (the values growth is measured from)
+BURY_COUNTERS_SQL = f"""
+INSERT OR REPLACE INTO counter_tombstones ({', '.join(NODE_COUNTER_COLUMNS)})
+SELECT {', '.join(NODE_COUNTER_COLUMNS)} FROM node_counters WHERE domain = ? AND intent = ? AND strategy = ?
+"""
+DELETE_NODE_COUNTERS_SQL = "DELETE FROM node_counters WHERE domain = ? AND intent = ? AND strategy = ?"
+
+# Node counters whose aggregate row is gone (evicted before counters were buried with it)
+BURY_ORPHAN_COUNTERS_SQL = f"""
+INSERT OR REPLACE INTO counter_tombstones ({', '.join(NODE_COUNTER_COLUMNS)})
+SELECT {', '.join(NODE_COUNTER_COLUMNS)} FROM node_counters WHERE NOT EXISTS (
+    SELECT 1 FROM strategy_stats s
+    WHERE s.domain = node_counters.domain AND s.intent = node_counters.intent AND s.strategy = node_counters.strategy
+)
+"""
+DELETE_ORPHAN_COUNTERS_SQL = """
+DELETE FROM node_counters WHERE NOT EXISTS (
+    SELECT 1 FROM strategy_stats s
+    WHERE s.domain = node_counters.domain AND s.intent = node_counters.intent AND s.strategy = node_counters.strategy
+)
+"""
+
+# A node's counter used again after its eviction resumes from the tombstone
+RESTORE_COUNTER_SQL = f"""
+INSERT OR IGNORE INTO node_counters ({', '.join(NODE_COUNTER_COLUMNS)})
+SELECT {', '.join(NODE_COUNTER_COLUMNS)} FROM counter_tombstones
+WHERE node = ? AND domain = ? AND intent = ? AND strategy = ?
+"""
+DELETE_TOMBSTONE_SQL = "DELETE FROM counter_tombstones WHERE node = ? AND domain = ? AND intent = ? AND strategy = ?"
+SELECT_TOMBSTONE_SQL = """
+SELECT attempts, successes, latency_total, latency_count FROM counter_tombstones
+WHERE node = ? AND domain = ? AND intent = ? AND strategy = ?
+"""
+
+LOG_EVICTION_SQL = """
+INSERT INTO evictions (domain, intent, strategy, attempts, successes, weighted_score, last_attempt, reason, evicted_at)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+TRIM_EVICTIONS_SQL = """
+DELETE FROM evictions WHERE rowid NOT IN (SELECT rowid FROM evictions ORDER BY evicted_at DESC LIMIT ?)
+"""
+
+SELECT_TOTALS_SQL = """
+SELECT COUNT(DISTINCT domain), COALESCE(SUM(attempts), 0), COALESCE(SUM(successes), 0) FROM strategy_stats
+"""
+
+
+class StrategyStore:
+    def __init__(self, db_path: str = DEFAULT_DB, batch_size: int = 500, half_life: float = DEFAULT_HALF_LIFE,
+                 max_selectors_per_domain: int = MAX_SELECTORS_PER_DOMAIN, max_rows: int = MAX_ROWS,
+                 flush_interval: Optional[float] = DEFAULT_FLUSH_INTERVAL,
+                 busy_timeout: float = DEFAULT_BUSY_TIMEOUT):
+        self.db_path = Path(db_path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.half_life = half_life
+        self.max_selectors_per_domain = max_selectors_per_domain
+        self.max_rows = max_rows
+        self._lock = threading.RLock()
+        self._pending: List[Tuple] = []
+        self._flusher: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.conn = sqlite3.connect(str(self.db_path), timeout=busy_timeout, check_same_thread=False,
+                                    cached_statements=64)
+        self.conn.execute(f"PRAGMA busy_timeout={int(busy_timeout * 1000)}")
+        self.conn.create_function("kai_decay", 1, self.decay, deterministic=True)
+        self.conn.create_function("kai_merge_histogram", 2, latency_histogram.merge, deterministic=True)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=FULL")
+        self.conn.executescript(SCHEMA)
+        self._upgrade_schema()
+        self.node_id = self._load_node_id()
+        self._seed_node_counters()
+        self._prune_node_counters()
+        self.stats = {'records': 0, 'batches': 0, 'batch_ms': 0.0, 'last_flush_ms': 0.0, 'max_flush_ms': 0.0,
+                      'max_pending': 0, 'flushes': {}, 'evicted': 0}
+
+    def _upgrade_schema(self):
+        """Add columns introduced after a database was created"""
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            # Read under the write lock, so two processes never both add a column
+            columns = {row[1] for row in self.conn.execute("PRAGMA table_info(strategy_stats)")}
+            for column, definition in ADDED_COLUMNS.items():
+                if column not in columns:
+                    self.conn.execute(f"ALTER TABLE strategy_stats ADD COLUMN {column} {definition}")
+            if 'weighted_at' not in columns:
+                # Existing evidence starts decaying from its last attempt
+                self.conn.execute("UPDATE strategy_stats SET weighted_attempts = attempts, "
+                                  "weighted_successes = successes, weighted_at = last_attempt")
+            if 'consecutive_failures' not in columns:
+                # Only never-successful strategies are known to be failing in a row
+                self.conn.execute("UPDATE strategy_stats SET consecutive_failures = attempts WHERE successes = 0")
+
+    def _load_node_id(self) -> str:
+        """Stable id of this database in the fleet (shared by every process on the host)"""
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            row = self.conn.execute("SELECT value FROM meta WHERE key = 'node_id'").fetchone()
+            if row:
+                return row[0]
+            node_id = f"{socket.gethostname()}-{uuid.uuid4().hex[:8]}"
+            self.conn.execute("INSERT INTO meta (key, value) VALUES ('node_id', ?)", (node_id,))
+        return node_id
+
+    def _seed_node_counters(self):
+        """Attribute results recorded before node counters existed to this node"""
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            if self._migrated('node_counters'):
+                return
+            self.conn.execute(
+                "INSERT OR IGNORE INTO node_counters (node, domain, intent, strategy, attempts, successes, "
+                "last_success, last_attempt, latency_total, latency_count) SELECT ?, domain, intent, strategy, "
+                "attempts, successes, last_success, last_attempt, latency_total, latency_count FROM strategy_stats",
+                (self.node_id,)
+            )
+            self.conn.execute("INSERT INTO migrations (name, applied_at) VALUES ('node_counters', ?)", (time.time(),))
+
+    def _prune_node_counters(self):
+        """Bury node counters left behind by evictions made before counters were buried with them"""
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            if self._migrated('prune_node_counters'):
+                return
+            self.conn.execute(BURY_ORPHAN_COUNTERS_SQL)
+            pruned = self.conn.execute(DELETE_ORPHAN_COUNTERS_SQL).rowcount
+            self.conn.execute("INSERT INTO migrations (name, applied_at) VALUES ('prune_node_counters', ?)",
+                              (time.time(),))
+        if pruned:
+            logger.info(f"[StrategyStore] Moved {pruned} node counters of evicted strategies to tombstones")
+
+    def decay(self, age: Optional[float]) -> float:
+        """Weight left after `age` seconds"""
+        if not age or age <= 0:
+            return 1.0
+        return 0.5 ** (age / self.half_life)
+
+    # --- writes ---
+
+    def record(self, domain: str, intent: str, strategy: str, success: bool = True,
+               latency: Optional[float] = None, timestamp: Optional[float] = None,
+               phases: Optional[Dict[str, float]] = None):
+        """
+        Buffer one attempt (latency and per-phase timings in seconds, if measured);
+        no disk I/O unless the buffer is full
+        """
+        now = timestamp or time.time()
+        with self._lock:
+            self._pending.append((domain, intent, strategy, 1, 1 if success else 0,
+                                  now if success else None, now,
+                                  latency or 0.0, 1 if latency is not None else 0,
+                                  1.0, 1.0 if success else 0.0, now,
+                                  0 if success else 1, latency_histogram.encode(latency, phases)))
+            self.stats['records'] += 1
+            self.stats['max_pending'] = max(self.stats['max_pending'], len(self._pending))
+            if len(self._pending) >= self.batch_size:
+                self.flush(reason="size")
+            elif self.flush_interval and self._flusher is None:
+                self._flusher = threading.Thread(target=self._flush_periodically, name="strategy-store-flush",
+                                                 daemon=True)
+                self._flusher.start()
+
+    def _flush_periodically(self):
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush(reason="timer")
+            except Exception as e:
+                logger.warning(f"[StrategyStore] Timed flush failed: {e}")
+
+    def flush(self, reason: str = "read"):
+        """Apply every buffered attempt in one transaction"""
+        with self._lock:
+            if not self._pending:
+                return
+            start = time.monotonic()
+            domains = {row[0] for row in self._pending}
+            with self.conn:
+                self.conn.execute("BEGIN IMMEDIATE")
+                self.conn.executemany(UPSERT_SQL, self._pending)
+                keys = {(self.node_id,) + row[:3] for row in self._pending}
+                self.conn.executemany(RESTORE_COUNTER_SQL, keys)
+                self.conn.executemany(DELETE_TOMBSTONE_SQL, keys)
+                self.conn.executemany(NODE_RECORD_SQL, [(self.node_id,) + row[:9] for row in self._pending])
+                self._enforce_limits(domains)
+            self._pending = []
+            elapsed_ms = (time.monotonic() - start) * 1000
+            self.stats['batches'] += 1
+            self.stats['batch_ms'] += elapsed_ms
+            self.stats['last_flush_ms'] = round(elapsed_ms, 2)
+            self.stats['max_flush_ms'] = round(max(self.stats['max_flush_ms'], elapsed_ms), 2)
+            self.stats['flushes'][reason] = self.stats['flushes'].get(reason, 0) + 1
+
+    def end_cycle(self):
+        """Cycle boundary: persist everything the cycle recorded"""
+        self.flush(reason="cycle")
+
+    def _pending_rows(self, intent: str, domain: Optional[str] = None) -> List[Tuple]:
+        """Buffered attempts for an intent (and domain), without the key columns except strategy"""
+        with self._lock:
+            return [row[2:] for row in self._pending
+                    if row[1] == intent and (domain is None or row[0] == domain)]
+
+    # --- eviction ---
+
+    def _weighted(self, weighted_attempts: float, weighted_successes: float,
+                  weighted_at: Optional[float], now: float) -> Tuple[float, float]:
+        factor = self.decay(now - weighted_at) if weighted_at else 1.0
+        return weighted_attempts * factor, weighted_successes * factor
+
+    def _evict(self, rows: List[Tuple], reason: str, now: float):
+        """rows: (domain, intent, strategy, attempts, successes, last_attempt, score)"""
+        for domain, intent, strategy, attempts, successes, last_attempt, score in rows:
+            self.conn.execute(DELETE_ROW_SQL, (domain, intent, strategy))
+            self.conn.execute(BURY_COUNTERS_SQL, (domain, intent, strategy))
+            self.conn.execute(DELETE_NODE_COUNTERS_SQL, (domain, intent, strategy))
+            self.conn.execute(LOG_EVICTION_SQL, (domain, intent, strategy, attempts, successes,
+                                                 score, last_attempt, reason, now))
+            logger.debug(f"[StrategyStore] Evicted {domain}/{intent}/{strategy} ({reason})")
+        self.stats['evicted'] += len(rows)
+
+    def _enforce_limits(self, domains):
+        """Per-domain selector cap (low decayed score, then LRU) and global row budget (LRU)"""
+        now = time.time()
+        evicted = 0
+        for domain in domains:
+            rows = self.conn.execute(SELECT_DOMAIN_ROWS_SQL, (domain,)).fetchall()
+            excess = len(rows) - self.max_selectors_per_domain
+            if excess <= 0:
+                continue
+            ranked = []
+            for intent, strategy, attempts, successes, last_attempt, w_attempts, w_successes, w_at in rows:
+                w_attempts, w_successes = self._weighted(w_attempts, w_successes, w_at, now)
+                score = (w_successes + 1) / (w_attempts + 2)
+                ranked.append((score, last_attempt or 0, domain, intent, strategy, attempts, successes))
+            ranked.sort()
+            self._evict([(d, i, st, a, su, la, sc) for sc, la, d, i, st, a, su in ranked[:excess]],
+                        "domain_cap", now)
+            evicted += excess
+
+        total = self.conn.execute("SELECT COUNT(*) FROM strategy_stats").fetchone()[0]
+        if total > self.max_rows:
+            rows = self.conn.execute(SELECT_LRU_SQL, (total - self.max_rows,)).fetchall()
+            self._evict([(d, i, st, a, su, la, None) for d, i, st, a, su, la, *_ in rows], "global_budget", now)
+            evicted += len(rows)
+
+        if evicted:
+            self.conn.execute(TRIM_EVICTIONS_SQL, (MAX_EVICTION_LOG,))
+            logger.info(f"[StrategyStore] Evicted {evicted} strategies")
+
+    def get_eviction_report(self, limit: int = 50) -> List[Dict[str, Any]]:
+        """Most recent evictions, newest first"""
+        with self._lock:
+            self.flush()
+            rows = self.conn.execute(
+                "SELECT domain, intent, strategy, attempts, successes, weighted_score, last_attempt, reason, "
+                "evicted_at FROM evictions ORDER BY evicted_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        fields = ('domain', 'intent', 'strategy', 'attempts', 'successes', 'weighted_score',
+                  'last_attempt', 'reason', 'evicted_at')
+        return [dict(zip(fields, row)) for row in rows]
+
+    def close(self):
+        self._stop.set()
+        if self._flusher and self._flusher is not threading.current_thread():
+            self._flusher.join()
+        with self._lock:
+            self.flush(reason="shutdown")
+            self.conn.close()
+
+    # --- reads ---
+
+    def get_intent_strategies(self, domain: str, intent: str) -> List[Dict[str, Any]]:
+        """Every strategy tried for (domain, intent), most successful first (buffered attempts included)"""
+        with self._lock:
+            rows = {row[0]: list(row[1:]) for row in self.conn.execute(SELECT_INTENT_SQL, (domain, intent))}
+            pending = self._pending_rows(intent, domain)
+        for strategy, *update in pending:
+            row = rows.get(strategy)
+            if row is None:
+                rows[strategy] = list(update)
+                continue
+            # Same arithmetic as UPSERT_SQL
+            factor = self.decay(update[8] - row[8]) if row[8] else 1.0
+            row[7], row[6] = row[7] * factor + update[7], row[6] * factor + update[6]
+            row[8] = max(row[8] or 0, update[8])
+            row[9] = update[9] if update[2] is not None else row[9] + update[9]
+            row[10] = latency_histogram.merge(row[10], update[10])
+            row[0] += update[0]
+            row[1] += update[1]
+            row[2] = max(row[2] or 0, update[2] or 0) or None
+            row[3] = max(row[3] or 0, update[3] or 0) or None
+            row[4] += update[4]
+            row[5] += update[5]
+
+        now = time.time()
+        strategies = []
+        for strategy, (attempts, successes, last_success, last_attempt, latency_total, latency_count,
+                       w_attempts, w_successes, w_at, consecutive_failures, histogram) in rows.items():
+            w_attempts, w_successes = self._weighted(w_attempts, w_successes, w_at, now)
+            strategies.append({
+                'strategy': strategy, 'attempts': attempts, 'successes': successes,
+                'failures': attempts - successes, 'last_success': last_success, 'last_attempt': last_attempt,
+                'mean_latency': latency_total / latency_count if latency_count else None,
+                'weighted_successes': w_successes, 'weighted_failures': max(0.0, w_attempts - w_successes),
+                'consecutive_failures': consecutive_failures,
+                'latency': latency_histogram.summarize(histogram)
+            })
+        return strategies
+
+    def rank_strategies(self, domain: str, intent: str, successful_only: bool = True) -> List[Dict[str, Any]]:
+        """
+        One entry per selector, best first: smoothed time-decayed success rate,
+        then most recent success, then lowest mean latency. O(strategies) via
+        the (domain, intent) index, however long the history.
+        """
+        rows = self.get_intent_strategies(domain, intent)
+        if successful_only:
+            rows = [row for row in rows if row['successes'] > 0]
+        for row in rows:
+            weighted_attempts = row['weighted_successes'] + row['weighted_failures']
+            row['score'] = (row['weighted_successes'] + 1) / (weighted_attempts + 2)
+        rows.sort(key=lambda row: (-row['score'], -(row['last_success'] or 0),
+                                   row['mean_latency'] if row['mean_latency'] is not None else float('inf')))
+        return rows
+
+    def get_global_strategies(self, intent: str) -> Dict[str, Dict[str, Any]]:
+        """Per-strategy totals for an intent across every domain (priors for new domains)"""
+        with self._lock:
+            rows = self.conn.execute(SELECT_INTENT_GLOBAL_SQL, (intent,)).fetchall()
+            pending = self._pending_rows(intent)
+        totals = {
+            strategy: {'attempts': attempts, 'successes': successes,
+                       'latency_total': latency_total, 'latency_count': latency_count}
+            for strategy, attempts, successes, latency_total, latency_count in rows
+        }
+        for strategy, attempts, successes, _, _, latency_total, latency_count, *_ in pending:
+            entry = totals.setdefault(strategy, {'attempts': 0, 'successes': 0,
+                                                 'latency_total': 0.0, 'latency_count': 0})
+            entry['attempts'] += attempts
+            entry['successes'] += successes
+            entry['latency_total'] += latency_total
+            entry['latency_count'] += latency_count
+        return totals
+
+    def get_best_strategy(self, domain: str, intent: str, min_attempts: int = 2) -> Optional[str]:
+        """Highest success rate among strategies with enough attempts"""
+        best, best_rate = None, 0.0
+        for row in self.get_intent_strategies(domain, intent):
+            if row['attempts'] >= min_attempts:
+                rate = row['successes'] / row['attempts']
+                if rate > best_rate:
+                    best, best_rate = row['strategy'], rate
+        return best
+
+    def get_strategy_totals(self, strategies: Optional[Sequence[str]] = None) -> Dict[str, Dict[str, Any]]:
+        """attempts/successes and latency percentiles per strategy name across domains and intents"""
+        with self._lock:
+            self.flush()
+            rows = self.conn.execute(SELECT_BY_STRATEGY_SQL).fetchall()
+            histogram_rows = self.conn.execute(SELECT_HISTOGRAMS_SQL).fetchall()
+        totals = {strategy: {'attempts': 0, 'successes': 0, 'latency': {}} for strategy in (strategies or [])}
+        for strategy, attempts, successes in rows:
+            if strategies is None or strategy in totals:
+                totals[strategy] = {'attempts': attempts, 'successes': successes, 'latency': {}}
+        histograms = {}
+        for strategy, histogram in histogram_rows:
+            if strategy in totals:
+                histograms[strategy] = latency_histogram.merge(histograms.get(strategy), histogram)
+        for strategy, histogram in histograms.items():
+            totals[strategy]['latency'] = latency_histogram.summarize(histogram)
+        return totals
+
+    def get_totals(self) -> Dict[str, int]:
+        with self._lock:
+            self.flush()
+            domains, attempts, successes = self.conn.execute(SELECT_TOTALS_SQL).fetchone()
+        return {'domains': domains, 'attempts': attempts, 'successes': successes}
+
+    # --- negative cache support ---
+
+    def reset_failures(self, domain: str) -> int:
+        """Forget consecutive failures on a domain (its page structure changed)"""
+        with self._lock:
+            self.flush()
+            with self.conn:
+                cursor = self.conn.execute("UPDATE strategy_stats SET consecutive_failures = 0 "
+                                           "WHERE domain = ? AND consecutive_failures > 0", (domain,))
+        return cursor.rowcount
+
+    def count_failing(self, domain: str, min_failures: int) -> int:
+        """Strategies on a domain with at least `min_failures` consecutive failures (flushed rows only)"""
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM strategy_stats WHERE domain = ? "
+                                     "AND consecutive_failures >= ?", (domain, min_failures)).fetchone()[0]
+
+    def get_page_structure(self, domain: str) -> Optional[List[str]]:
+        with self._lock:
+            row = self.conn.execute("SELECT signature FROM page_structure WHERE domain = ?", (domain,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set_page_structure(self, domain: str, signature: List[str]):
+        with self._lock, self.conn:
+            self.conn.execute("INSERT INTO page_structure (domain, signature, updated_at) VALUES (?, ?, ?) "
+                              "ON CONFLICT (domain) DO UPDATE SET signature = excluded.signature, "
+                              "updated_at = excluded.updated_at", (domain, json.dumps(signature), time.time()))
+
+    # --- fleet sync (grow-only counters per node) ---
+
+    def get_node_counters(self) -> List[Dict[str, Any]]:
+        """Every node's counters known here (this node's and merged ones), for export"""
+        with self._lock:
+            self.flush()
+            rows = self.conn.execute(f"SELECT {', '.join(NODE_COUNTER_COLUMNS)} FROM node_counters "
+                                     "ORDER BY node, domain, intent, strategy").fetchall()
+        return [dict(zip(NODE_COUNTER_COLUMNS, row)) for row in rows]
+
+    def merge_counters(self, counters: List[Dict[str, Any]]) -> int:
+        """
+        Merge exported node counters; returns how many grew. Each node's
+        counters only ever grow, so the merge keeps the max per counter and
+        adds the growth to the aggregates the ranking reads.
+        """
+        now = time.time()
+        merged = 0
+        with self._lock:
+            self.flush()
+            with self.conn:
+                self.conn.execute("BEGIN IMMEDIATE")
+                domains = set()
+                for counter in counters:
+                    key = (counter['node'], counter['domain'], counter['intent'], counter['strategy'])
+                    known = self.conn.execute(SELECT_NODE_COUNTER_SQL, key).fetchone()
+                    buried = known is None and self.conn.execute(SELECT_TOMBSTONE_SQL, key).fetchone()
+                    if buried:
+                        # Evicted here: only what the node did after the eviction is new
+                        known = buried
+                    growth = [max(0, counter[column] - previous) for column, previous in
+                              zip(('attempts', 'successes', 'latency_total', 'latency_count'),
+                                  known or (0, 0, 0.0, 0))]
+                    if buried:
+                        if not any(growth):
+                            continue  # the peer has not used it since: keep it evicted
+                        self.conn.execute(RESTORE_COUNTER_SQL, key)
+                        self.conn.execute(DELETE_TOMBSTONE_SQL, key)
+                    self.conn.execute(NODE_MERGE_SQL, tuple(counter[column] for column in NODE_COUNTER_COLUMNS))
+                    if not any(growth):
+                        continue
+                    attempts, successes, latency_total, latency_count = growth
+                    last_attempt = counter['last_attempt'] or now
+                    weight = self.decay(now - last_attempt)
+                    self.conn.execute(UPSERT_SQL, (
+                        counter['domain'], counter['intent'], counter['strategy'], attempts, successes,
+                        counter['last_success'] if successes else None, counter['last_attempt'],
+                        latency_total, latency_count, attempts * weight, successes * weight, now, 0, None
+                    ))
+                    domains.add(counter['domain'])
+                    merged += 1
+                self._enforce_limits(domains)
+        return merged
+
+    # --- MemoryInterface-compatible API used by the navigators ---
+
+    def get_strategy(self, domain: str, intent: str) -> Optional[Dict[str, Any]]:
+        """Same shape the memory.json MemoryInterface returned, one entry per strategy"""
+        rows = self.get_intent_strategies(domain, intent)
+        if not rows:
+            return None
+        return {
+            "strategies": [
+                {"strategy": row['strategy'], "success": row['successes'] > 0,
+                 "successes": row['successes'], "attempts": row['attempts'],
+                 "timestamp": row['last_attempt']}
+                for row in rows
+            ],
+            "success_count": sum(row['successes'] for row in rows),
+            "total_count": sum(row['attempts'] for row in rows)
+        }
+
+    def store_strategy(self, domain: str, intent: str, strategy: str, success: bool = True,
+                       latency: Optional[float] = None, phases: Optional[Dict[str, float]] = None):
+        self.record(domain, intent, strategy, success, latency, phases=phases)
+
+    # --- migration ---
+
+    def _migrated(self, name: str) -> bool:
+        return self.conn.execute("SELECT 1 FROM migrations WHERE name = ?", (name,)).fetchone() is not None
+
+    def _import(self, name: str, rows: List[Tuple]) -> int:
+        with self._lock:
+            self.flush()
+            with self.conn:
+                self.conn.execute("BEGIN IMMEDIATE")
+                # Checked under the write lock: another process may be migrating the same file
+                if self._migrated(name):
+                    return 0
+                self.conn.executemany(UPSERT_SQL, rows)
+                self.conn.executemany(NODE_RECORD_SQL, [(self.node_id,) + row[:9] for row in rows])
+                self._enforce_limits({row[0] for row in rows})
+                self.conn.execute("INSERT INTO migrations (name, applied_at) VALUES (?, ?)", (name, time.time()))
+        logger.info(f"[StrategyStore] Imported {len(rows)} strategies from {name}")
+        return len(rows)
+
+    def migrate(self, memory_file: str = "memory.json",
+                stats_file: str = "config/strategy_stats.json") -> Dict[str, int]:
+        """Import the legacy JSON stores once"""
+        imported = {}
+        if Path(memory_file).exists() and not self._migrated(memory_file):
+            imported[memory_file] = self._import(memory_file, _memory_rows(memory_file))
+        if Path(stats_file).exists() and not self._migrated(stats_file):
+            imported[stats_file] = self._import(stats_file, _scorer_rows(stats_file))
+        return imported
+
+    def get_stats(self) -> Dict[str, Any]:
+        pending = len(self._pending)  # buffer depth before get_totals() flushes it
+        totals = self.get_totals()
+        batches = self.stats['batches']
+        return {
+            **totals,
+            'records': self.stats['records'],
+            'pending': pending,
+            'max_pending': self.stats['max_pending'],
+            'batches': batches,
+            'avg_batch_ms': round(self.stats['batch_ms'] / batches, 2) if batches else 0,
+            'last_flush_ms': self.stats['last_flush_ms'],
+            'max_flush_ms': self.stats['max_flush_ms'],
+            'flushes': dict(self.stats['flushes']),
+            'evicted': self.stats['evicted'],
+            'node': self.node_id
+        }
+
+
+def _memory_rows(memory_file: str) -> List[Tuple]:
+    """memory.json (plus any journal records) -> aggregate rows"""
+    from core.strategy_journal import load_memory
+
+    aggregate = {}
+    for key, entry in load_memory(memory_file).items():
+        if '_' not in key:
+            continue
+        domain, intent = key.split('_', 1)
+        for attempt in entry.get("strategies", []):
+            row = aggregate.setdefault((domain, intent, attempt["strategy"]), [0, 0, None, None, 0])
+            timestamp = attempt.get("timestamp")
+            row[0] += 1
+            if attempt.get("success"):
+                row[1] += 1
+                row[2] = max(row[2] or 0, timestamp or 0)
+                row[4] = 0
+            else:
+                row[4] += 1  # attempts are in chronological order
+            row[3] = max(row[3] or 0, timestamp or 0)
+    return [key + tuple(values[:4]) + (0.0, 0, values[0], values[1], values[3] or None, values[4], None)
+            for key, values in aggregate.items()]
+
+
+def _scorer_rows(stats_file: str) -> List[Tuple]:
+    """StrategyScorer's strategy_stats.json -> aggregate rows (no timestamps were kept)"""
+    with open(stats_file, 'r') as f:
+        stats = json.load(f)
+    # Evidence decays from when the file was last written
+    written_at = os.path.getmtime(stats_file)
+    rows = []
+    for domain, intents in stats.get("domains", {}).items():
+        for intent, data in intents.items():
+            for strategy, counts in data.get("strategies", {}).items():
+                attempts, successes = counts.get("attempts", 0), counts.get("successes", 0)
+                rows.append((domain, intent, strategy, attempts, successes, None, written_at, 0.0, 0,
+                             attempts, successes, written_at, attempts if successes == 0 else 0, None))
+    return rows
+
+
+_shared_store: Optional[StrategyStore] = None
+_shared_sync = None
+
+
+def get_strategy_store() -> StrategyStore:
+    """Process-wide store; migrates the legacy JSON files on first use and syncs with KAI_STRATEGY_SYNC_DIR"""
+    global _shared_store, _shared_sync
+    if _shared_store is None:
+        _shared_store = StrategyStore()
+        try:
+            _shared_store.migrate()
+        except Exception as e:
+            logger.warning(f"[StrategyStore] Migration failed: {e}")
+        sync_dir = os.environ.get("KAI_STRATEGY_SYNC_DIR")
+        if sync_dir:
+            from core.strategy_sync import StrategySync
+            _shared_sync = StrategySync(_shared_store, sync_dir)
+            try:
+                _shared_sync.start()
+            except Exception as e:
+                logger.warning(f"[StrategyStore] Sync with {sync_dir} failed: {e}")
+        atexit.register(close_strategy_store)
+    return _shared_store
+
+
+def close_strategy_store():
+    """Flush buffered writes, publish a final sync export and close the shared store"""
+    global _shared_store, _shared_sync
+    if _shared_sync is not None:
+        _shared_sync.stop()
+        _shared_sync = None
+    if _shared_store is not None:
+        _shared_store.close()
+        _shared_store = None
+
+
+if __name__ == "__main__":
+    from core.strategy_sync import StrategySync, export_counters, merge_file
+
+    parser = argparse.ArgumentParser(description="Strategy store maintenance")
+    parser.add_argument("--evictions", action="store_true", help="print the eviction report")
+    parser.add_argument("--export", metavar="FILE", help="export node counters for other hosts")
+    parser.add_argument("--merge", metavar="FILE", nargs="+", help="merge exports from other hosts")
+    parser.add_argument("--sync", metavar="DIR", help="sync once with a shared directory")
+    args = parser.parse_args()
+
+    store = get_strategy_store()
+    if args.evictions:
+        for entry in store.get_eviction_report():
+            evicted_at = time.strftime('%Y-%m-%d %H:%M', time.localtime(entry['evicted_at']))
+            print(f"{evicted_at}  {entry['reason']:13s} {entry['domain']}/{entry['intent']}: {entry['strategy']} "
+                  f"({entry['successes']}/{entry['attempts']})")
+    elif args.export:
+        print(f"Exported {export_counters(store, args.export)} counters from {store.node_id} to {args.export}")
+    elif args.merge:
+        for path in args.merge:
+            print(f"{path}: {merge_file(store, path)} counters grew")
+    elif args.sync:
+        print(f"Synced with {args.sync}: {StrategySync(store, args.sync).sync()} counters grew")
+    else:
+        print(f"Migrated: {store.migrate() or 'nothing new'}")
+        print(f"Store: {store.get_stats()}")
+    close_strategy_store()
@@ -0,0 +1,138 @@
+"""
+strategy_sync.py
+
+Share learned strategy statistics across operator hosts without a central
+service. Each host's strategy store keeps grow-only counters per node
+(core/strategy_store.py); an export file carries every node's counters the
+host knows about, and merging one is idempotent and order-independent, so
+hosts can exchange files any way they like (shared folder, rsync, USB).
+
+- export_counters(store, path): write this host's view (fsync + atomic rename)
+- merge_file(store, path): merge another host's export
+- StrategySync(store, directory): periodic sync with a shared directory;
+  exports to <directory>/<node_id>.json and merges every other node's file
+  that changed since it was last seen
+
+Set KAI_STRATEGY_SYNC_DIR to have get_strategy_store() sync in the
+background, or run `python -m core.strategy_store --sync DIR` once.
+"""
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Any, Optional
+
+from core.kai_agent_base import logger
+from core.strategy_store import StrategyStore
+
+EXPORT_VERSION = 1
+DEFAULT_SYNC_INTERVAL = 300.0
+
+
+def export_counters(store: StrategyStore, path: str) -> int:
+    """Write every node counter known to this store; returns the number of counters"""
+    counters = store.get_node_counters()
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    with open(tmp_path, 'w') as f:
+        json.dump({
+            'version': EXPORT_VERSION,
+            'node': store.node_id,
+            'exported_at': time.time(),
+            'counters': counters
+        }, f, separators=(',', ':'))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return len(counters)
+
+
+def merge_file(store: StrategyStore, path: str) -> int:
+    """Merge another host's export; returns how many counters grew"""
+    with open(path, 'r') as f:
+        export = json.load(f)
+    if export.get('version') != EXPORT_VERSION:
+        raise ValueError(f"{path}: unsupported export version {export.get('version')}")
+    merged = store.merge_counters(export.get('counters', []))
+    logger.info(f"[StrategySync] Merged {path} from {export.get('node')}: {merged} counters grew")
+    return merged
+
+
+class StrategySync:
+    def __init__(self, store: StrategyStore, directory: str, interval: float = DEFAULT_SYNC_INTERVAL):
+        self.store = store
+        self.directory = Path(directory)
+        self.interval = interval
+        self._seen: Dict[str, float] = {}  # file name -> mtime when last merged
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.stats = {
+            'syncs': 0,
+            'files_merged': 0,
+            'counters_grown': 0,
+            'errors': 0,
+            'last_sync_ms': 0.0
+        }
+
+    def sync(self) -> int:
+        """Merge changed exports from other nodes, then publish ours; returns counters grown"""
+        start = time.monotonic()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        own_file = f"{self.store.node_id}.json"
+        grown = 0
+        for path in sorted(self.directory.glob('*.json')):
+            if path.name == own_file:
+                continue
+            try:
+                mtime = path.stat().st_mtime
+                if self._seen.get(path.name) == mtime:
+                    continue
+                grown += merge_file(self.store, str(path))
+                self._seen[path.name] = mtime
+                self.stats['files_merged'] += 1
+            except Exception as e:
+                self.stats['errors'] += 1
+                logger.warning(f"[StrategySync] Could not merge {path}: {e}")
+        export_counters(self.store, str(self.directory / own_file))
+
+        self.stats['syncs'] += 1
+        self.stats['counters_grown'] += grown
+        self.stats['last_sync_ms'] = round((time.monotonic() - start) * 1000, 1)
+        return grown
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.sync()
+            except Exception as e:
+                self.stats['errors'] += 1
+                logger.warning(f"[StrategySync] Sync failed: {e}")
+
+    def start(self):
+        """Sync now, then every `interval` seconds in a daemon thread"""
+        self.sync()
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="strategy-sync", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the background thread and publish a final export"""
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        try:
+            self.sync()
+        except Exception as e:
+            logger.warning(f"[StrategySync] Final sync failed: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            'node': self.store.node_id,
+            'directory': str(self.directory),
+            'peers_seen': len(self._seen)
+        }
@@ -0,0 +1,208 @@
+"""
+tiled_ocr.py
+
+Multi-core OCR for tall full-page screenshots. Tesseract recognises one
+image on one core, so a `full_page=True` screenshot of a long news page is
+a single multi-second call. TiledOCR cuts the page into overlapping
+horizontal bands, OCRs them on a process pool and stitches the word boxes
+back into page coordinates.
+
+- bands are `band_height` px tall and overlap by `overlap` px; the overlap
+  must be taller than a line of text so every word is whole in at least
+  one band
+- each band owns the rows from the middle of its top overlap to the middle
+  of its bottom overlap; a box is kept only by the band that owns its
+  centre, so a word cut at a band edge comes from the neighbour where it
+  is whole, and words in the overlap are not reported twice
+- boxes that still coincide after that (same text, IoU >= 0.5) are dropped
+- workers keep their own get_ocr_engine(), so with tesserocr each process
+  loads the model once; the stitched result goes through the engine's
+  result cache like any other call
+- images shorter than 1.5 bands, or a pool that cannot start, fall back
+  to a single get_ocr_engine() call
+
+tests/tiled_ocr_benchmark.py reports the speed-up per worker count.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from core.kai_agent_base import logger
+from core.ocr_engine import TSV_COLUMNS, get_ocr_engine, image_digest
+
+DEFAULT_BAND_HEIGHT = 1600
+DEFAULT_OVERLAP = 120
+DUPLICATE_IOU = 0.5
+BLOCK_STRIDE = 10000  # block_num offset per band, keeps blocks from different bands apart
+
+
+def split_bands(height: int, band_height: int = DEFAULT_BAND_HEIGHT,
+                overlap: int = DEFAULT_OVERLAP) -> List[Tuple[int, int, int, int]]:
+    """
+    (top, bottom, own_top, own_bottom) per band: the pixel rows to OCR and
+    the rows whose boxes the band keeps
+    """
+    if overlap >= band_height:
+        raise ValueError("overlap must be smaller than band_height")
+    bands = []
+    top = 0
+    while True:
+        bottom = min(height, top + band_height)
+        bands.append([top, bottom])
+        if bottom >= height:
+            break
+        top = bottom - overlap
+    owned = []
+    for i, (top, bottom) in enumerate(bands):
+        own_top = 0 if i == 0 else (top + bands[i - 1][1]) // 2
+        own_bottom = height if i == len(bands) - 1 else (bands[i + 1][0] + bottom) // 2
+        owned.append((top, bottom, own_top, own_bottom))
+    return owned
+
+
+def _ocr_band(band: np.ndarray, config: str) -> Dict[str, List[Any]]:
+    """Worker: OCR one band with the worker process's own engine"""
+    return get_ocr_engine().image_to_data(band, config=config)
+
+
+def _iou(a: Tuple[int, int, int, int], b: Tuple[int, int, int, int]) -> float:
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    ix = max(0, min(ax + aw, bx + bw) - max(ax, bx))
+    iy = max(0, min(ay + ah, by + bh) - max(ay, by))
+    intersection = ix * iy
+    union = aw * ah + bw * bh - intersection
+    return intersection / union if union else 0.0
+
+
+def stitch(results: List[Dict[str, List[Any]]], bands: List[Tuple[int, int, int, int]],
+           width: int, height: int) -> Dict[str, List[Any]]:
+    """Band results -> one image_to_data dict in page coordinates"""
+    data = {column: [] for column in TSV_COLUMNS}
+    page_row = dict(level=1, page_num=1, block_num=0, par_num=0, line_num=0, word_num=0,
+                    left=0, top=0, width=width, height=height, conf=-1.0, text='')
+    for column in TSV_COLUMNS:
+        data[column].append(page_row[column])
+
+    kept_words: Dict[str, List[Tuple[int, int, int, int]]] = {}
+    duplicates = 0
+    for index, (result, (top, _, own_top, own_bottom)) in enumerate(zip(results, bands)):
+        for i in range(len(result.get('text', []))):
+            if result['level'][i] <= 1:
+                continue
+            box = (result['left'][i], result['top'][i] + top, result['width'][i], result['height'][i])
+            centre = box[1] + box[3] / 2
+            if not own_top <= centre < own_bottom:
+                continue
+            text = result['text'][i]
+            if text.strip():
+                same_text = kept_words.setdefault(text, [])
+                if any(_iou(box, other) >= DUPLICATE_IOU for other in same_text):
+                    duplicates += 1
+                    continue
+                same_text.append(box)
+            for column in TSV_COLUMNS:
+                value = result[column][i]
+                if column == 'top':
+                    value = box[1]
+                elif column == 'block_num':
+                    value += index * BLOCK_STRIDE
+                data[column].append(value)
+    if duplicates:
+        logger.debug(f"[TiledOCR] Dropped {duplicates} duplicate boxes in band overlaps")
+    return data
+
+
+class TiledOCR:
+    def __init__(self, workers: Optional[int] = None, band_height: int = DEFAULT_BAND_HEIGHT,
+                 overlap: int = DEFAULT_OVERLAP):
+        self.workers = workers or os.cpu_count() or 1
+        self.band_height = band_height
+        self.overlap = overlap
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self.stats = {
+            'calls': 0,
+            'tiled_calls': 0,
+            'bands': 0,
+            'fallbacks': 0,
+            'total_ms': 0.0
+        }
+
+    def _get_pool(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.workers)
+        return self._pool
+
+    def _tiled(self, image: np.ndarray, config: str) -> Dict[str, List[Any]]:
+        height, width = image.shape[:2]
+        bands = split_bands(height, self.band_height, self.overlap)
+        pool = self._get_pool()
+        futures = [pool.submit(_ocr_band, np.ascontiguousarray(image[top:bottom]), config)
+                   for top, bottom, _, _ in bands]
+        results = [future.result() for future in futures]
+        self.stats['tiled_calls'] += 1
+        self.stats['bands'] += len(bands)
+        return stitch(results, bands, width, height)
+
+    def image_to_data(self, image, config: str = '') -> Dict[str, List[Any]]:
+        """Word boxes in page coordinates, like OCREngine.image_to_data"""
+        start = time.monotonic()
+        self.stats['calls'] += 1
+        engine = get_ocr_engine()
+        image = np.asarray(image)
+        try:
+            if self.workers < 2 or image.shape[0] < self.band_height * 1.5:
+                return engine.image_to_data(image, config=config)
+
+            profile = f"tiled:{self.band_height}/{self.overlap}"
+            key = ('image_to_data', image_digest(image), config, profile)
+            cached = engine.cache.get(key) if engine.cache else None
+            if cached is not None:
+                return {column: list(values) for column, values in cached.items()}
+            try:
+                data = self._tiled(image, config)
+            except Exception as e:
+                self.stats['fallbacks'] += 1
+                logger.warning(f"[TiledOCR] Tiled OCR failed, using a single call: {e}")
+                self.close()
+                return engine.image_to_data(image, config=config)
+            if engine.cache:
+                engine.cache.put(key, data)
+            return {column: list(values) for column, values in data.items()}
+        finally:
+            self.stats['total_ms'] += (time.monotonic() - start) * 1000
+
+    def close(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def get_stats(self) -> Dict[str, Any]:
+        calls = self.stats['calls']
+        return {
+            **self.stats,
+            'workers': self.workers,
+            'avg_ms': round(self.stats['total_ms'] / calls, 1) if calls else 0
+        }
+
+
+_shared_tiled: Optional[TiledOCR] = None
+
+
+def get_tiled_ocr() -> TiledOCR:
+    """Process-wide tiled OCR so the worker pool (and the models it loaded) is reused"""
+    global _shared_tiled
+    if _shared_tiled is None:
+        _shared_tiled = TiledOCR(workers=int(os.environ.get("KAI_OCR_WORKERS", 0)) or None)
+    return _shared_tiled
+
+
+def close_tiled_ocr():
+    global _shared_tiled
+    if _shared_tiled is not None:
+        _shared_tiled.close()
+        _shared_tiled = None
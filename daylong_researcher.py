@@ -3,11 +3,11 @@ daylong_researcher_v2.py
 Refactored wanderer: follows articles inside a site, supports navigation commands
 """
 
+import os
 import time
 import subprocess
 import pyautogui
 import asyncio
-from playwright.async_api import async_playwright
 
 from agents.kai_claude_region_agent import KaiClaudeRegionAgent
 from agents.kai_boundary_agent import KaiBoundaryAgent
@@ -15,14 +15,19 @@ from agents.kai_web_agent import KaiWebAgent
 from agents.kai_desktop_agent import KaiDesktopAgent
 from agents.kai_clipboard_agent import KaiClipboardAgent
 from research_logger import ResearchLogger
+from core.browser_pool import close_shared_pools
+from core.cdp_session import open_operator_page, get_cdp_session, copy_page_screenshot_to_clipboard, close_cdp_sessions
+from core.readiness import get_readiness_waiter
+from core.har_replay import close_har_session
 
 
 class DaylongResearcher:
-    def __init__(self):
+    def __init__(self, cdp_endpoint=None):
         self.logger = ResearchLogger()
         self.cycle_count = 0
         self.current_url = None
         self.home_url = None
+        self.cdp_endpoint = cdp_endpoint  # drive the visible Chrome tab instead of a headless copy
 
     def capture_claude_command(self):
         """OCR Claude’s output and parse article/command"""
@@ -59,10 +64,15 @@ class DaylongResearcher:
         KaiDesktopAgent(direction="right", presses=2).run_fast()
         time.sleep(0.7)
 
-        KaiWebAgent(url=url).run_fast()
-        time.sleep(2.0)
+        if self.cdp_endpoint:
+            await KaiWebAgent(url=url, cdp_endpoint=self.cdp_endpoint).run_cdp()
+            session = await get_cdp_session(self.cdp_endpoint)
+            await session.copy_screenshot_to_clipboard()
+        else:
+            KaiWebAgent(url=url).run_fast()
+            time.sleep(2.0)
 
-        subprocess.run(["screencapture", "-c"], check=True, timeout=8)
+            subprocess.run(["screencapture", "-c"], check=True, timeout=8)
         print(f"📸 Opened {url} and captured homepage")
 
         # Return to Claude
@@ -77,28 +87,29 @@ class DaylongResearcher:
         success = False
         chosen_link = None
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
-            await page.goto("https://" + self.current_url)
-
+        start_url = self.current_url if self.current_url.startswith("http") else "https://" + self.current_url
+        async with open_operator_page(start_url, self.cdp_endpoint) as page:
             anchors = await page.query_selector_all("a")
             for a in anchors:
                 try:
                     text = (await a.inner_text()).strip()
                     href = await a.get_attribute("href")
                     if query.lower() in text.lower():
+                        previous_url = page.url
                         await a.click()
-                        await page.wait_for_load_state("networkidle")
-                        time.sleep(2)
-                        subprocess.run(["screencapture", "-c"], check=True, timeout=8)
+                        await get_readiness_waiter().wait(page, {"type": "url_changed", "timeout": 5000},
+                                                          previous_url=previous_url, label="article_click")
+                        if self.cdp_endpoint:
+                            await copy_page_screenshot_to_clipboard(page)
+                        else:
+                            time.sleep(2)
+                            subprocess.run(["screencapture", "-c"], check=True, timeout=8)
                         print(f"📸 Clicked article: {text}")
                         success = True
                         chosen_link = href
                         break
                 except:
                     continue
-            await browser.close()
 
         KaiDesktopAgent(direction="left", presses=1).run_fast()
         time.sleep(1.0)
@@ -169,14 +180,19 @@ async def main():
     KaiDesktopAgent(direction="right", presses=1).run_fast()
     time.sleep(1.0)
 
-    researcher = DaylongResearcher()
+    researcher = DaylongResearcher(cdp_endpoint=os.environ.get("KAI_CDP_ENDPOINT"))
 
     # Seed homepage: BBC News
     await researcher.open_url("bbc.co.uk/news")
 
-    while True:
-        await researcher.run_cycle()
-        time.sleep(1.5)
+    try:
+        while True:
+            await researcher.run_cycle()
+            time.sleep(1.5)
+    finally:
+        await close_shared_pools()
+        close_har_session()
+        await close_cdp_sessions()
 
 
 if __name__ == "__main__":
@@ -8,7 +8,6 @@ import subprocess
 import pyautogui
 import asyncio
 import cv2
-import pytesseract
 from playwright.async_api import async_playwright
 
 from agents.kai_claude_region_agent import KaiClaudeRegionAgent
@@ -17,6 +16,7 @@ from agents.kai_web_agent import KaiWebAgent
 from agents.kai_desktop_agent import KaiDesktopAgent
 from agents.kai_clipboard_agent import KaiClipboardAgent
 from research_logger import ResearchLogger
+from core.tiled_ocr import get_tiled_ocr, close_tiled_ocr
 
 
 class HybridNavigatorV2:
@@ -87,7 +87,7 @@ class HybridNavigatorV2:
         await self.page.screenshot(path="logs/debug_screenshots/page_for_ocr.png", full_page=True)
         img = cv2.imread("logs/debug_screenshots/page_for_ocr.png")
 
-        data = pytesseract.image_to_data(img, output_type=pytesseract.Output.DICT)
+        data = get_tiled_ocr().image_to_data(img)
         for i, word in enumerate(data["text"]):
             if query.lower() in word.lower():
                 x, y, w, h = data["left"][i], data["top"][i], data["width"][i], data["height"][i]
@@ -175,9 +175,12 @@ async def main():
         # Seed homepage
         await researcher.open_url("bbc.co.uk/news")
 
-        while True:
-            await researcher.run_cycle()
-            time.sleep(1.5)
+        try:
+            while True:
+                await researcher.run_cycle()
+                time.sleep(1.5)
+        finally:
+            close_tiled_ocr()
 
 
 if __name__ == "__main__":
@@ -8,7 +8,6 @@ import subprocess
 import pyautogui
 import json
 from pathlib import Path
-from playwright.async_api import async_playwright
 import asyncio
 
 from agents.kai_claude_region_agent import KaiClaudeRegionAgent
@@ -16,60 +15,25 @@ from agents.kai_boundary_agent import KaiBoundaryAgent
 from agents.kai_web_agent import KaiWebAgent
 from agents.kai_clipboard_agent import KaiClipboardAgent
 from agents.kai_desktop_agent import KaiDesktopAgent
-
-class MemoryInterface:
-    """Simple memory system for storing successful strategies"""
-    def __init__(self, memory_file="memory.json"):
-        self.memory_file = Path(memory_file)
-        self.memory = self.load_memory()
-    
-    def load_memory(self):
-        """Load memory from file"""
-        if self.memory_file.exists():
-            try:
-                with open(self.memory_file, 'r') as f:
-                    return json.load(f)
-            except:
-                return {}
-        return {}
-    
-    def save_memory(self):
-        """Save memory to file"""
-        try:
-            with open(self.memory_file, 'w') as f:
-                json.dump(self.memory, f, indent=2)
-        except Exception as e:
-            print(f"Failed to save memory: {e}")
-    
-    def get_strategy(self, domain, intent):
-        """Get successful strategy for domain/intent"""
-        key = f"{domain}_{intent}"
-        return self.memory.get(key)
-    
-    def store_strategy(self, domain, intent, strategy, success=True):
-        """Store strategy result"""
-        key = f"{domain}_{intent}"
-        if key not in self.memory:
-            self.memory[key] = {"strategies": [], "success_count": 0, "total_count": 0}
-        
-        self.memory[key]["strategies"].append({
-            "strategy": strategy,
-            "success": success,
-            "timestamp": time.time()
-        })
-        
-        if success:
-            self.memory[key]["success_count"] += 1
-        self.memory[key]["total_count"] += 1
-        
-        self.save_memory()
+from core.browser_pool import close_shared_pools
+from core.cdp_session import open_operator_page
+from core.readiness import get_readiness_waiter
+from core.har_replay import get_har_session, close_har_session
+from core.strategy_resolver import resolve_strategies, click_resolved, build_cascade
+from core.strategy_store import get_strategy_store, close_strategy_store
+from core.strategy_bandit import StrategyBandit
+from core.negative_cache import NegativeCache
+from core.latency_histogram import StrategyTimer
 
 class ArticleClicker:
     """DOM-based article clicking with memory"""
     
     def __init__(self):
-        self.memory = MemoryInterface()
+        self.memory = get_strategy_store()
+        self.bandit = StrategyBandit(self.memory)
+        self.negative_cache = NegativeCache(self.memory)
         self.intents = self.load_intents()
+        self.readiness = get_readiness_waiter()
     
     def load_intents(self):
         """Load or create intent definitions"""
@@ -84,6 +48,11 @@ class ArticleClicker:
             "click_first_article": {
                 "primary_selector": "article h2 a, h2 a, .story-link a",
                 "timeout": 3000,
+                "resource_profile": "dom_only",
+                "readiness": {
+                    "page": {"type": "selector_visible", "selector": "article h2 a, h2 a, .story-link a", "timeout": 5000},
+                    "action": {"type": "url_changed", "timeout": 5000}
+                },
                 "fallbacks": [
                     {"method": "css", "value": "[data-testid='card-headline'] a"},
                     {"method": "css", "value": ".media__link"},
@@ -95,6 +64,11 @@ class ArticleClicker:
             "click_top_story": {
                 "primary_selector": ".top-story a, .lead-story a, .featured a",
                 "timeout": 3000,
+                "resource_profile": "dom_only",
+                "readiness": {
+                    "page": {"type": "selector_visible", "selector": ".top-story a, .lead-story a, .featured a", "timeout": 5000},
+                    "action": {"type": "url_changed", "timeout": 5000}
+                },
                 "fallbacks": [
                     {"method": "css", "value": ".headline a"},
                     {"method": "css", "value": ".main-story a"},
@@ -104,6 +78,11 @@ class ArticleClicker:
             "click_latest_news": {
                 "primary_selector": ".latest a, .breaking a, .news-item a",
                 "timeout": 3000,
+                "resource_profile": "dom_only",
+                "readiness": {
+                    "page": {"type": "selector_visible", "selector": ".latest a, .breaking a, .news-item a", "timeout": 5000},
+                    "action": {"type": "url_changed", "timeout": 5000}
+                },
                 "fallbacks": [
                     {"method": "css", "value": ".story a"},
                     {"method": "css", "value": ".article-link"},
@@ -128,86 +107,75 @@ class ArticleClicker:
         
         intent_config = self.intents[intent]
         
-        # Check memory for successful strategy
-        remembered_strategy = self.memory.get_strategy(domain, intent)
-        strategies_to_try = []
-        
-        if remembered_strategy:
-            print(f"Found remembered strategy for {domain}/{intent}")
-            # Add remembered successful strategies first
-            for strategy in remembered_strategy["strategies"]:
-                if strategy["success"]:
-                    strategies_to_try.append({
-                        "type": "memory",
-                        "selector": strategy["strategy"],
-                        "method": "css"
-                    })
-        
-        # Add primary selector
-        strategies_to_try.append({
-            "type": "primary",
-            "selector": intent_config["primary_selector"],
-            "method": "css"
-        })
-        
-        # Add fallback strategies
-        for fallback in intent_config.get("fallbacks", []):
-            strategies_to_try.append({
-                "type": "fallback",
-                "selector": fallback["value"],
-                "method": fallback["method"]
-            })
-        
-        # Try each strategy
-        for strategy in strategies_to_try:
-            try:
-                success = await self.try_strategy(page, strategy)
-                
-                if success:
-                    print(f"✅ Success with {strategy['type']}: {strategy['selector']}")
-                    
-                    # Store successful strategy in memory
-                    self.memory.store_strategy(domain, intent, strategy['selector'], True)
-                    
-                    return {
-                        "success": True,
-                        "strategy": f"{strategy['type']}: {strategy['selector']}",
-                        "method": strategy['method']
-                    }
-                else:
-                    print(f"❌ Failed: {strategy['type']} - {strategy['selector']}")
-                    # Store failed strategy
-                    self.memory.store_strategy(domain, intent, strategy['selector'], False)
-                    
-            except Exception as e:
-                print(f"Error with strategy {strategy['selector']}: {e}")
-                continue
+        # A redesigned page gets its dead selectors back
+        if await self.negative_cache.check_structure(page, domain):
+            print(f"🔄 Page structure of {domain} changed, re-trying dead selectors")
+        
+        # Memory (one per selector), primary and fallback strategies, ordered by expected time-to-click
+        ranked = self.memory.rank_strategies(domain, intent)
+        if ranked:
+            print(f"Found {len(ranked)} remembered strategies for {domain}/{intent}")
+        strategies_to_try = self.bandit.order_cascade(domain, intent, build_cascade(ranked, intent_config))
+        # Skip selectors that keep failing here until their re-probe is due
+        strategies_to_try = self.negative_cache.filter(domain, intent, strategies_to_try,
+                                                       key=lambda strategy: strategy['selector'])
+        timer = StrategyTimer()
+        
+        # Resolve the whole cascade in one in-page pass (query and visibility for every strategy)
+        try:
+            resolution = await resolve_strategies(page, strategies_to_try)
+        except Exception as e:
+            print(f"Strategy resolution failed: {e}")
+            return {"success": False, "error": str(e)}
+        timer.lap('query')
+        
+        winner = resolution["winner"]
+        matched = [strategies_to_try[m["index"]]["selector"] for m in resolution["matches"] if m["visible"]]
+        
+        # Everything ahead of the winner had no visible match: a failed attempt, buffered until cycle end
+        failed = strategies_to_try if winner is None else strategies_to_try[:winner]
+        for strategy in failed:
+            print(f"❌ Failed: {strategy['type']} - {strategy['selector']}")
+            self.memory.store_strategy(domain, intent, strategy['selector'], False)
+        
+        if winner is None:
+            return {"success": False, "error": "All strategies failed"}
+        
+        strategy = strategies_to_try[winner]
+        if await self.click_resolved_strategy(page, intent_config, timer):
+            print(f"✅ Success with {strategy['type']}: {strategy['selector']}")
+            
+            # Store successful strategy in memory
+            self.memory.store_strategy(domain, intent, strategy['selector'], True,
+                                       latency=timer.elapsed(), phases=timer.phases)
+            
+            return {
+                "success": True,
+                "strategy": f"{strategy['type']}: {strategy['selector']}",
+                "method": strategy['method'],
+                "matched_strategies": matched
+            }
         
-        return {"success": False, "error": "All strategies failed"}
+        print(f"❌ Failed: {strategy['type']} - {strategy['selector']}")
+        self.memory.store_strategy(domain, intent, strategy['selector'], False)
+        return {"success": False, "error": f"Click failed for {strategy['selector']}"}
     
-    async def try_strategy(self, page, strategy):
-        """Try a specific clicking strategy"""
+    async def click_resolved_strategy(self, page, intent_config=None, timer=None):
+        """Click the element picked by the strategy resolver and wait for the intent to be ready"""
+        timer = timer or StrategyTimer()
         try:
-            selector = strategy['selector']
-            method = strategy['method']
-            
-            if method == "css":
-                element = await page.query_selector(selector)
-            elif method == "xpath":
-                element = await page.query_selector(f"xpath={selector}")
-            else:
+            previous_url = page.url
+            clicked = await click_resolved(page)
+            timer.lap('click')
+            if not clicked:
                 return False
-            
-            if element and await element.is_visible():
-                await element.click()
-                await page.wait_for_load_state('networkidle', timeout=5000)
-                return True
-                
+            await self.readiness.wait_for_intent(page, intent_config, "action",
+                                                 previous_url=previous_url, label="article_click")
+            timer.lap('wait')
+            return True
         except Exception as e:
             print(f"Strategy failed: {e}")
             return False
-        
-        return False
 
 class IntegratedNavigator:
     """Enhanced navigator with article clicking capabilities"""
@@ -270,16 +238,15 @@ class IntegratedNavigator:
         # NOW ADD ARTICLE CLICKING
         domain = url.split('/')[2] if '/' in url else url
         
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
-            
-            try:
-                await page.goto(url)
-                await page.wait_for_load_state('networkidle')
+        intent_config = self.article_clicker.intents.get("click_first_article", {})
+        try:
+            async with open_operator_page(url, wait_until='domcontentloaded',
+                                          resource_profile=intent_config.get("resource_profile")) as page:
+                await self.article_clicker.readiness.wait_for_intent(page, intent_config, "page", label="homepage")
                 
                 # Try to click an article
-                click_result = await self.article_clicker.click_article(page, domain)
+                async with get_har_session().step("click_article"):
+                    click_result = await self.article_clicker.click_article(page, domain)
                 
                 if click_result["success"]:
                     print(f"✅ Successfully clicked article: {click_result['strategy']}")
@@ -295,10 +262,8 @@ class IntegratedNavigator:
                     print(f"❌ Article clicking failed: {click_result.get('error', 'Unknown error')}")
                     # Continue with homepage screenshot
                 
-            except Exception as e:
-                print(f"Browser automation error: {e}")
-            finally:
-                await browser.close()
+        except Exception as e:
+            print(f"Browser automation error: {e}")
         
         # Return to Claude
         print("Returning to Claude...")
@@ -359,6 +324,9 @@ class IntegratedNavigator:
         # Enhanced browsing with article clicking
         success = await self.enhanced_browse_and_capture(url)
         
+        # Persist this cycle's strategy results in one write
+        self.memory.end_cycle()
+        
         cycle_time = time.time() - cycle_start
         print(f"Enhanced cycle completed in {cycle_time:.1f}s")
         
@@ -374,17 +342,22 @@ async def main():
     KaiDesktopAgent(direction="right", presses=1).run_fast()
     
     cycle_count = 0
-    while True:
-        print(f"\n--- Cycle {cycle_count + 1} ---")
-        
-        success = await navigator.run_cycle()
-        
-        if not success:
-            print("Cycle failed, continuing...")
-        
-        cycle_count += 1
-        print("Ready for next website...")
-        time.sleep(1.5)
+    try:
+        while True:
+            print(f"\n--- Cycle {cycle_count + 1} ---")
+            
+            success = await navigator.run_cycle()
+            
+            if not success:
+                print("Cycle failed, continuing...")
+            
+            cycle_count += 1
+            print("Ready for next website...")
+            time.sleep(1.5)
+    finally:
+        await close_shared_pools()
+        close_har_session()
+        close_strategy_store()
 
 if __name__ == "__main__":
     asyncio.run(main())
\ No newline at end of file
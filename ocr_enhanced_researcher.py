@@ -8,14 +8,14 @@ import subprocess
 import pyautogui
 import asyncio
 import cv2
-import pytesseract
-from playwright.async_api import async_playwright
 from agents.kai_claude_region_agent import KaiClaudeRegionAgent
 from agents.kai_boundary_agent import KaiBoundaryAgent
 from agents.kai_web_agent import KaiWebAgent
 from agents.kai_desktop_agent import KaiDesktopAgent
 from agents.kai_clipboard_agent import KaiClipboardAgent
 from research_logger import ResearchLogger
+from core.browser_pool import get_shared_pool, close_shared_pools
+from core.tiled_ocr import get_tiled_ocr, close_tiled_ocr
 
 
 class OCREnhancedResearcher:
@@ -80,9 +80,9 @@ class OCREnhancedResearcher:
         success = False
         chosen_text = None
 
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            page = await browser.new_page()
+        pool = await get_shared_pool(headless=True)
+        async with pool.lease() as lease:
+            page = lease.page
             await page.goto("https://" + self.current_url)
             await page.wait_for_load_state("networkidle")
             time.sleep(1)
@@ -93,7 +93,7 @@ class OCREnhancedResearcher:
             img = cv2.imread(page_path)
 
             # OCR detection
-            data = pytesseract.image_to_data(img, output_type=pytesseract.Output.DICT)
+            data = get_tiled_ocr().image_to_data(img)
             for i, word in enumerate(data["text"]):
                 if query.lower() in word.lower():
                     x, y, w, h = data["left"][i], data["top"][i], data["width"][i], data["height"][i]
@@ -105,8 +105,6 @@ class OCREnhancedResearcher:
                     chosen_text = word
                     break
 
-            await browser.close()
-
         # Switch back to Claude desktop (1)
         KaiDesktopAgent(direction="left", presses=1).run_fast()
         time.sleep(1.0)
@@ -183,9 +181,13 @@ async def main():
     # Seed homepage
     await researcher.open_url("bbc.co.uk/news")
 
-    while True:
-        await researcher.run_cycle()
-        time.sleep(1.5)
+    try:
+        while True:
+            await researcher.run_cycle()
+            time.sleep(1.5)
+    finally:
+        await close_shared_pools()
+        close_tiled_ocr()
 
 
 if __name__ == "__main__":
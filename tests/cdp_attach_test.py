@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Check CDP attach mode against a locally launched Chromium with a remote debugging port.
+Launches Playwright's bundled Chromium, attaches over CDP, navigates and clicks in the same tab.
+"""
+
+import asyncio
+import os
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from playwright.async_api import async_playwright
+
+from core.cdp_session import CDPSession
+
+PORT = 9333
+FIXTURE = """<html><body>
+<article><h2><a href="#story" onclick="document.title='clicked'">First story</a></h2></article>
+</body></html>"""
+
+
+def wait_for_endpoint(endpoint, timeout=10):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            urllib.request.urlopen(f"{endpoint}/json/version", timeout=1)
+            return True
+        except Exception:
+            time.sleep(0.2)
+    return False
+
+
+async def test_cdp_attach():
+    """Attach to a debug-port Chromium and drive its tab"""
+    async with async_playwright() as p:
+        executable = p.chromium.executable_path
+
+    profile_dir = tempfile.mkdtemp(prefix="kai_cdp_")
+    fixture_path = os.path.join(profile_dir, "fixture.html")
+    with open(fixture_path, "w") as f:
+        f.write(FIXTURE)
+    fixture_url = f"file://{fixture_path}"
+
+    chromium = subprocess.Popen([
+        executable, "--headless=new", f"--remote-debugging-port={PORT}",
+        f"--user-data-dir={profile_dir}", "about:blank"
+    ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    endpoint = f"http://localhost:{PORT}"
+    session = CDPSession(endpoint)
+    try:
+        assert wait_for_endpoint(endpoint), "Chromium debug endpoint did not come up"
+
+        page = await session.goto(fixture_url)
+        print(f"Attached and navigated: {page.url}")
+
+        # Second goto to the same URL must reuse the loaded tab
+        same_page = await session.goto(fixture_url)
+        assert same_page is page
+        assert session.stats['navigations'] == 1
+        assert session.stats['navigations_skipped'] == 1
+
+        await page.click("article h2 a")
+        assert await page.title() == "clicked"
+
+        png = await session.screenshot()
+        assert png[:4] == b"\x89PNG"
+
+        print(f"SUCCESS: CDP attach working. Stats: {session.get_stats()}")
+    finally:
+        await session.close()
+        chromium.terminate()
+        chromium.wait(timeout=10)
+
+
+if __name__ == "__main__":
+    asyncio.run(test_cdp_attach())
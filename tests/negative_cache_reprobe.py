@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Negative-cache backoff driven by resolver misses, the way ArticleClicker
+records them. A selector that stops matching on theguardian.com is recorded
+as a failure on each miss; after `threshold` misses it is skipped, it is
+re-probed once its backoff has passed, and each re-probe that misses again
+must push the next re-probe further out (1h, 2h, 4h, ...), instead of the
+selector being re-probed on every cycle.
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.negative_cache import NegativeCache
+from core.strategy_store import StrategyStore
+
+DOMAIN = "theguardian.com"
+INTENT = "click_first_article"
+DEAD = "css:a.js-headline-text"
+LIVE = "text:Headline"
+HOUR = 3600.0
+
+
+def cycle(store, cache, now):
+    """One navigator cycle at `now`: filter, then record DEAD as missed if it was tried"""
+    kept = cache.filter(DOMAIN, INTENT, [DEAD, LIVE], now=now)
+    if DEAD in kept:
+        store.record(DOMAIN, INTENT, DEAD, success=False, timestamp=now)
+    store.record(DOMAIN, INTENT, LIVE, success=True, timestamp=now)
+    store.end_cycle()
+    return DEAD in kept
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        store = StrategyStore(os.path.join(directory, "strategy_store.db"), flush_interval=None)
+        cache = NegativeCache(store, threshold=3, base_backoff=HOUR)
+
+        # Cycles every 10 minutes for the last day
+        start = time.time() - 24 * HOUR
+        probes = []
+        for minute in range(0, 24 * 60, 10):
+            if cycle(store, cache, start + minute * 60):
+                probes.append(minute / 60)
+        store.close()
+
+    gaps = [round(later - earlier, 2) for earlier, later in zip(probes, probes[1:])]
+    print(f"DEAD tried {len(probes)} times in 144 cycles, at hours {[round(p, 2) for p in probes]}")
+    print(f"  gaps between tries: {gaps}")
+    # Three misses in a row, then re-probes spaced 1h, 2h, 4h, 8h (rounded up to the 10 min cycle)
+    expected = [0.17, 0.17, 1.0, 2.0, 4.0, 8.0]
+    ok = gaps == expected
+    print(f"  expected gaps:      {expected}")
+    print("OK" if ok else "BACKOFF NOT ADVANCING")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
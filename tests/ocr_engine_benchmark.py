@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+Per-call OCR latency of each available backend (core/ocr_engine.py).
+Renders a news-page-like image, then times image_to_string and
+image_to_data on it (and image_to_string with --psm/--oem set, as
+KaiOCRAgent's OCR_CONFIG does): the first call (model load) and the mean
+of the rest.
+The pytesseract backend pays a process start and model load on every call;
+tesserocr only on the first. The result cache is disabled for those
+timings; the last line times a repeat of the same screenshot through the
+cache (hash + lookup instead of a Tesseract pass).
+"""
+
+import os
+import sys
+import time
+
+from PIL import Image, ImageDraw
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.ocr_engine import BACKENDS, OCREngine
+
+CALLS = 10
+PSM_CONFIG = "--psm 6 --oem 3"
+CASES = [("image_to_string", ""), ("image_to_data", ""), ("image_to_string", PSM_CONFIG)]
+HEADLINES = [
+    "Election results: counting continues in key regions",
+    "Markets rally as inflation eases for a third month",
+    "Storm warnings issued across the north coast",
+    "Scientists map the deepest part of the ocean floor",
+    "Local council approves new cycling network",
+]
+
+
+def render_page():
+    img = Image.new("RGB", (1280, 720), "white")
+    draw = ImageDraw.Draw(img)
+    for i, headline in enumerate(HEADLINES * 3):
+        draw.text((40, 30 + i * 44), headline, fill="black")
+    return img
+
+
+def time_calls(engine, method, image, config=''):
+    call = getattr(engine, method)
+    start = time.monotonic()
+    call(image, config)
+    first = time.monotonic() - start
+    start = time.monotonic()
+    for _ in range(CALLS):
+        call(image, config)
+    return first, (time.monotonic() - start) / CALLS
+
+
+def main():
+    image = render_page()
+    results = {}
+    for backend in BACKENDS:
+        try:
+            engine = OCREngine(backend, cache_bytes=0)
+        except Exception as e:
+            print(f"{backend}: unavailable ({e})")
+            continue
+        for method, config in CASES:
+            first, mean = time_calls(engine, method, image, config)
+            results[(backend, method, config)] = mean
+            print(f"{backend:12s} {method:16s} {config or '(default)':18s} "
+                  f"first {first * 1000:7.1f} ms, then {mean * 1000:7.1f} ms/call")
+
+    for method, config in CASES:
+        if ("tesserocr", method, config) in results and ("pytesseract", method, config) in results:
+            speedup = results[("pytesseract", method, config)] / results[("tesserocr", method, config)]
+            print(f"{method} {config or '(default)'}: tesserocr is {speedup:.1f}x faster per call")
+
+    try:
+        engine = OCREngine()
+    except Exception:
+        return
+    for method in ("image_to_string", "image_to_data"):
+        first, mean = time_calls(engine, method, image)
+        print(f"cached       {method:16s} first {first * 1000:7.1f} ms, then {mean * 1000:7.1f} ms/call")
+    print(f"cache: {engine.get_stats()['cache']}")
+
+
+if __name__ == "__main__":
+    main()
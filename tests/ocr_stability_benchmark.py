@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Benchmark the frame-diff stability gate against OCR-as-change-detector.
+Renders synthetic "Claude is typing" responses (a few words appear per
+frame, with a blinking caret, then the text settles) and replays each
+frame sequence through:
+- the old loop: OCR every frame, stable after 3 identical OCR strings
+- the gate: thumbnail diff every frame, OCR once after 3 identical frames
+Reports OCR calls per response for both and the gate's per-frame cost,
+and fails if the gate ever OCRs a frame other than the settled final one
+(i.e. declared a response stable while it was still being typed).
+Pass --ocr to also time the Tesseract passes themselves.
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.frame_stability import StabilityGate
+from synthetic_frames import random_words, render, wrap
+
+RESPONSES = 10
+REQUIRED = 3
+
+
+def response_frames(rng):
+    """Frames of one response: typing in bursts, then settled frames"""
+    words = random_words(rng, 30, 80)
+    frames, shown = [], 0
+    while shown < len(words):
+        shown = min(len(words), shown + rng.randint(2, 8))
+        frames.append(render(wrap(words[:shown]), caret=len(frames) % 2 == 0))
+    final = render(wrap(words))
+    frames.extend([final] * (REQUIRED + 2))
+    return frames
+
+
+def old_loop(frames, ocr):
+    """OCR every frame until the text repeats REQUIRED times; returns OCR calls"""
+    last, stable, calls = None, 0, 0
+    for frame in frames:
+        text = ocr(frame)
+        calls += 1
+        stable = stable + 1 if text == last else 0
+        last = text
+        if stable >= REQUIRED:
+            break
+    return calls
+
+
+def gated_loop(frames, gate, ocr):
+    """Frame diff until REQUIRED identical frames, then one OCR; returns (OCR calls, frames checked)"""
+    gate.reset()
+    for index, frame in enumerate(frames):
+        if gate.update(frame):
+            break
+    assert frame.tobytes() == frames[-1].tobytes(), \
+        f"gate reported stable at frame {index} of {len(frames)}, before the response settled"
+    ocr(frame)
+    gate.record_ocr()
+    return 1, gate.frames
+
+
+def main():
+    use_tesseract = "--ocr" in sys.argv
+    if use_tesseract:
+        from core.ocr_engine import get_ocr_engine
+        ocr = get_ocr_engine().image_to_string
+    else:
+        # Stand-in with the same change semantics: identical frames give identical text
+        ocr = lambda frame: hash(frame.tobytes())
+
+    rng = random.Random(7)
+    responses = [response_frames(rng) for _ in range(RESPONSES)]
+    gate = StabilityGate(required=REQUIRED)
+
+    start = time.monotonic()
+    old_calls = sum(old_loop(frames, ocr) for frames in responses)
+    old_time = time.monotonic() - start
+
+    start = time.monotonic()
+    gated = [gated_loop(frames, gate, ocr) for frames in responses]
+    gated_time = time.monotonic() - start
+    gated_calls = sum(calls for calls, _ in gated)
+    gated_frames = sum(checked for _, checked in gated)
+
+    gate_cost = 0.0
+    for frames in responses[:3]:
+        gate.reset()
+        start = time.monotonic()
+        for frame in frames:
+            gate.update(frame)
+        gate_cost += (time.monotonic() - start) / len(frames)
+
+    print(f"{RESPONSES} responses, stable after {REQUIRED} identical checks")
+    print(f"  OCR per frame:   {old_calls} OCR calls ({old_calls / RESPONSES:.1f} per response)")
+    print(f"  stability gate:  {gated_calls} OCR calls ({gated_frames} frames diffed)")
+    print(f"  OCR calls saved: {(old_calls - gated_calls) / RESPONSES:.1f} per response")
+    print(f"  gate cost:       {gate_cost / 3 * 1000:.2f} ms per frame")
+    if use_tesseract:
+        print(f"  wall time:       {old_time:.2f}s -> {gated_time:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark resource blocking profiles against a local news-homepage fixture.
+Serves a generated page with images, fonts, stylesheets, video and tracker
+scripts (each response delayed to mimic network latency), then loads it
+under each profile and reports load time and blocked counts.
+"""
+
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+from functools import partial
+from http.server import ThreadingHTTPServer, SimpleHTTPRequestHandler
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.browser_pool import BrowserPool
+from core.resource_blocking import ResourceBlocker
+
+RUNS = 5
+LATENCY = 0.05  # seconds added to every asset response
+ARTICLES = 40
+
+
+class SlowHandler(SimpleHTTPRequestHandler):
+    def do_GET(self):
+        if not self.path.endswith(".html"):
+            time.sleep(LATENCY)
+        super().do_GET()
+
+    def log_message(self, *args):
+        pass
+
+
+def build_fixture(root):
+    """Write a news-homepage-like fixture with heavy assets"""
+    os.makedirs(os.path.join(root, "doubleclick.net"), exist_ok=True)
+    blob = os.urandom(80_000)
+    for i in range(ARTICLES):
+        with open(os.path.join(root, f"img{i}.jpg"), "wb") as f:
+            f.write(blob)
+    for name in ("font.woff2", "clip.mp4"):
+        with open(os.path.join(root, name), "wb") as f:
+            f.write(blob * 3)
+    with open(os.path.join(root, "site.css"), "w") as f:
+        f.write("@font-face { font-family: News; src: url(font.woff2); }\n"
+                "body { font-family: News; }\n" + ".pad { margin: 1px; }\n" * 2000)
+    with open(os.path.join(root, "doubleclick.net", "tag.js"), "w") as f:
+        f.write("window.__tracked = true;")
+
+    cards = "\n".join(
+        f'<article><img src="img{i}.jpg"><h2><a href="#a{i}">Story {i}</a></h2></article>'
+        for i in range(ARTICLES)
+    )
+    with open(os.path.join(root, "index.html"), "w") as f:
+        f.write(f"""<html><head><link rel="stylesheet" href="site.css">
+<script src="doubleclick.net/tag.js"></script></head>
+<body><video src="clip.mp4" autoplay muted></video>{cards}</body></html>""")
+
+
+async def benchmark():
+    root = tempfile.mkdtemp(prefix="kai_fixture_")
+    build_fixture(root)
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(SlowHandler, directory=root))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/index.html"
+
+    pool = BrowserPool(headless=True)
+    blocker = ResourceBlocker()
+    results = {}
+    try:
+        for profile in ("full", "text_only", "dom_only"):
+            timings = []
+            for _ in range(RUNS):
+                async with pool.lease() as lease:
+                    await blocker.apply(lease.page, profile)
+                    start = time.perf_counter()
+                    await lease.page.goto(url, wait_until="load")
+                    await lease.page.wait_for_selector("article h2 a")
+                    timings.append(time.perf_counter() - start)
+            results[profile] = sorted(timings)[len(timings) // 2]
+
+        print(f"Fixture: {ARTICLES} articles, {LATENCY * 1000:.0f} ms latency per asset, {RUNS} runs")
+        stats = blocker.get_stats()
+        for profile, median in results.items():
+            speedup = results["full"] / median if median else 0
+            blocked = stats.get(profile, {})
+            print(f"  {profile:10s} median load {median * 1000:7.1f} ms  "
+                  f"x{speedup:.1f}  blocked={blocked.get('blocked', 0) // RUNS}/load  "
+                  f"est_saved={blocked.get('est_kb_saved', 0) / RUNS:.0f} KB/load")
+    finally:
+        await pool.close()
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    asyncio.run(benchmark())
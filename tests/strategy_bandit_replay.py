@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Replay logs/*.json through the strategy bandit to estimate cycle-time savings.
+Each log records the strategies attempted (with timestamps) and the one that
+finally worked, and newer logs carry measured phase timings on those events
+(used instead of the gap to the next event). Per log we compare the time the fixed order spent against the
+time the bandit's order would have spent, then feed the log's outcomes into
+the store so later logs benefit from what was learned. Strategies never tried
+in a log are left out of its replay, since their outcome is unknown.
+"""
+
+import glob
+import json
+import os
+import random
+import sys
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.strategy_store import StrategyStore
+from core.strategy_bandit import StrategyBandit
+
+ATTEMPT_PREFIX = "Attempted strategy: "
+SUCCESS_PREFIX = "✅ Success using: "
+DEFAULT_WIN_LATENCY = 0.1
+
+
+def parse_time(stamp):
+    return datetime.fromisoformat(stamp.rstrip("Z")).timestamp()
+
+
+def parse_log(path):
+    """(domain, intent, [(strategy, latency, success)]) from one LogWriter session"""
+    with open(path, "r") as f:
+        log = json.load(f)
+    events = [(parse_time(e["timestamp"]), e["message"], e.get("timings")) for e in log.get("events", [])]
+
+    outcomes = []
+    for i, (stamp, message, timings) in enumerate(events):
+        following = events[i + 1][0] if i + 1 < len(events) else stamp
+        latency = timings["total"] / 1000 if timings and "total" in timings else following - stamp
+        if message.startswith(ATTEMPT_PREFIX):
+            outcomes.append((message[len(ATTEMPT_PREFIX):], latency, False))
+        elif message.startswith(SUCCESS_PREFIX) and not any(success for _, _, success in outcomes):
+            winner = message[len(SUCCESS_PREFIX):]
+            outcomes.append((winner, latency or DEFAULT_WIN_LATENCY, True))
+    return log.get("domain"), log.get("intent"), log.get("timestamp", ""), outcomes
+
+
+def replay(paths, method="thompson", runs=20):
+    logs = sorted((parse_log(path) for path in paths), key=lambda log: log[2])
+    logs = [log for log in logs if log[0] and log[3] and any(success for _, _, success in log[3])]
+    if not logs:
+        print("No replayable logs found")
+        return
+
+    fixed_total = sum(sum(latency for _, latency, _ in outcomes) for _, _, _, outcomes in logs)
+    bandit_totals = []
+    for run in range(runs):
+        store = StrategyStore(":memory:")
+        bandit = StrategyBandit(store, method=method, rng=random.Random(run))
+        total = 0.0
+        for domain, intent, _, outcomes in logs:
+            latency_of = {strategy: latency for strategy, latency, _ in outcomes}
+            winner = next(strategy for strategy, _, success in outcomes if success)
+            for strategy in bandit.order(domain, intent, list(latency_of)):
+                total += latency_of[strategy]
+                if strategy == winner:
+                    break
+            for strategy, latency, success in outcomes:
+                store.record(domain, intent, strategy, success, latency=latency)
+        bandit_totals.append(total)
+        store.close()
+
+    bandit_mean = sum(bandit_totals) / len(bandit_totals)
+    print(f"Replayed {len(logs)} logs ({method}, {runs} runs)")
+    print(f"  fixed order:  {fixed_total:7.2f}s total, {fixed_total / len(logs):6.2f}s per cycle")
+    print(f"  bandit order: {bandit_mean:7.2f}s total, {bandit_mean / len(logs):6.2f}s per cycle")
+    if fixed_total:
+        print(f"  expected reduction: {(1 - bandit_mean / fixed_total) * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    log_dir = sys.argv[1] if len(sys.argv) > 1 else "logs"
+    paths = glob.glob(os.path.join(log_dir, "*.json"))
+    for method in ("thompson", "ucb"):
+        replay(paths, method=method, runs=20 if method == "thompson" else 1)
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Several processes writing one strategy store at once, like two navigators
+running side by side. Each worker records a known number of attempts
+(flushing in small batches, so transactions interleave) and reads back what
+the others wrote; at the end the totals must add up exactly, with no
+update lost to another process's write.
+"""
+
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.strategy_store import StrategyStore
+
+WORKERS = 4
+ATTEMPTS = 300
+STRATEGIES = ("css", "xpath", "text", "ocr")
+
+
+def worker(db_path, index, results):
+    store = StrategyStore(db_path, batch_size=7, flush_interval=None)
+    seen_others = 0
+    for i in range(ATTEMPTS):
+        strategy = STRATEGIES[i % len(STRATEGIES)]
+        store.record("example.com", "click_first_article", strategy, success=(i + index) % 3 == 0,
+                     latency=0.01 * (i % 10))
+        if i % 50 == 49:
+            store.flush()
+            # Another worker's attempts show up without reopening anything
+            attempts = sum(row['attempts'] for row in store.get_intent_strategies("example.com", "click_first_article"))
+            seen_others = max(seen_others, attempts - (i + 1))
+    store.close()
+    results.put((index, seen_others))
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "strategy_store.db")
+        StrategyStore(db_path).close()  # create the schema once
+
+        results = multiprocessing.Queue()
+        start = time.monotonic()
+        processes = [multiprocessing.Process(target=worker, args=(db_path, i, results)) for i in range(WORKERS)]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        elapsed = time.monotonic() - start
+        seen = dict(results.get() for _ in processes)
+
+        store = StrategyStore(db_path)
+        rows = store.get_intent_strategies("example.com", "click_first_article")
+        attempts = sum(row['attempts'] for row in rows)
+        successes = sum(row['successes'] for row in rows)
+        expected_successes = sum(1 for index in range(WORKERS) for i in range(ATTEMPTS) if (i + index) % 3 == 0)
+        store.close()
+
+    print(f"{WORKERS} processes x {ATTEMPTS} attempts in {elapsed:.2f}s")
+    print(f"  attempts:  {attempts} (expected {WORKERS * ATTEMPTS})")
+    print(f"  successes: {successes} (expected {expected_successes})")
+    print(f"  attempts by other processes seen mid-run: {seen}")
+    ok = attempts == WORKERS * ATTEMPTS and successes == expected_successes
+    print("OK" if ok else "LOST UPDATES")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Two hosts exchanging strategy counters across an eviction. Node A records
+failures for a selector and node B merges them; A evicts the selector
+(domain cap of 1), then succeeds with it again, and the two merge each
+other's exports back and forth. A's counter must resume from where it was
+evicted, not restart at 0: B must add only the new successes, and A must
+not get its evicted failures back from B's export.
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.strategy_store import StrategyStore
+
+DOMAIN = "theguardian.com"
+INTENT = "click_first_article"
+DEAD = "css:a.js-headline-text"
+
+
+def totals(store, strategy):
+    for row in store.get_intent_strategies(DOMAIN, INTENT):
+        if row['strategy'] == strategy:
+            return row['attempts'], row['successes']
+    return None
+
+
+def main():
+    with tempfile.TemporaryDirectory() as directory:
+        a = StrategyStore(os.path.join(directory, "a.db"), max_selectors_per_domain=1, flush_interval=None)
+        b = StrategyStore(os.path.join(directory, "b.db"), flush_interval=None)
+
+        for _ in range(20):
+            a.record(DOMAIN, INTENT, DEAD, success=False)
+        a.flush()
+        b.merge_counters(a.get_node_counters())
+
+        # A new selector takes the domain's only slot: DEAD is evicted on A
+        a.record(DOMAIN, INTENT, "text:Headline", success=True)
+        a.flush()
+        evicted = totals(a, DEAD)
+
+        # The layout comes back; DEAD works again on A (and evicts the other one)
+        for _ in range(5):
+            a.record(DOMAIN, INTENT, DEAD, success=True)
+        a.flush()
+
+        b.merge_counters(a.get_node_counters())
+        a.merge_counters(b.get_node_counters())
+        remerged = b.merge_counters(a.get_node_counters()) + a.merge_counters(b.get_node_counters())
+
+        results = {
+            "A after eviction": (evicted, None),
+            "A after reuse and merges": (totals(a, DEAD), (5, 5)),
+            "B after merges": (totals(b, DEAD), (25, 5)),
+            "counters grown by a re-merge": (remerged, 0),
+        }
+        a.close()
+        b.close()
+
+    ok = True
+    for label, (value, expected) in results.items():
+        passed = value == expected
+        ok = ok and passed
+        print(f"  {label}: {value} (expected {expected}){'' if passed else '  <-- MISMATCH'}")
+    print("OK" if ok else "COUNTERS DIVERGED")
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+"""
+Synthetic captures of Claude's response region for the OCR benchmarks
+(ocr_stability_benchmark.py, incremental_ocr_benchmark.py): random
+responses built from news-reply words, word-wrapped and drawn the way the
+region shows them, with the view scrolled to the last lines once full.
+"""
+
+from PIL import Image, ImageDraw
+
+REGION = (868, 856)
+LINE_HEIGHT = 22
+WRAP = 60
+WORDS = ("the", "article", "covers", "election", "results", "across", "several", "regions",
+         "<<https://www.bbc.co.uk/news/articles/example>>", "with", "analysis", "from", "reporters")
+
+
+def random_words(rng, low, high):
+    return [rng.choice(WORDS) for _ in range(rng.randint(low, high))]
+
+
+def wrap(words):
+    """Words -> lines of at most WRAP characters"""
+    lines, line = [], ""
+    for word in words:
+        if len(line) + len(word) > WRAP:
+            lines.append(line)
+            line = ""
+        line += word + " "
+    return lines + [line]
+
+
+def render(lines, caret=False, mode="RGB"):
+    """The region showing the last lines that fit, optionally with a caret after the last one"""
+    img = Image.new(mode, REGION, "white")
+    draw = ImageDraw.Draw(img)
+    visible = (REGION[1] - 40) // LINE_HEIGHT
+    lines = lines[-visible:]
+    for i, content in enumerate(lines):
+        text = content + ("|" if caret and i == len(lines) - 1 else "")
+        draw.text((20, 20 + i * LINE_HEIGHT), text, fill="black")
+    return img
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Speed-up of tiled OCR (core/tiled_ocr.py) per worker count.
+Renders a long news-page-like full-page screenshot, OCRs it once in a
+single call and then through TiledOCR with 2, 4, ... workers up to the
+core count. Reports wall time, speed-up over the single call and whether
+the stitched words match the single call's (same words, no duplicates
+from the band overlaps). The OCR result cache is disabled so every run
+does the work.
+"""
+
+import os
+import sys
+import time
+
+from PIL import Image, ImageDraw
+
+os.environ["KAI_OCR_CACHE_MB"] = "0"
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.ocr_engine import get_ocr_engine
+from core.tiled_ocr import TiledOCR
+
+PAGE_SIZE = (1280, 9000)
+HEADLINES = [
+    "Election results: counting continues in key regions",
+    "Markets rally as inflation eases for a third month",
+    "Storm warnings issued across the north coast",
+    "Scientists map the deepest part of the ocean floor",
+    "Local council approves new cycling network",
+]
+
+
+def render_page():
+    img = Image.new("RGB", PAGE_SIZE, "white")
+    draw = ImageDraw.Draw(img)
+    y, i = 30, 0
+    while y < PAGE_SIZE[1] - 40:
+        draw.text((40, y), f"{HEADLINES[i % len(HEADLINES)]} ({i})", fill="black")
+        y += 44
+        i += 1
+    return img
+
+
+def words(data):
+    return sorted(text for text in data["text"] if text.strip())
+
+
+def main():
+    image = render_page()
+
+    start = time.monotonic()
+    baseline = get_ocr_engine().image_to_data(image)
+    single = time.monotonic() - start
+    print(f"{PAGE_SIZE[0]}x{PAGE_SIZE[1]} page, {len(words(baseline))} words")
+    print(f"  1 core  (single call): {single:6.2f}s")
+
+    counts = [n for n in (2, 4, 8, 16) if n <= (os.cpu_count() or 1)]
+    for workers in counts:
+        tiled = TiledOCR(workers=workers)
+        tiled.image_to_data(image)  # start the pool and load a model per worker
+        start = time.monotonic()
+        data = tiled.image_to_data(image)
+        elapsed = time.monotonic() - start
+        match = "same words" if words(data) == words(baseline) else \
+            f"{len(words(data))} words vs {len(words(baseline))}"
+        print(f"  {workers} cores ({tiled.stats['bands'] // 2} bands):  {elapsed:6.2f}s  "
+              f"{single / elapsed:4.1f}x  {match}")
+        tiled.close()
+
+
+if __name__ == "__main__":
+    main()
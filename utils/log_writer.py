@@ -7,7 +7,8 @@ Creates a structured JSON log showing:
 - domain
 - strategies attempted
 - memory usage
-- timing info
+- timing info (each attempt/success event carries its phase timings in ms,
+  from core.latency_histogram.StrategyTimer.as_dict())
 - success/failure
 """
 
@@ -39,28 +40,31 @@ class LogWriter:
         self.session_data["memory_used"] = strategy_type
         self.log_event(f"Memory strategy prioritized: {strategy_type}")
 
-    def log_attempt(self, strategy_label):
+    def log_attempt(self, strategy_label, timings=None):
         self.session_data["strategies_tried"].append(strategy_label)
-        self.log_event(f"Attempted strategy: {strategy_label}")
+        self.log_event(f"Attempted strategy: {strategy_label}", timings=timings)
 
-    def log_success(self, strategy_label):
+    def log_success(self, strategy_label, timings=None):
         self.session_data["final_strategy"] = strategy_label
         self.session_data["success"] = True
-        self.log_event(f"✅ Success using: {strategy_label}")
+        self.log_event(f"✅ Success using: {strategy_label}", timings=timings)
 
     def log_failure(self, error=None):
         self.session_data["success"] = False
         self.session_data["error"] = str(error) if error else "No element found"
         self.log_event(f"❌ Failed to locate element. {self.session_data['error']}")
 
-    def log_event(self, message):
-        self.session_data["events"].append({
+    def log_event(self, message, timings=None):
+        event = {
             "timestamp": datetime.utcnow().isoformat() + "Z",
             "message": message
-        })
+        }
+        if timings:
+            event["timings"] = timings
+        self.session_data["events"].append(event)
 
     def save(self, domain, intent_name):
-        filename = f"log_{domain.replace('.', '_')}_{intent_name}_{datetime.utcnow().strftime('%Y%m%dT%H%M%S')}.json"
+        filename = f"log_{domain.replace('.', '_')}_{intent_name}_{datetime.utcnow().strftime('%Y%m%dT%H%M%S_%f')}.json"
         path = self.logs_dir / filename
         with open(path, "w") as f:
             json.dump(self.session_data, f, indent=2)